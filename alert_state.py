@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""심볼별 RSI 알림 상태 저장소 (SQLite)
+
+매 실행마다 과매도/과매수 심볼을 반복 알리지 않도록 심볼별 현재 구간을 보관하고,
+구간이 바뀐 경우(상태 전이)에만 알림 대상으로 반환합니다.
+
+- 진입: RSI ≤ 과매도 임계값 → 과매도, RSI ≥ 과매수 임계값 → 과매수
+- 해제(히스테리시스): 과매도는 임계값 + hysteresis 초과, 과매수는 임계값 - hysteresis 미만일 때 정상 복귀
+  (임계값 근처에서 오르내려도 진입/해제가 반복되지 않음)
+- 알림 기록: evaluate()는 구간만 갱신하고, 전송에 성공한 전이만 acknowledge()로 알린 상태로 기록
+  (전송 실패 시 다음 실행에서 다시 알림)
+- 쿨다운: 마지막 알림 후 cooldown_seconds 이내의 전이는 상태만 갱신하고 알림은 보류
+  (마지막으로 알린 구간(notified_zone)과 다르면 보류 중으로 남아 쿨다운이 끝난 뒤 첫 실행에서 알림,
+  그 사이 알린 구간으로 되돌아오면 보류 해제)
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+CREATE_ALERT_STATE_TABLE = """
+CREATE TABLE IF NOT EXISTS alert_state (
+    scope TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    zone TEXT NOT NULL,
+    rsi_value REAL,
+    entered_at REAL NOT NULL,
+    notified_at REAL,
+    notified_zone TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (scope, symbol)
+)
+"""
+
+OVERSOLD = "과매도"
+OVERBOUGHT = "과매수"
+NORMAL = "정상"
+
+
+class AlertStateStore:
+    """히스테리시스/쿨다운이 적용된 심볼별 알림 상태 저장소"""
+
+    def __init__(self, db_path, oversold=30.0, overbought=70.0, hysteresis=5.0, cooldown_seconds=43200):
+        self.db_path = Path(db_path)
+        self.oversold = oversold
+        self.overbought = overbought
+        self.hysteresis = hysteresis
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(CREATE_ALERT_STATE_TABLE)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(alert_state)")}
+            if 'notified_zone' not in columns:
+                # 이전 버전 저장소: 기존 구간은 이미 알린 것으로 간주
+                conn.execute("ALTER TABLE alert_state ADD COLUMN notified_zone TEXT")
+
+    @contextmanager
+    def _connect(self):
+        """커밋 후 닫히는 SQLite 연결"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def next_zone(self, previous, rsi_value):
+        """직전 구간과 RSI 값으로 새 구간 결정 (히스테리시스 적용)"""
+        if rsi_value <= self.oversold:
+            return OVERSOLD
+        if rsi_value >= self.overbought:
+            return OVERBOUGHT
+        if previous == OVERSOLD and rsi_value <= self.oversold + self.hysteresis:
+            return OVERSOLD
+        if previous == OVERBOUGHT and rsi_value >= self.overbought - self.hysteresis:
+            return OVERBOUGHT
+        return NORMAL
+
+    def evaluate(self, results, scope="report", now=None):
+        """RSI 결과를 반영하고 상태 전이 목록 반환
+
+        처음 보는 심볼은 정상이면 조용히 기록만 하고, 과매도/과매수이면 진입 전이로 처리합니다.
+
+        Args:
+            results: [{ symbol, rsi_value, ... }] RSI 결과 리스트
+            scope: 상태 구분 (예: 'report', 'scan') - 같은 심볼도 실행 모드별로 따로 관리
+            now: 기준 시각 (epoch 초, 기본값: 현재 시각)
+
+        Returns:
+            list: [{ symbol, previous, current, rsi_value, notify }] 전이된 심볼과
+                  쿨다운이 끝난 보류 전이만 포함 (previous는 마지막으로 알린 구간),
+                  notify가 False이면 쿨다운으로 알림이 보류된 전이
+                  (전송 후 acknowledge()를 호출해야 알린 것으로 기록)
+        """
+        now = time.time() if now is None else now
+        results = [r for r in results if r.get('rsi_value') is not None]
+        if not results:
+            return []
+
+        transitions = []
+        with self._lock, self._connect() as conn:
+            stored = {}
+            symbols = [r['symbol'] for r in results]
+            for start in range(0, len(symbols), 500):
+                chunk = symbols[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT symbol, zone, entered_at, notified_at, COALESCE(notified_zone, zone) FROM alert_state "
+                    f"WHERE scope = ? AND symbol IN ({', '.join('?' * len(chunk))})",
+                    [scope, *chunk],
+                ).fetchall()
+                stored.update({row[0]: row[1:] for row in rows})
+
+            rows = []
+            for result in results:
+                symbol, rsi_value = result['symbol'], float(result['rsi_value'])
+                previous, entered_at, notified_at, notified_zone = stored.get(symbol, (None, now, None, NORMAL))
+                current = self.next_zone(previous, rsi_value)
+
+                changed = current != (previous or NORMAL)
+                if changed:
+                    entered_at = now
+                if current != notified_zone:
+                    notify = notified_at is None or now - notified_at >= self.cooldown_seconds
+                    # 보류 중인 전이는 상태가 바뀐 실행과 쿨다운이 끝난 실행에서만 보고
+                    if changed or notify:
+                        transitions.append({
+                            'symbol': symbol,
+                            'previous': notified_zone,
+                            'current': current,
+                            'rsi_value': result['rsi_value'],
+                            'notify': notify,
+                        })
+
+                rows.append((scope, symbol, current, rsi_value, entered_at, notified_at, notified_zone, now))
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO alert_state "
+                "(scope, symbol, zone, rsi_value, entered_at, notified_at, notified_zone, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return transitions
+
+    def acknowledge(self, transitions, scope="report", now=None):
+        """알림 전송에 성공한 전이를 알린 상태로 기록
+
+        evaluate()는 구간만 갱신하고 알림 여부(notified_at/notified_zone)는 바꾸지 않으므로,
+        전송이 실패해 이 메서드가 호출되지 않으면 같은 전이가 다음 실행에서 다시 알림 대상이 됩니다.
+
+        Args:
+            transitions: evaluate()가 반환한 전이 중 전송한 항목 (notify가 False인 항목은 무시)
+            scope: evaluate()와 같은 상태 구분
+            now: 알림 시각 (epoch 초, 기본값: 현재 시각)
+        """
+        now = time.time() if now is None else now
+        rows = [(now, t['current'], scope, t['symbol']) for t in transitions if t.get('notify', True)]
+        if not rows:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "UPDATE alert_state SET notified_at = ?, notified_zone = ? WHERE scope = ? AND symbol = ?",
+                rows,
+            )
+
+    def get_zones(self, scope="report"):
+        """scope의 심볼별 현재 구간 조회
+
+        Returns:
+            dict: { symbol: zone }
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute("SELECT symbol, zone FROM alert_state WHERE scope = ?", (scope,)).fetchall()
+        return dict(rows)
+
+    def reset(self, scope=None):
+        """상태 초기화 (scope 미지정 시 전체)"""
+        with self._lock, self._connect() as conn:
+            if scope is None:
+                conn.execute("DELETE FROM alert_state")
+            else:
+                conn.execute("DELETE FROM alert_state WHERE scope = ?", (scope,))
+
+
+def create_alert_state_store(oversold=None, overbought=None):
+    """환경변수 설정에 따른 알림 상태 저장소 생성 (비활성화 시 None)
+
+    임계값을 지정하지 않으면 RSI_OVERSOLD_THRESHOLD / RSI_OVERBOUGHT_THRESHOLD를 사용합니다.
+
+    - ALERT_STATE_ENABLED: 'false'면 매 실행 알림 (기존 동작)
+    - ALERT_STATE_PATH: SQLite 파일 경로 (기본값: cache/alert_state.sqlite3)
+    - ALERT_HYSTERESIS: 해제 히스테리시스 폭 (RSI 포인트, 기본값: 5)
+    - ALERT_COOLDOWN_HOURS: 같은 심볼 재알림 최소 간격 (기본값: 12)
+    """
+    if os.getenv('ALERT_STATE_ENABLED', 'true').strip().lower() in ('0', 'false', 'no'):
+        return None
+
+    default_path = Path(__file__).resolve().parent / 'cache' / 'alert_state.sqlite3'
+    return AlertStateStore(
+        os.getenv('ALERT_STATE_PATH', str(default_path)),
+        oversold=oversold if oversold is not None else float(os.getenv('RSI_OVERSOLD_THRESHOLD', 30)),
+        overbought=overbought if overbought is not None else float(os.getenv('RSI_OVERBOUGHT_THRESHOLD', 70)),
+        hysteresis=float(os.getenv('ALERT_HYSTERESIS', 5)),
+        cooldown_seconds=float(os.getenv('ALERT_COOLDOWN_HOURS', 12)) * 3600,
+    )
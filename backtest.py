@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""RSI 임계값 전략 백테스트 (벡터화)
+
+`get_rsi_for_symbol`의 분류 기준을 그대로 매매 규칙으로 사용합니다.
+- 보유 없음 + RSI ≤ 과매도 임계값 → 해당 봉 종가에 매수
+- 보유 중 + RSI ≥ 과매수 임계값 → 해당 봉 종가에 매도
+- 그 외에는 직전 상태 유지 (롱 온리, 전액 투자)
+
+모든 심볼 × 봉을 NumPy 행렬 연산으로 한 번에 계산하며 봉 단위 Python 루프는 없습니다.
+
+사용법:
+    python backtest.py --symbols SPY QQQ DIA --years 20
+    python backtest.py --universe universe.txt --years 30 --output backtest.csv
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from rsi_engine import as_price_matrix, wilder_rsi
+
+load_dotenv()
+
+# 연환산 기준 봉 수 (일봉)
+PERIODS_PER_YEAR = 252
+
+METRIC_COLUMNS = [
+    'total_return', 'buy_hold_return', 'cagr', 'max_drawdown',
+    'trades', 'closed_trades', 'hit_rate', 'avg_trade_return', 'exposure', 'years',
+]
+
+
+def _forward_fill(matrix):
+    """행 방향 forward fill (NaN은 직전 유효값으로, 첫 유효값 이전은 NaN 유지)"""
+    n_rows, n_cols = matrix.shape
+    index = np.where(np.isnan(matrix), 0, np.arange(n_cols)[np.newaxis, :])
+    np.maximum.accumulate(index, axis=1, out=index)
+    filled = matrix[np.arange(n_rows)[:, np.newaxis], index]
+    filled[:, 0] = matrix[:, 0]
+    return filled
+
+
+def positions_from_rsi(rsi, oversold, overbought):
+    """RSI 행렬에서 보유 여부(1/0) 행렬 계산
+
+    진입(≤ oversold)과 청산(≥ overbought) 신호만 남기고 나머지 봉은 직전 상태를 이어받습니다.
+    """
+    signal = np.full(rsi.shape, np.nan)
+    signal[rsi <= oversold] = 1.0
+    signal[rsi >= overbought] = 0.0
+    position = _forward_fill(signal)
+    return np.nan_to_num(position, nan=0.0)
+
+
+def bar_returns(closes):
+    """봉별 단순 수익률 행렬 (첫 봉/결측 구간은 0)"""
+    closes = as_price_matrix(closes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.zeros_like(closes)
+        returns[:, 1:] = closes[:, 1:] / closes[:, :-1] - 1.0
+    return np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def simulate(closes, rsi, oversold, overbought, cost_bps=0.0, periods_per_year=PERIODS_PER_YEAR, returns=None):
+    """미리 계산한 RSI로 임계값 전략 성과 계산
+
+    Args:
+        closes: (심볼 × 봉) 종가 행렬
+        rsi: closes와 같은 형태의 RSI 행렬
+        oversold: 매수 임계값
+        overbought: 매도 임계값
+        cost_bps: 매수/매도 1회당 거래 비용 (bp)
+        periods_per_year: 연환산 봉 수
+        returns: 미리 계산한 bar_returns(closes) (여러 임계값을 반복 평가할 때 재사용)
+
+    Returns:
+        dict: { 지표명: (심볼,) 배열 } - METRIC_COLUMNS 참고
+    """
+    closes = as_price_matrix(closes)
+    n_rows, n_cols = closes.shape
+    if returns is None:
+        returns = bar_returns(closes)
+
+    # t 봉 종가에 정한 포지션으로 t+1 봉 수익률을 얻음
+    position = positions_from_rsi(rsi, oversold, overbought)
+    held = np.zeros_like(position)
+    held[:, 1:] = position[:, :-1]
+
+    changes = np.abs(np.diff(position, axis=1, prepend=0.0))
+    costs = np.zeros_like(position)
+    costs[:, 1:] = changes[:, :-1] * (cost_bps / 10000.0)
+    strategy_returns = held * returns - costs
+
+    log_growth = np.log1p(strategy_returns)
+    equity_log = np.cumsum(log_growth, axis=1)
+    equity = np.exp(equity_log)
+    drawdown = equity / np.maximum.accumulate(np.maximum(equity, 1.0), axis=1) - 1.0
+
+    valid = ~np.isnan(closes)
+    bars = valid.sum(axis=1)
+    years = np.maximum(bars - 1, 1) / periods_per_year
+    total_return = equity[:, -1] - 1.0
+
+    first_index = valid.argmax(axis=1)
+    last_index = n_cols - 1 - valid[:, ::-1].argmax(axis=1)
+    rows = np.arange(n_rows)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        buy_hold = closes[rows, last_index] / closes[rows, first_index] - 1.0
+        cagr = np.power(1.0 + total_return, 1.0 / years) - 1.0
+
+    # 매매 단위 수익률: 진입 봉마다 거래 번호를 붙이고 보유 구간의 로그 수익률을 합산
+    entries = np.diff(position, axis=1, prepend=0.0) > 0
+    trade_number = np.cumsum(entries, axis=1)
+    in_trade = held > 0
+    trade_ids = np.where(in_trade, rows[:, np.newaxis] * (n_cols + 1) + np.roll(trade_number, 1, axis=1), -1)
+    trade_ids[:, 0] = -1
+
+    flat_ids = trade_ids[in_trade]
+    unique_ids, inverse = np.unique(flat_ids, return_inverse=True)
+    trade_log_returns = np.bincount(inverse, weights=log_growth[in_trade], minlength=len(unique_ids))
+    trade_rows = unique_ids // (n_cols + 1)
+
+    # 마지막 봉까지 보유 중인 매매는 미청산으로 보고 적중률에서 제외
+    open_ids = np.where(position[:, -1] > 0, rows * (n_cols + 1) + trade_number[:, -1], -1)
+    closed = ~np.isin(unique_ids, open_ids)
+
+    trades = entries.sum(axis=1)
+    closed_trades = np.bincount(trade_rows[closed], minlength=n_rows)
+    wins = np.bincount(trade_rows[closed], weights=(trade_log_returns[closed] > 0), minlength=n_rows)
+    trade_return_sum = np.bincount(trade_rows[closed], weights=np.expm1(trade_log_returns[closed]), minlength=n_rows)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hit_rate = np.where(closed_trades > 0, wins / closed_trades, np.nan)
+        avg_trade_return = np.where(closed_trades > 0, trade_return_sum / closed_trades, np.nan)
+
+    return {
+        'total_return': total_return,
+        'buy_hold_return': buy_hold,
+        'cagr': cagr,
+        'max_drawdown': drawdown.min(axis=1),
+        'trades': trades,
+        'closed_trades': closed_trades,
+        'hit_rate': hit_rate,
+        'avg_trade_return': avg_trade_return,
+        'exposure': np.where(bars > 0, held.sum(axis=1) / np.maximum(bars, 1), np.nan),
+        'years': years,
+    }
+
+
+def run_backtest(closes, period=None, oversold=None, overbought=None, cost_bps=0.0):
+    """RSI 임계값 전략 백테스트
+
+    기간/임계값을 지정하지 않으면 RSI_PERIOD, RSI_OVERSOLD_THRESHOLD, RSI_OVERBOUGHT_THRESHOLD를 사용합니다.
+
+    Args:
+        closes: DataFrame(날짜 × 심볼) 또는 (심볼 × 봉) 종가 배열
+        period: RSI 계산 기간
+        oversold: 매수 임계값
+        overbought: 매도 임계값
+        cost_bps: 매수/매도 1회당 거래 비용 (bp)
+
+    Returns:
+        pandas.DataFrame: 심볼별 성과 지표 (METRIC_COLUMNS)
+    """
+    period = period or int(os.getenv('RSI_PERIOD', 14))
+    oversold = oversold if oversold is not None else float(os.getenv('RSI_OVERSOLD_THRESHOLD', 30))
+    overbought = overbought if overbought is not None else float(os.getenv('RSI_OVERBOUGHT_THRESHOLD', 70))
+
+    if isinstance(closes, pd.DataFrame):
+        symbols = list(closes.columns)
+        matrix = closes.to_numpy(dtype=np.float64).T
+    else:
+        matrix = as_price_matrix(closes)
+        symbols = list(range(matrix.shape[0]))
+
+    metrics = simulate(matrix, wilder_rsi(matrix, period), oversold, overbought, cost_bps)
+    return pd.DataFrame(metrics, index=pd.Index(symbols, name='symbol'))[METRIC_COLUMNS]
+
+
+def history_start(years):
+    """오늘부터 years년 전 날짜"""
+    return pd.Timestamp.now().normalize() - pd.Timedelta(days=int(years * 365.25) + 1)
+
+
+def load_closes(symbols, years, store_dir=None):
+    """일봉 종가 행렬(날짜 × 심볼) 조회
+
+    store_dir를 지정하면 memmap 컬럼형 저장소(price_store)의 종가를 복사 없이 감싸고,
+    아니면 Provider(가격 캐시 포함)에서 조회합니다.
+    """
+    if store_dir:
+        from price_store import ColumnarPriceStore
+
+        store = ColumnarPriceStore(store_dir)
+        start = history_start(years)
+        columns = store.date_range(start)
+        matrix = store.slice('Close', symbols, start)
+        return pd.DataFrame(matrix.T, index=store.dates[columns], columns=store.present_symbols(symbols), copy=False)
+
+    from rsi_calculator import RSICalculator
+
+    price_data = RSICalculator().get_stock_data_bulk(symbols, days=int(years * 365.25) + 1)
+    if not price_data:
+        return pd.DataFrame()
+    return pd.concat({symbol: frame['Close'] for symbol, frame in price_data.items()}, axis=1).sort_index()
+
+
+def format_backtest_report(results, period, oversold, overbought):
+    """심볼별 결과 표와 전체 요약 문자열"""
+    table = results.copy()
+    for column in ('total_return', 'buy_hold_return', 'cagr', 'max_drawdown', 'hit_rate', 'avg_trade_return', 'exposure'):
+        table[column] = (table[column] * 100).round(2)
+    table['years'] = table['years'].round(1)
+
+    lines = [
+        f"RSI({period}) 임계값 전략 백테스트: 매수 ≤ {oversold}, 매도 ≥ {overbought} ({len(results)}개 심볼)",
+        "",
+        table.to_string(),
+        "",
+        f"평균 총수익률: {results['total_return'].mean() * 100:.2f}% (매수 후 보유: {results['buy_hold_return'].mean() * 100:.2f}%)",
+        f"평균 CAGR: {results['cagr'].mean() * 100:.2f}%, 평균 최대 낙폭: {results['max_drawdown'].mean() * 100:.2f}%",
+        f"전체 적중률: {results['hit_rate'].mul(results['closed_trades']).sum() / max(results['closed_trades'].sum(), 1) * 100:.2f}% "
+        f"({int(results['closed_trades'].sum())}건 청산)",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSI 임계값 전략 백테스트")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--symbols', nargs='+', default=['SPY', 'QQQ', 'DIA'], help="백테스트 심볼")
+    group.add_argument('--universe', help="유니버스 파일 (한 줄에 심볼 하나)")
+    parser.add_argument('--years', type=float, default=20, help="백테스트 기간(년)")
+    parser.add_argument('--period', type=int, default=None, help="RSI 기간 (기본값: RSI_PERIOD)")
+    parser.add_argument('--oversold', type=float, default=None, help="매수 임계값 (기본값: RSI_OVERSOLD_THRESHOLD)")
+    parser.add_argument('--overbought', type=float, default=None, help="매도 임계값 (기본값: RSI_OVERBOUGHT_THRESHOLD)")
+    parser.add_argument('--cost-bps', type=float, default=0.0, help="매수/매도 1회당 거래 비용 (bp)")
+    parser.add_argument('--store', help="memmap 컬럼형 저장소 디렉토리 (price_store.py build로 생성)")
+    parser.add_argument('--output', help="결과 저장 경로 (.csv 또는 .json)")
+    args = parser.parse_args(argv)
+
+    if args.universe:
+        from scanner import load_universe
+
+        symbols = load_universe(args.universe)
+    else:
+        symbols = [symbol.upper() for symbol in args.symbols]
+
+    closes = load_closes(symbols, args.years, store_dir=args.store)
+    if closes.empty:
+        print("가격 데이터를 가져올 수 없습니다.", file=sys.stderr)
+        return 1
+
+    period = args.period or int(os.getenv('RSI_PERIOD', 14))
+    oversold = args.oversold if args.oversold is not None else float(os.getenv('RSI_OVERSOLD_THRESHOLD', 30))
+    overbought = args.overbought if args.overbought is not None else float(os.getenv('RSI_OVERBOUGHT_THRESHOLD', 70))
+
+    started_at = time.perf_counter()
+    results = run_backtest(closes, period, oversold, overbought, args.cost_bps)
+    elapsed = time.perf_counter() - started_at
+
+    print(format_backtest_report(results, period, oversold, overbought))
+    print(f"\n계산 시간: {elapsed:.3f}초 ({closes.shape[1]}개 심볼 × {closes.shape[0]}개 봉)")
+
+    if args.output:
+        if args.output.endswith('.json'):
+            results.to_json(args.output, orient='index', force_ascii=False, indent=2)
+        else:
+            results.to_csv(args.output)
+        print(f"결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
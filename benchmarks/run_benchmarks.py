@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""RSI/분류/메시지 포맷팅 핫패스 오프라인 벤치마크
+
+네트워크 없이 합성 가격 데이터(기하 랜덤워크)로 측정하고,
+결과를 JSON으로 출력해 버전 간 성능 회귀를 추적할 수 있게 합니다.
+
+사용법:
+    python -m benchmarks.run_benchmarks --sizes tiny small --repeat 5 --output bench.json
+
+크기 프리셋 (봉 수 × 심볼 수):
+    tiny    100 × 3
+    small   1,000 × 100
+    medium  2,520 × 1,000  (10년 일봉)
+    large   2,000 × 5,000  (총 1,000만 봉)
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from fear_greed_fetch import FearGreedFetcher  # noqa: E402
+from main import format_market_message  # noqa: E402
+from price_provider import CSVFileProvider  # noqa: E402
+from rsi_calculator import RSICalculator  # noqa: E402
+from vix_analysis import VIXAnalyzer  # noqa: E402
+
+SIZES = {
+    'tiny': (100, 3),
+    'small': (1_000, 100),
+    'medium': (2_520, 1_000),
+    'large': (2_000, 5_000),
+}
+
+
+def synthetic_closes(n_bars, n_symbols, seed=42):
+    """기하 랜덤워크 종가 행렬 (심볼 × 봉)"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.015, size=(n_symbols, n_bars))
+    return 100.0 * np.exp(np.cumsum(returns, axis=1))
+
+
+def measure(func, repeat):
+    """func를 repeat회 실행한 소요 시간(초) 리스트"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def summarize(name, size, n_bars, n_symbols, items, timings):
+    return {
+        'name': name,
+        'size': size,
+        'bars': n_bars,
+        'symbols': n_symbols,
+        'items': items,
+        'repeat': len(timings),
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.fmean(timings),
+        'items_per_s': items / min(timings) if min(timings) > 0 else None,
+    }
+
+
+def bench_size(size, repeat, max_scalar_calls):
+    n_bars, n_symbols = SIZES[size]
+    closes = synthetic_closes(n_bars, n_symbols)
+    dates = pd.bdate_range('2000-01-03', periods=n_bars)
+    series_list = [pd.Series(row, index=dates) for row in closes]
+    frame = pd.DataFrame(closes.T, index=dates)
+
+    # 오프라인 측정을 위해 비어 있는 로컬 Provider 사용
+    provider = CSVFileProvider(tempfile.mkdtemp())
+    calculator = RSICalculator(provider)
+    vix = VIXAnalyzer(provider)
+    fgi = FearGreedFetcher()
+
+    rng = np.random.default_rng(7)
+    n_scalar = min(n_bars * n_symbols, max_scalar_calls)
+    vix_values = rng.uniform(9, 60, n_scalar).tolist()
+    fgi_values = rng.integers(0, 101, n_scalar).tolist()
+
+    rsi_data_list = [
+        {
+            'symbol': f'SYM{i}',
+            'rsi_value': round(float(rng.uniform(10, 90)), 2),
+            'current_price': round(float(closes[i, -1]), 2),
+            'status': ('과매도', '정상', '과매수')[i % 3],
+            'timestamp': '2026-01-02 16:00:00',
+        }
+        for i in range(n_symbols)
+    ]
+    vix_info = {'symbol': '^VIX', 'close': 18.5, 'status': '안정', 'timestamp': '2026-01-02 16:00:00'}
+    fgi_info = {'value': 42, 'status_kr': '공포', 'status_en': 'Fear', 'timestamp': '2026-01-02 16:00:00'}
+
+    cases = [
+        ('calculate_rsi', n_bars * n_symbols, lambda: [calculator.calculate_rsi(s) for s in series_list]),
+        ('calculate_rsi_ta', n_bars * n_symbols, lambda: [calculator.calculate_rsi_ta(s) for s in series_list]),
+        ('calculate_rsi_matrix', n_bars * n_symbols, lambda: calculator.calculate_rsi_matrix(frame)),
+        ('calculate_rsi_variants', n_bars * n_symbols, lambda: calculator.calculate_rsi_variants(frame)),
+        ('classify_vix', n_scalar, lambda: [vix.classify_vix(v) for v in vix_values]),
+        ('classify_fgi', n_scalar, lambda: [fgi.classify_fgi(v) for v in fgi_values]),
+        ('format_market_message', n_symbols, lambda: format_market_message(rsi_data_list, vix_info, fgi_info)),
+    ]
+
+    results = []
+    for name, items, func in cases:
+        timings = measure(func, repeat)
+        result = summarize(name, size, n_bars, n_symbols, items, timings)
+        print(f"[{size}] {name}: min {result['min_s'] * 1000:.2f}ms, median {result['median_s'] * 1000:.2f}ms", file=sys.stderr)
+        results.append(result)
+    return results
+
+
+def environment_info():
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        revision = None
+
+    return {
+        'revision': revision,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSI Tracker 오프라인 벤치마크")
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['tiny', 'small'])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-scalar-calls', type=int, default=1_000_000,
+                        help="classify_vix/classify_fgi 호출 수 상한")
+    parser.add_argument('--output', help="JSON 결과 파일 경로 (기본값: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    report = {'environment': environment_info(), 'results': []}
+    for size in args.sizes:
+        report['results'].extend(bench_size(size, args.repeat, args.max_scalar_calls))
+
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload, encoding='utf-8')
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,20 @@
 # -*- coding: utf-8 -*-
 from datetime import datetime
+from fgi_history import create_fgi_history_store
 from utils.logger_util import LoggerUtil
+from utils.metrics_util import MetricsUtil
 
 
 class FearGreedFetcher:
     """CNN Fear & Greed Index 수집기 (간결 버전)
 
     fear-and-greed 라이브러리의 공식 사용 예시를 따릅니다.
+    이력 저장소(fgi_history)가 있으면 신선한 저장 값을 재사용하고 1주전/1달전 값을 채웁니다.
     """
 
-    def __init__(self):
+    def __init__(self, history=None):
         self.logger = LoggerUtil().get_logger()
+        self.history = history if history is not None else create_fgi_history_store()
 
     def classify_fgi(self, value):
         """FGI 값(0~100) 분류
@@ -34,34 +38,77 @@ class FearGreedFetcher:
             return "탐욕", "Greed"
         return "극단적 탐욕", "Extreme Greed"
 
+    def _fetch_latest(self):
+        """원본(CNN)에서 최신 FGI 조회"""
+        import fear_and_greed
+
+        with MetricsUtil().timer('get_latest_fgi', source='cnn'):
+            fgi = fear_and_greed.get()
+        # fgi: FearGreedIndex(value: float, description: str, last_update: datetime)
+        value_now = fgi.value
+        desc_en = fgi.description  # e.g., 'fear', 'extreme greed'
+        last_update = fgi.last_update
+
+        # 값 정규화 및 상태 매핑
+        value_int = int(round(value_now)) if isinstance(value_now, (int, float)) else None
+        status_kr, status_en_by_value = self.classify_fgi(value_int)
+
+        # 라이브러리의 description이 제공되면 영어 상태에 우선 반영
+        status_en = (desc_en or status_en_by_value or "").strip().title() if desc_en else status_en_by_value
+
+        return {
+            "value": value_int,
+            "status_kr": status_kr,
+            "status_en": status_en,
+            "timestamp": (last_update or datetime.utcnow()).strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def get_lookback(self, days, as_of=None):
+        """이력 저장소에서 as_of(기본값: 오늘) 기준 days일 전 FGI 조회
+
+        Returns:
+            dict | None: { value, status_kr, status_en }
+        """
+        if self.history is None:
+            return None
+        value = self.history.lookback(as_of or datetime.now(), days)
+        if value is None:
+            return None
+        status_kr, status_en = self.classify_fgi(value)
+        return {"value": value, "status_kr": status_kr, "status_en": status_en}
+
     def get_latest_fgi(self):
         """최신 Fear & Greed Index 반환
 
+        FGI_CACHE_TTL_SECONDS 이내에 수집한 값이 있으면 원본을 조회하지 않고 재사용합니다.
+
         Returns:
-            dict | None: { value, status_kr, status_en, timestamp }
+            dict | None: { value, status_kr, status_en, timestamp } + 이력이 있으면
+                         { week_value, week_status_kr, month_value, month_status_kr }
         """
         try:
-            import fear_and_greed
+            cached = self.history.fresh_reading() if self.history is not None else None
+            if cached is not None:
+                result = {
+                    "value": cached["value"],
+                    "status_kr": self.classify_fgi(cached["value"])[0],
+                    "status_en": cached["status_en"],
+                    "timestamp": cached["timestamp"],
+                }
+                MetricsUtil().increment('fgi_cache_hits_total')
+                self.logger.info(f"Fear & Greed Index 저장 값 재사용 (업데이트: {result['timestamp']})")
+            else:
+                result = self._fetch_latest()
+                if self.history is not None:
+                    self.history.record(result)
 
-            fgi = fear_and_greed.get()
-            # fgi: FearGreedIndex(value: float, description: str, last_update: datetime)
-            value_now = fgi.value
-            desc_en = fgi.description  # e.g., 'fear', 'extreme greed'
-            last_update = fgi.last_update
-
-            # 값 정규화 및 상태 매핑
-            value_int = int(round(value_now)) if isinstance(value_now, (int, float)) else None
-            status_kr, status_en_by_value = self.classify_fgi(value_int)
-
-            # 라이브러리의 description이 제공되면 영어 상태에 우선 반영
-            status_en = (desc_en or status_en_by_value or "").strip().title() if desc_en else status_en_by_value
-
-            result = {
-                "value": value_int,
-                "status_kr": status_kr,
-                "status_en": status_en,
-                "timestamp": (last_update or datetime.utcnow()).strftime("%Y-%m-%d %H:%M:%S"),
-            }
+            if self.history is not None:
+                as_of = datetime.strptime(result["timestamp"][:10], "%Y-%m-%d")
+                for prefix, days in (("week", 7), ("month", 30)):
+                    past = self.get_lookback(days, as_of)
+                    if past is not None:
+                        result[f"{prefix}_value"] = past["value"]
+                        result[f"{prefix}_status_kr"] = past["status_kr"]
 
             self.logger.info(
                 f"Fear & Greed Index: {result['value']} ({result['status_kr']} / {result['status_en']}), 업데이트: {result['timestamp']}"
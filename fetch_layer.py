@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""원본 가격 조회 보호 계층
+
+원본 Provider(yfinance 등) 바로 앞에서 다음을 처리합니다.
+
+- 동시 요청 병합: 같은 (심볼, 기간, 간격)을 여러 스레드가 동시에 요청하면 한 번만 조회하고 결과를 나눠 받음
+- 재시도: 예외, 빈 결과, 요청한 심볼이 빠진 결과(yfinance의 일시적 오류/차단 응답)는
+  지터가 섞인 지수 백오프로 빠진 심볼만 재시도하고, 재시도 횟수를 넘기면 받은 만큼만 반환
+- 속도 제한: 토큰 버킷으로 원본 호출 빈도를 제한해 대량 동시 사용 시 원본의 차단을 방지
+
+보호 계층은 원본 Provider 이름별로 프로세스에 하나만 만들어 보고서/스캔/VIX 등 모든 호출자가
+진행 중인 조회와 속도 한도를 공유합니다 (유니버스 스캔 워커는 각자 한도를 가짐).
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+
+from price_provider import PriceDataProvider
+from utils.logger_util import LoggerUtil
+from utils.metrics_util import MetricsUtil
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한기
+
+    초당 rate개씩 최대 capacity개까지 토큰이 쌓이며, 호출 시점마다 필요한 토큰을 예약하므로
+    여러 스레드가 동시에 호출해도 한도를 넘지 않습니다.
+    capacity보다 많은 토큰도 음수 잔량으로 예약해 전부 차감하므로 큰 일괄 조회도 평균 속도 한도를 지킵니다.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def acquire(self, tokens=1.0):
+        """토큰을 예약하고 사용 가능해질 때까지 대기
+
+        Returns:
+            float: 대기한 시간(초)
+        """
+        tokens = float(tokens)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            # 부족분은 음수 잔량으로 예약해 다음 호출이 그만큼 더 기다리도록 함
+            self._tokens -= tokens
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+def _range_key(start, end, interval):
+    """요청 병합용 기간 키 (일봉은 날짜, 그 외는 분 단위)"""
+    unit = 'D' if interval == '1d' else 'min'
+    return tuple(
+        None if value is None else pd.Timestamp(value).tz_localize(None).floor(unit).isoformat()
+        for value in (start, end)
+    ) + (interval,)
+
+
+class ResilientPriceProvider(PriceDataProvider):
+    """요청 병합/재시도/속도 제한을 적용한 Provider 래퍼"""
+
+    def __init__(self, provider, max_retries=3, backoff_seconds=0.5, max_backoff_seconds=30.0,
+                 rate_per_second=2.0, burst=10):
+        self.provider = provider
+        self.name = provider.name
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.bucket = TokenBucket(rate_per_second, burst) if rate_per_second > 0 else None
+        self.logger = LoggerUtil().get_logger()
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def _fetch(self, symbols, start, end, interval):
+        """속도 제한 후 원본 조회
+
+        예외/빈 결과/빠진 심볼은 빠진 심볼만 백오프 후 재시도하고,
+        재시도 횟수를 넘기면 받은 만큼만 반환합니다 (모든 시도가 예외면 마지막 예외 발생).
+        """
+        results = {}
+        pending = list(symbols)
+        for attempt in range(self.max_retries + 1):
+            if self.bucket is not None:
+                # 일괄 조회는 심볼마다 원본 요청이 발생하므로 심볼 수만큼 토큰 사용
+                waited = self.bucket.acquire(len(pending))
+                if waited > 0:
+                    MetricsUtil().observe('fetch_rate_limit_wait_seconds', waited, source=self.name)
+            try:
+                frames = self.provider.get_histories(pending, start, end, interval)
+            except Exception as exc:
+                if attempt >= self.max_retries and not results:
+                    raise
+                reason, reason_label = f"조회 오류: {str(exc)}", 'error'
+            else:
+                results.update({symbol: frame for symbol, frame in frames.items() if frame is not None and not frame.empty})
+                pending = [symbol for symbol in pending if symbol not in results]
+                if not pending:
+                    break
+                reason = f"빈 결과 {len(pending)}/{len(symbols)}개 심볼"
+                reason_label = 'empty' if len(pending) == len(symbols) else 'missing'
+
+            if attempt >= self.max_retries:
+                self.logger.warning(f"{self.name} {reason} → 재시도 횟수 초과, {len(results)}/{len(symbols)}개 심볼만 반환")
+                break
+            delay = min(self.max_backoff_seconds, self.backoff_seconds * (2 ** attempt)) * random.uniform(0.5, 1.5)
+            MetricsUtil().increment('fetch_retries_total', source=self.name, reason=reason_label)
+            self.logger.warning(f"{self.name} {reason} → {delay:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+        return results
+
+    def get_histories(self, symbols, start, end, interval='1d'):
+        symbols = list(dict.fromkeys(symbols))
+        range_key = _range_key(start, end, interval)
+
+        owned, waiting = {}, {}
+        with self._lock:
+            for symbol in symbols:
+                key = (symbol, *range_key)
+                future = self._inflight.get(key)
+                if future is None:
+                    owned[symbol] = self._inflight[key] = Future()
+                else:
+                    waiting[symbol] = future
+
+        results = {}
+        if owned:
+            try:
+                frames = self._fetch(list(owned), start, end, interval)
+            except BaseException as exc:
+                for future in owned.values():
+                    future.set_exception(exc)
+                raise
+            else:
+                for symbol, future in owned.items():
+                    future.set_result(frames.get(symbol))
+                results.update({symbol: frame for symbol, frame in frames.items() if symbol in owned})
+            finally:
+                with self._lock:
+                    for symbol in owned:
+                        self._inflight.pop((symbol, *range_key), None)
+
+        if waiting:
+            MetricsUtil().increment('fetch_coalesced_total', len(waiting), source=self.name)
+            self.logger.info(f"진행 중인 조회와 병합: {len(waiting)}개 심볼")
+            for symbol, future in waiting.items():
+                frame = future.result()
+                if frame is not None:
+                    # 다른 호출자와 같은 객체를 공유하지 않도록 복사본 반환
+                    results[symbol] = frame.copy()
+
+        return {symbol: results[symbol] for symbol in symbols if symbol in results}
+
+
+# 원본 Provider 이름별 프로세스 공용 보호 계층
+_shared_layers = {}
+_shared_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    # fork된 자식은 부모의 진행 중 조회/잠금 상태를 물려받지 않고 새로 만듦
+    global _shared_lock
+    _shared_layers.clear()
+    _shared_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def create_fetch_layer(provider):
+    """환경변수 설정에 따라 Provider를 보호 계층으로 감싸 반환
+
+    같은 이름의 원본 Provider에는 프로세스 내 같은 보호 계층 인스턴스를 반환하므로
+    create_price_provider()를 여러 번 호출해도 요청 병합과 속도 한도가 공유됩니다.
+
+    - FETCH_LAYER_ENABLED: 'true'(기본값) / 'false'
+    - FETCH_MAX_RETRIES: 일시적 오류 재시도 횟수 (기본값: 3)
+    - FETCH_BACKOFF_SECONDS: 첫 재시도 대기 기준 시간(초, 기본값: 0.5, 매 재시도마다 2배)
+    - FETCH_RATE_PER_SECOND: 초당 원본 요청 수 (기본값: 2, 0이면 제한 없음)
+    - FETCH_BURST: 한 번에 허용하는 최대 요청 수 (기본값: 10)
+    """
+    if os.getenv('FETCH_LAYER_ENABLED', 'true').strip().lower() not in ('1', 'true', 'yes'):
+        return provider
+
+    with _shared_lock:
+        layer = _shared_layers.get(provider.name)
+        if layer is None:
+            layer = _shared_layers[provider.name] = ResilientPriceProvider(
+                provider,
+                max_retries=int(os.getenv('FETCH_MAX_RETRIES') or 3),
+                backoff_seconds=float(os.getenv('FETCH_BACKOFF_SECONDS') or 0.5),
+                rate_per_second=float(os.getenv('FETCH_RATE_PER_SECOND') or 2),
+                burst=float(os.getenv('FETCH_BURST') or 10),
+            )
+        return layer
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""CNN Fear & Greed Index 이력 저장소 (SQLite)
+
+매 실행의 FGI 값을 날짜별로 보관해 1주전/1달전 등 과거 값을 추가 요청 없이 조회하고,
+마지막 수집 후 ttl_seconds가 지나지 않았으면 저장된 값을 그대로 재사용합니다.
+
+- 날짜(FGI 업데이트 시각 기준)당 한 행, 같은 날 다시 수집하면 최신 값으로 갱신
+- 과거 값 조회는 기준일 이전의 가장 가까운 기록 사용 (휴장일 대비, 최대 max_gap_days일 차이까지)
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+CREATE_FGI_HISTORY_TABLE = """
+CREATE TABLE IF NOT EXISTS fgi_history (
+    reading_date TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    status_en TEXT,
+    last_update TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+)
+"""
+
+
+class FGIHistoryStore:
+    """날짜별 FGI 값 저장소 (신선도 TTL 포함)"""
+
+    def __init__(self, db_path, ttl_seconds=3600, max_gap_days=4):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_gap_days = max_gap_days
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(CREATE_FGI_HISTORY_TABLE)
+
+    @contextmanager
+    def _connect(self):
+        """커밋 후 닫히는 SQLite 연결"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, result, fetched_at=None):
+        """수집한 FGI 결과({ value, status_en, timestamp }) 저장"""
+        if result.get('value') is None:
+            return
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO fgi_history (reading_date, value, status_en, last_update, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(reading_date) DO UPDATE SET value = excluded.value, status_en = excluded.status_en, "
+                "last_update = excluded.last_update, fetched_at = excluded.fetched_at",
+                (result['timestamp'][:10], int(result['value']), result.get('status_en'), result['timestamp'], fetched_at),
+            )
+
+    def fresh_reading(self, now=None):
+        """마지막 수집이 ttl_seconds 이내면 { value, status_en, timestamp }, 아니면 None"""
+        if self.ttl_seconds <= 0:
+            return None
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, status_en, last_update, fetched_at FROM fgi_history ORDER BY fetched_at DESC LIMIT 1"
+            ).fetchone()
+        if row is None or now - row[3] >= self.ttl_seconds:
+            return None
+        return {'value': row[0], 'status_en': row[1], 'timestamp': row[2]}
+
+    def value_on_or_before(self, day):
+        """day 이전(포함) 가장 가까운 기록의 값 (max_gap_days보다 멀면 None)"""
+        day = day.strftime('%Y-%m-%d')
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT reading_date, value FROM fgi_history WHERE reading_date <= ? ORDER BY reading_date DESC LIMIT 1",
+                (day,),
+            ).fetchone()
+        if row is None:
+            return None
+        gap = datetime.strptime(day, '%Y-%m-%d') - datetime.strptime(row[0], '%Y-%m-%d')
+        return row[1] if gap.days <= self.max_gap_days else None
+
+    def lookback(self, as_of, days):
+        """as_of 기준 days일 전 값"""
+        return self.value_on_or_before(as_of - timedelta(days=days))
+
+    def get_history(self, start, end=None):
+        """[start, end] 기간의 (날짜, 값) 목록 (날짜 오름차순)"""
+        end = end or datetime.now()
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT reading_date, value FROM fgi_history WHERE reading_date BETWEEN ? AND ? ORDER BY reading_date",
+                (start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')),
+            ).fetchall()
+
+
+def create_fgi_history_store():
+    """환경변수 설정에 따른 FGI 이력 저장소 생성 (비활성화 시 None)
+
+    - FGI_HISTORY_ENABLED: 'false'면 매번 원본 조회, 1주전/1달전 값 미표시 (기존 동작)
+    - FGI_HISTORY_PATH: SQLite 파일 경로 (기본값: cache/fgi_history.sqlite3)
+    - FGI_CACHE_TTL_SECONDS: 마지막 수집 값을 재사용할 시간 (기본값: 3600, 0이면 매번 조회)
+    """
+    if os.getenv('FGI_HISTORY_ENABLED', 'true').strip().lower() in ('0', 'false', 'no'):
+        return None
+
+    default_path = Path(__file__).resolve().parent / 'cache' / 'fgi_history.sqlite3'
+    return FGIHistoryStore(
+        os.getenv('FGI_HISTORY_PATH') or str(default_path),
+        ttl_seconds=float(os.getenv('FGI_CACHE_TTL_SECONDS') or 3600),
+    )
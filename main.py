@@ -1,177 +1,462 @@
 # -*- coding: utf-8 -*-
+import os
 import sys
+import threading
+import time
 from dotenv import load_dotenv
 from utils.logger_util import LoggerUtil
+from utils.metrics_util import MetricsUtil
 from utils.telegram_util import TelegramUtil
-from rsi_calculator import RSICalculator
-from vix_analysis import VIXAnalyzer
-from fear_greed_fetch import FearGreedFetcher
+
+# pandas/numpy/yfinance를 끌어오는 계산 모듈은 실제로 필요한 실행 경로에서 import
+# (--test 메시지 전송, --profile-startup 등은 무거운 의존성 없이 시작)
 
 # 텔레그램 메시지 포맷팅을 이 파일에서 처리
+# 메시지는 줄 리스트로 만든 뒤 한 번에 join 하며, 4096자 초과분은 TelegramUtil.send_message가 나눠 전송
+
+# 지수 설명 매핑
+INDEX_DESCRIPTIONS = {
+    'SPY': 'S&P500',
+    'QQQ': 'Nasdaq',
+    'DIA': 'Dow-Jones'
+}
+
+RSI_STATUS_EMOJI = {"과매도": "🔴", "과매수": "🟢"}
+
+VIX_STATUS_EMOJI = {
+    "매우 안정": "🟢",
+    "안정": "🟢",
+    "경계": "🟡",
+    "불안": "🟠",
+    "위기": "🔴",
+}
+
+FGI_STATUS_EMOJI = {
+    "극단적 공포": "🟥",
+    "공포": "🟧",
+    "중립": "🟨",
+    "탐욕": "🟩",
+    "극단적 탐욕": "🟩",
+}
+
+def _symbol_display(symbol, index_descriptions=None):
+    if index_descriptions and symbol in index_descriptions:
+        return f"{symbol} ({index_descriptions[symbol]})"
+    return symbol
+
+def _rsi_section_lines(data, timeframe_labels):
+    """심볼 1개 RSI 섹션 줄 목록"""
+    lines = [
+        f"{RSI_STATUS_EMOJI.get(data['status'], '🔵')} <b>{_symbol_display(data['symbol'], INDEX_DESCRIPTIONS)}</b>",
+        f"   RSI: {data['rsi_value']}",
+    ]
+    if data.get('rsi_timeframes'):
+        timeframe_rsi = data['rsi_timeframes']
+        labels = "/".join(timeframe_labels[timeframe] for timeframe in timeframe_rsi)
+        values = " / ".join("N/A" if value is None else str(value) for value in timeframe_rsi.values())
+        lines.append(f"   RSI({labels}): {values}")
+    lines += [
+        f"   현재가: ${data['current_price']}",
+        f"   상태: {data['status']}",
+        "",
+    ]
+    return lines
+
 def format_market_message(rsi_data_list, vix_info, fgi_info=None):
     if not rsi_data_list:
         return "RSI 데이터를 가져올 수 없습니다."
 
-    # 지수 설명 매핑
-    index_descriptions = {
-        'SPY': 'S&P500',
-        'QQQ': 'Nasdaq',
-        'DIA': 'Dow-Jones'
-    }
+    timeframe_labels = {}
+    if any(data.get('rsi_timeframes') for data in rsi_data_list):
+        from rsi_calculator import TIMEFRAMES
 
-    message = "📊 <b>미국 시장 현황 분석</b>\n\n"
+        timeframe_labels = {timeframe: spec[1] for timeframe, spec in TIMEFRAMES.items()}
+
+    lines = ["📊 <b>미국 시장 현황 분석</b>", ""]
 
     # 주요 지수 RSI 섹션
     for data in rsi_data_list:
-        status_emoji = "🔴" if data['status'] == "과매도" else "🟢" if data['status'] == "과매수" else "🔵"
-
-        symbol_display = data['symbol']
-        if symbol_display in index_descriptions:
-            symbol_display = f"{data['symbol']} ({index_descriptions[data['symbol']]})"
-
-        message += f"{status_emoji} <b>{symbol_display}</b>\n"
-        message += f"   RSI: {data['rsi_value']}\n"
-        message += f"   현재가: ${data['current_price']}\n"
-        message += f"   상태: {data['status']}\n\n"
+        lines += _rsi_section_lines(data, timeframe_labels)
 
     # VIX 섹션 (RSI 다음)
     if vix_info is not None:
-        vix_status_emoji = {
-            "매우 안정": "🟢",
-            "안정": "🟢",
-            "경계": "🟡",
-            "불안": "🟠",
-            "위기": "🔴",
-        }.get(vix_info.get("status", "경계"), "🟡")
-        message += "🌪 <b>VIX 변동성 지표</b>\n"
-        message += f"   VIX 종가: {vix_info.get('close', 'N/A')}\n"
-        message += f"   상태: {vix_status_emoji} {vix_info.get('status', 'N/A')}\n\n"
+        vix_status_emoji = VIX_STATUS_EMOJI.get(vix_info.get("status", "경계"), "🟡")
+        lines += [
+            "🌪 <b>VIX 변동성 지표</b>",
+            f"   VIX 종가: {vix_info.get('close', 'N/A')}",
+            f"   상태: {vix_status_emoji} {vix_info.get('status', 'N/A')}",
+        ]
+        # 백분위/상태 지속 기간이 있을 때만 표시
+        if vix_info.get('percentile') is not None or vix_info.get('regime_days'):
+            from vix_analysis import vix_detail_lines
+
+            lines += vix_detail_lines(vix_info)
+        lines.append("")
 
     # Fear & Greed Index 섹션 (있을 경우)
     if fgi_info is not None:
-        fgi_emoji = {
-            "극단적 공포": "🟥",
-            "공포": "🟧",
-            "중립": "🟨",
-            "탐욕": "🟩",
-            "극단적 탐욕": "🟩",
-        }.get(fgi_info.get("status_kr", "중립"), "🟨")
-        message += "🧭 <b>Fear & Greed Index</b>\n"
-        message += f"   현재: {fgi_info.get('value', 'N/A')}\n"
-        message += f"   상태: {fgi_emoji} {fgi_info.get('status_kr', 'N/A')} ({fgi_info.get('status_en', 'N/A')})\n"
-        message += f"   <a href='https://money.cnn.com/data/fear-and-greed/' target='_blank'>사이트 바로가기</a>\n"
+        fgi_emoji = FGI_STATUS_EMOJI.get(fgi_info.get("status_kr", "중립"), "🟨")
+        lines += [
+            "🧭 <b>Fear & Greed Index</b>",
+            f"   현재: {fgi_info.get('value', 'N/A')}",
+            f"   상태: {fgi_emoji} {fgi_info.get('status_kr', 'N/A')} ({fgi_info.get('status_en', 'N/A')})",
+            "   <a href='https://money.cnn.com/data/fear-and-greed/' target='_blank'>사이트 바로가기</a>",
+        ]
         # 1주전/1달전 값이 있을 때만 표시
         week_val = fgi_info.get('week_value')
         month_val = fgi_info.get('month_value')
         if week_val is not None:
-            message += f"   1주전: {week_val} ({fgi_info.get('week_status_kr', 'N/A')})\n"
+            lines.append(f"   1주전: {week_val} ({fgi_info.get('week_status_kr', 'N/A')})")
         if month_val is not None:
-            message += f"   1달전: {month_val} ({fgi_info.get('month_status_kr', 'N/A')})\n"
-        message += "\n"
+            lines.append(f"   1달전: {month_val} ({fgi_info.get('month_status_kr', 'N/A')})")
+        lines.append("")
+
+    lines.append(f"⏰ 업데이트: {rsi_data_list[0]['timestamp']}")
+
+    return "\n".join(lines) + "\n"
+
+def format_transition_line(data, index_descriptions=None):
+    """상태 전이 1건 알림 문구 (예: 🔴 SPY (S&P500): RSI 28.5 (정상 → 과매도))"""
+    status_emoji = RSI_STATUS_EMOJI.get(data['current'], "🔵")
+    symbol_display = _symbol_display(data['symbol'], index_descriptions)
+
+    if data['previous'] == "정상":
+        return f"{status_emoji} {symbol_display}: RSI {data['rsi_value']} ({data['current']})"
+    return f"{status_emoji} {symbol_display}: RSI {data['rsi_value']} ({data['previous']} → {data['current']})"
+
+def format_alert_message(alert_symbols, message):
+    """상태 전이 알림 블록 + 현황 보고 메시지"""
+    lines = ["🚨 <b>미국 시장 현황 분석 - 알림</b>", ""]
+    lines += [format_transition_line(data, INDEX_DESCRIPTIONS) for data in alert_symbols]
+    lines += ["", message]
+    return "\n".join(lines)
+
+def format_scan_message(ranked, total_symbols, scanned_symbols, elapsed_seconds, transitions=None):
+    """유니버스 스캔 요약 메시지 (상태 전이 + 과매도/과매수 상위 종목)
+
+    상태 전이는 신규 과매도/신규 과매수/해제 섹션으로 묶어 표시합니다.
+    """
+    lines = [
+        "🔎 <b>유니버스 RSI 스캔 결과</b>",
+        "",
+        f"   스캔: {scanned_symbols}/{total_symbols}개 심볼 ({elapsed_seconds:.1f}초)",
+        f"   과매도: {ranked['oversold_count']}개, 과매수: {ranked['overbought_count']}개",
+        "",
+    ]
 
-    message += f"⏰ 업데이트: {rsi_data_list[0]['timestamp']}\n"
+    if transitions:
+        sections = {"과매도": [], "과매수": [], "정상": []}
+        for data in transitions:
+            sections[data['current']].append(data)
 
-    return message
+        for title, key in (("신규 과매도", "과매도"), ("신규 과매수", "과매수"), ("해제", "정상")):
+            if not sections[key]:
+                continue
+            lines.append(f"🆕 <b>{title} ({len(sections[key])}개)</b>")
+            lines += [f"   {format_transition_line(data)}" for data in sections[key]]
+            lines.append("")
+
+    for title, emoji, key in (("과매도 상위", "🔴", 'oversold'), ("과매수 상위", "🟢", 'overbought')):
+        if not ranked[key]:
+            continue
+        lines.append(f"{emoji} <b>{title}</b>")
+        lines += [
+            f"   {rank}. {data['symbol']}: RSI {data['rsi_value']} (${data['current_price']})"
+            for rank, data in enumerate(ranked[key], start=1)
+        ]
+        lines.append("")
+
+    return "\n".join(lines) + "\n"
 
 # 환경변수 로드
 load_dotenv()
 
-def main():
-    """메인 실행 함수"""
-    logger = LoggerUtil().get_logger()
-    
+def run_with_deadlines(tasks, logger):
+    """여러 수집 작업을 동시에 실행하고 작업별 제한 시간까지만 결과를 기다림
+
+    제한 시간을 넘긴 작업은 None으로 처리하며(부분 결과), 백그라운드 데몬 스레드로
+    남겨 두어 프로그램 종료를 막지 않습니다.
+
+    Args:
+        tasks: { name: (callable, timeout_seconds) }
+        logger: 로거
+
+    Returns:
+        dict: { name: 결과 또는 None }
+    """
+    results = {}
+    done_events = {}
+
+    def worker(name, func):
+        try:
+            with MetricsUtil().timer('collect', source=name):
+                results[name] = func()
+        except Exception as exc:
+            logger.error(f"{name} 수집 중 오류: {str(exc)}")
+            results[name] = None
+        finally:
+            done_events[name].set()
+
+    started_at = time.monotonic()
+    for name, (func, _) in tasks.items():
+        done_events[name] = threading.Event()
+        threading.Thread(target=worker, args=(name, func), name=f"collect-{name}", daemon=True).start()
+
+    collected = {}
+    for name, (_, timeout) in tasks.items():
+        remaining = max(0.0, timeout - (time.monotonic() - started_at))
+        if done_events[name].wait(remaining):
+            collected[name] = results.get(name)
+            logger.info(f"{name} 수집 완료 ({time.monotonic() - started_at:.2f}초)")
+        else:
+            collected[name] = None
+            MetricsUtil().increment('collect_timeouts_total', source=name)
+            logger.warning(f"{name} 수집 제한 시간({timeout}초) 초과 → 결과 없이 진행")
+
+    return collected
+
+def collect_market_data(rsi_calc, vix, fgi_fetcher, symbols, logger):
+    """RSI/VIX/FGI 데이터를 동시에 수집 (소스별 제한 시간 적용)
+
+    제한 시간(초)은 환경변수로 조정합니다.
+    - RSI_COLLECT_TIMEOUT (기본값: 60)
+    - VIX_COLLECT_TIMEOUT (기본값: 30)
+    - FGI_COLLECT_TIMEOUT (기본값: 20)
+
+    Returns:
+        tuple: (rsi_results, vix_info, fgi_info) - 실패/시간 초과 소스는 빈 리스트 또는 None
+    """
+    collected = run_with_deadlines({
+        'RSI': (lambda: rsi_calc.get_rsi_for_symbols(symbols), float(os.getenv('RSI_COLLECT_TIMEOUT', 60))),
+        'VIX': (vix.get_latest_vix, float(os.getenv('VIX_COLLECT_TIMEOUT', 30))),
+        'FGI': (fgi_fetcher.get_latest_fgi, float(os.getenv('FGI_COLLECT_TIMEOUT', 20))),
+    }, logger)
+
+    return collected['RSI'] or [], collected['VIX'], collected['FGI']
+
+def save_market_history(rsi_results, vix_info, fgi_info, logger):
+    """실행 결과를 DB 이력 테이블에 일괄 저장 (DB_HOST 미설정 시 건너뜀, 실패해도 보고서 전송에는 영향 없음)"""
+    if not os.getenv('DB_HOST'):
+        return
+
     try:
-        logger.info("미국 시장 현황 분석 프로그램 시작")
-        
+        from utils.db_manager import create_market_history_tables, pooled_connection, save_market_snapshot
+
+        with pooled_connection() as conn:
+            create_market_history_tables(conn)
+            save_market_snapshot(conn, rsi_results, vix_info, fgi_info)
+            conn.commit()
+    except Exception as e:
+        logger.error(f"시장 지표 이력 저장 실패: {str(e)}")
+
+def export_metrics(logger):
+    """실행 지표를 Prometheus 텍스트 파일/JSON 요약으로 저장 (METRICS_ENABLED=false면 건너뜀)"""
+    if os.getenv('METRICS_ENABLED', 'true').strip().lower() in ('0', 'false', 'no'):
+        return
+
+    try:
+        prom_path, summary_path = MetricsUtil().export()
+        logger.info(f"실행 지표 저장 완료: {prom_path}, {summary_path}")
+    except Exception as e:
+        logger.error(f"실행 지표 저장 실패: {str(e)}")
+
+class MarketReporter:
+    """시장 현황 보고서 실행기
+
+    Provider(가격 캐시), RSI 계산기, 텔레그램 세션을 한 번만 만들고
+    `run_report()`를 여러 번 호출해도 재사용합니다 (데몬 모드에서 가격은 캐시에 없는 구간만 조회하고,
+    RSI는 매 실행마다 수집한 구간 전체로 다시 계산).
+    """
+
+    # 추적할 주식 심볼들
+    SYMBOLS = ['SPY', 'QQQ', 'DIA']
+
+    def __init__(self, logger, symbols=None):
+        from alert_state import create_alert_state_store
+        from fear_greed_fetch import FearGreedFetcher
+        from price_provider import create_price_provider
+        from rsi_calculator import RSICalculator
+        from vix_analysis import VIXAnalyzer
+
+        self.logger = logger
+
+        # 가격 데이터 Provider 초기화 (RSI/VIX 공용)
+        self.provider = create_price_provider()
+        logger.info(f"가격 데이터 Provider 초기화 완료: {self.provider.name}")
+
         # RSI 계산기 초기화
-        rsi_calc = RSICalculator()
+        self.rsi_calc = RSICalculator(self.provider)
         logger.info("RSI 계산기 초기화 완료")
-        
+
         # 텔레그램 유틸 초기화
-        telegram = TelegramUtil()
+        self.telegram = TelegramUtil()
         logger.info("텔레그램 유틸 초기화 완료")
 
         # VIX 분석기 초기화
-        vix = VIXAnalyzer()
+        self.vix = VIXAnalyzer(self.provider)
         logger.info("VIX 분석기 초기화 완료")
 
         # Fear & Greed Fetcher 초기화
-        fgi_fetcher = FearGreedFetcher()
+        self.fgi_fetcher = FearGreedFetcher()
         logger.info("Fear & Greed Fetcher 초기화 완료")
-        
-        # 추적할 주식 심볼들
-        symbols = ['SPY', 'QQQ', 'DIA']
-        logger.info(f"추적 대상 심볼: {symbols}")
-        
+
+        # 알림 상태 저장소 (상태 전이 시에만 알림)
+        self.alert_store = create_alert_state_store(self.rsi_calc.oversold_threshold, self.rsi_calc.overbought_threshold)
+
+        self.symbols = list(symbols or self.SYMBOLS)
+        logger.info(f"추적 대상 심볼: {self.symbols}")
+
+    def run_report(self):
+        """데이터 수집 → 메시지 전송 → 이력 저장 1회 실행 (실행 지표는 매 실행마다 새로 집계해 저장)
+
+        Returns:
+            bool: RSI 데이터 수집 성공 여부
+        """
+        metrics = MetricsUtil()
+        metrics.reset()
+        try:
+            with metrics.timer('run_report'):
+                return self._run_report()
+        finally:
+            export_metrics(self.logger)
+
+    def _run_report(self):
+        logger = self.logger
+        telegram = self.telegram
+
         # RSI 계산
-        logger.info("데이터 계산 시작 (RSI, VIX)")
-        rsi_results = rsi_calc.get_rsi_for_symbols(symbols)
-        vix_info = vix.get_latest_vix()
-        fgi_info = fgi_fetcher.get_latest_fgi()
-        
+        logger.info("데이터 수집 시작 (RSI, VIX, FGI 동시 수집)")
+        rsi_results, vix_info, fgi_info = collect_market_data(self.rsi_calc, self.vix, self.fgi_fetcher, self.symbols, logger)
+
         if not rsi_results:
             error_msg = "RSI 데이터를 가져올 수 없습니다."
             logger.error(error_msg)
             telegram.send_message(f"❌ 오류: {error_msg}")
-            return
-        
+            return False
+
         logger.info(f"RSI 계산 완료: {len(rsi_results)}개 심볼, VIX 수집: {'성공' if vix_info else '실패'}, FGI 수집: {'성공' if fgi_info else '실패'}")
-        
-        # 알림이 필요한 심볼들 확인
-        alert_symbols = []
-        for result in rsi_results:
-            if result['status'] in ['과매도', '과매수']:
-                alert_symbols.append(result)
-        
+
+        # 알림이 필요한 심볼들 확인 (알림 상태 저장소가 있으면 상태 전이가 발생한 심볼만)
+        if self.alert_store is not None:
+            transitions = self.alert_store.evaluate(rsi_results, scope='report')
+            alert_symbols = [t for t in transitions if t['notify']]
+            suppressed = len(transitions) - len(alert_symbols)
+            if suppressed:
+                logger.info(f"쿨다운으로 알림 보류: {suppressed}개 심볼")
+        else:
+            alert_symbols = [
+                {**result, 'previous': "정상", 'current': result['status']}
+                for result in rsi_results
+                if result['status'] in ['과매도', '과매수']
+            ]
+
         # 텔레그램 메시지 전송
         message = format_market_message(rsi_results, vix_info, fgi_info)
-        
+
         if alert_symbols:
-            # 지수 설명 매핑
-            index_descriptions = {
-                'SPY': 'S&P500',
-                'QQQ': 'Nasdaq', 
-                'DIA': 'Dow-Jones'
-            }
-            
             # 알림이 필요한 경우
-            alert_message = f"🚨 <b>미국 시장 현황 분석 - 알림</b>\n\n"
-            for symbol_data in alert_symbols:
-                status_emoji = "🔴" if symbol_data['status'] == "과매도" else "🟢"
-                
-                # 지수 설명 추가
-                symbol_display = symbol_data['symbol']
-                if symbol_display in index_descriptions:
-                    symbol_display = f"{symbol_data['symbol']} ({index_descriptions[symbol_data['symbol']]})"
-                
-                alert_message += f"{status_emoji} {symbol_display}: RSI {symbol_data['rsi_value']} ({symbol_data['status']})\n"
-            alert_message += f"\n{message}"
-            
+            alert_message = format_alert_message(alert_symbols, message)
             telegram.send_message(alert_message)
-            logger.info(f"RSI 알림 전송 완료: {len(alert_symbols)}개 심볼에서 임계값 도달")
+            logger.info(f"RSI 알림 전송 완료: {len(alert_symbols)}개 심볼 상태 변경")
+            # 전송에 성공한 뒤에만 알린 상태로 기록 (실패 시 다음 실행에서 다시 알림)
+            if self.alert_store is not None:
+                self.alert_store.acknowledge(alert_symbols, scope='report')
         else:
             # 일반 상황 보고
             telegram.send_message(message)
-            logger.info("미국 시장 현황 보고 전송 완료: 모든 심볼 정상 범위")
+            logger.info("미국 시장 현황 보고 전송 완료: 상태 변경 심볼 없음")
         
         # 개별 심볼 상세 로그
         for result in rsi_results:
             logger.info(f"{result['symbol']}: RSI={result['rsi_value']}, 가격=${result['current_price']}, 상태={result['status']}")
-        
-        logger.info("미국 시장 현황 분석 프로그램 정상 종료")
+
+        # 이력 테이블 저장
+        save_market_history(rsi_results, vix_info, fgi_info, logger)
+        return True
+
+def send_error_report(error_msg, logger):
+    """오류 메시지를 텔레그램으로 전송 (전송 실패는 로그만 기록)"""
+    try:
+        telegram = TelegramUtil()
+        telegram.send_message(f"❌ 미국 시장 현황 분석 오류\n\n{error_msg}")
+    except:
+        logger.error("텔레그램 오류 메시지 전송 실패")
+
+def main():
+    """메인 실행 함수"""
+    logger = LoggerUtil().get_logger()
+    
+    try:
+        logger.info("미국 시장 현황 분석 프로그램 시작")
+
+        reporter = MarketReporter(logger)
+        if reporter.run_report():
+            logger.info("미국 시장 현황 분석 프로그램 정상 종료")
         
     except Exception as e:
         error_msg = f"프로그램 실행 중 오류 발생: {str(e)}"
         logger.error(error_msg)
-        
-        try:
-            telegram = TelegramUtil()
-            telegram.send_message(f"❌ 미국 시장 현황 분석 오류\n\n{error_msg}")
-        except:
-            logger.error("텔레그램 오류 메시지 전송 실패")
-        
+        send_error_report(error_msg, logger)
         sys.exit(1)
 
+def daemon_mode():
+    """상주 실행 모드 (--daemon)
+
+    NYSE 거래일마다 장 마감 후 DAEMON_REPORT_DELAY_MINUTES(기본값: 15)분에 보고서를 전송합니다.
+    휴장일은 건너뛰고 조기 폐장일(13:00)은 마감 시각을 앞당깁니다.
+    구성요소는 프로세스 시작 시 한 번만 만들고 매 실행마다 재사용합니다.
+    """
+    import signal
+    from datetime import datetime
+    from utils.market_calendar import NYSE_TZ, next_report_time
+
+    logger = LoggerUtil().get_logger()
+    delay_minutes = int(os.getenv('DAEMON_REPORT_DELAY_MINUTES', 15))
+    stop_event = threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info(f"종료 신호 수신 (signal: {signum}) → 데몬 종료")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    try:
+        logger.info("미국 시장 현황 분석 데몬 시작")
+        reporter = MarketReporter(logger)
+    except Exception as e:
+        error_msg = f"데몬 초기화 중 오류 발생: {str(e)}"
+        logger.error(error_msg)
+        send_error_report(error_msg, logger)
+        sys.exit(1)
+
+    run_now = os.getenv('DAEMON_RUN_ON_START', 'false').strip().lower() in ('1', 'true', 'yes')
+    while not stop_event.is_set():
+        if not run_now:
+            run_at = next_report_time(delay_minutes=delay_minutes)
+            logger.info(f"다음 보고 예정: {run_at:%Y-%m-%d %H:%M %Z}")
+
+            # 절전/시계 변경에 대비해 최대 5분 단위로 나눠 대기
+            while not stop_event.is_set():
+                remaining = (run_at - datetime.now(NYSE_TZ)).total_seconds()
+                if remaining <= 0:
+                    break
+                stop_event.wait(min(remaining, 300))
+            if stop_event.is_set():
+                break
+        run_now = False
+
+        started_at = time.monotonic()
+        try:
+            reporter.run_report()
+            logger.info(f"보고서 실행 완료 ({time.monotonic() - started_at:.2f}초)")
+        except Exception as e:
+            error_msg = f"프로그램 실행 중 오류 발생: {str(e)}"
+            logger.error(error_msg)
+            send_error_report(error_msg, logger)
+
+    logger.info("미국 시장 현황 분석 데몬 종료")
+
 def test_mode():
     """테스트 모드 실행"""
     logger = LoggerUtil().get_logger()
@@ -179,28 +464,30 @@ def test_mode():
     try:
         logger.info("RSI 트래커 테스트 모드 시작")
         
+        # 텔레그램 테스트 (계산 모듈 import 전에 먼저 전송)
+        telegram = TelegramUtil()
+
+        # 테스트 메시지 전송
+        test_message = "🧪 <b>미국 시장 현황 분석 - 테스트</b>\n\n테스트 메시지가 정상적으로 전송되었습니다."
+        telegram.send_test_message(test_message)
+        logger.info("테스트 메시지 전송 완료")
+
+        from rsi_calculator import RSICalculator
+        from vix_analysis import VIXAnalyzer
+        from fear_greed_fetch import FearGreedFetcher
+
         # RSI 계산기 테스트
         rsi_calc = RSICalculator()
-        
-        # 텔레그램 테스트
-        telegram = TelegramUtil()
 
         # VIX 분석기 테스트
         vix = VIXAnalyzer()
         
         # Fear & Greed Fetcher 테스트
         fgi_fetcher = FearGreedFetcher()
-
-        # 테스트 메시지 전송
-        test_message = "🧪 <b>미국 시장 현황 분석 - 테스트</b>\n\n테스트 메시지가 정상적으로 전송되었습니다."
-        telegram.send_test_message(test_message)
-        logger.info("테스트 메시지 전송 완료")
         
         # RSI 계산 테스트
         symbols = ['SPY']  # 테스트용 1개 심볼만
-        results = rsi_calc.get_rsi_for_symbols(symbols)
-        vix_info = vix.get_latest_vix()
-        fgi_info = fgi_fetcher.get_latest_fgi()
+        results, vix_info, fgi_info = collect_market_data(rsi_calc, vix, fgi_fetcher, symbols, logger)
         
         if results:
             message = format_market_message(results, vix_info, fgi_info)
@@ -213,9 +500,83 @@ def test_mode():
         logger.error(f"테스트 모드 실행 중 오류: {str(e)}")
         sys.exit(1)
 
+def scan_mode(universe_path):
+    """유니버스 스캔 모드 실행 (--scan <유니버스 파일>)"""
+    logger = LoggerUtil().get_logger()
+
+    try:
+        from scanner import UniverseScanner, load_universe
+
+        symbols = load_universe(universe_path)
+        logger.info(f"유니버스 스캔 모드 시작: {universe_path} ({len(symbols)}개 심볼)")
+
+        def on_result(result):
+            if result['status'] in ['과매도', '과매수']:
+                logger.info(f"[스캔] {result['symbol']}: RSI={result['rsi_value']} ({result['status']})")
+
+        scanner = UniverseScanner()
+        metrics = MetricsUtil()
+        metrics.reset()
+        started_at = time.monotonic()
+        with metrics.timer('scan'):
+            results = scanner.scan(symbols, on_result=on_result)
+        elapsed = time.monotonic() - started_at
+        metrics.increment('scanned_symbols_total', len(results))
+
+        ranked = scanner.rank(results, top_n=int(os.getenv('SCAN_TOP_N', 20)))
+
+        # 알림 상태 저장소가 있으면 직전 스캔 대비 상태 변경 심볼만 전송 (없으면 순위 요약만)
+        from alert_state import create_alert_state_store
+
+        alert_store = create_alert_state_store()
+        transitions = None
+        if alert_store is not None:
+            transitions = [t for t in alert_store.evaluate(results, scope='scan') if t['notify']]
+            logger.info(f"스캔 상태 변경: {len(transitions)}개 심볼")
+
+        message = format_scan_message(ranked, len(symbols), len(results), elapsed, transitions)
+
+        telegram = TelegramUtil()
+        telegram.send_message(message)
+        if transitions:
+            alert_store.acknowledge(transitions, scope='scan')
+        export_metrics(logger)
+        logger.info(f"유니버스 스캔 결과 전송 완료: 과매도 {ranked['oversold_count']}개, 과매수 {ranked['overbought_count']}개")
+
+    except Exception as e:
+        logger.error(f"유니버스 스캔 중 오류: {str(e)}")
+        sys.exit(1)
+
+def profile_startup_mode():
+    """콜드 스타트 import 시간 측정 (--profile-startup)
+
+    새 인터프리터에서 `python -X importtime`으로 main 모듈 로딩과
+    보고서 실행 경로(계산 모듈 포함) 전체의 모듈별 import 시간을 출력합니다.
+    """
+    from utils.import_profiler import format_import_report, profile_imports, summarize_imports
+
+    top_n = int(os.getenv('PROFILE_STARTUP_TOP_N', 20))
+    stages = (
+        ("main 모듈 로딩", ['main']),
+        ("보고서 실행 경로", ['main', 'price_provider', 'price_cache', 'rsi_calculator', 'vix_analysis', 'fear_greed_fetch']),
+    )
+    for title, modules in stages:
+        summary = summarize_imports(profile_imports(modules), top_n=top_n)
+        print(format_import_report(title, summary))
+        print()
+
 if __name__ == "__main__":
     # 명령행 인수 확인
     if len(sys.argv) > 1 and sys.argv[1] == "--test":
         test_mode()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--profile-startup":
+        profile_startup_mode()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--daemon":
+        daemon_mode()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--scan":
+        if len(sys.argv) < 3:
+            print("사용법: python main.py --scan <유니버스 파일>", file=sys.stderr)
+            sys.exit(2)
+        scan_mode(sys.argv[2])
     else:
         main()
\ No newline at end of file
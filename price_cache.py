@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""로컬 OHLCV 캐시 (SQLite)
+
+일봉 데이터를 (심볼, 날짜) 단위로 디스크에 저장하고, 실행할 때마다
+마지막으로 캐시된 봉 이후 구간만 원본 Provider에서 가져와 병합합니다.
+조회는 항상 캐시에서 이루어집니다.
+
+- 마지막 캐시 봉은 장중 값일 수 있으므로 꼬리 구간 조회 시 다시 받아 덮어씁니다.
+- 꼬리 구간은 마지막 직전(확정된) 봉부터 받아 저장된 종가와 비교하고, 분할/배당으로 수정주가 기준이
+  바뀌었으면 해당 심볼의 캐시를 지우고 전체 구간을 다시 받습니다.
+- 원본 조회 중에는 잠금을 잡지 않으므로 여러 호출자가 동시에 원본(fetch_layer)까지 도달할 수 있습니다.
+- 최근 `refresh_seconds` 이내에 갱신한 심볼은 원본 조회를 생략합니다.
+- 일봉이 아닌 간격(예: '1h')은 캐시하지 않고 원본 Provider로 그대로 전달합니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from price_provider import PriceDataProvider, PRICE_COLUMNS
+from utils.logger_util import LoggerUtil
+
+CREATE_PRICE_BARS_TABLE = """
+CREATE TABLE IF NOT EXISTS price_bars (
+    symbol TEXT NOT NULL,
+    bar_date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume REAL,
+    PRIMARY KEY (symbol, bar_date)
+) WITHOUT ROWID
+"""
+
+CREATE_PRICE_COVERAGE_TABLE = """
+CREATE TABLE IF NOT EXISTS price_coverage (
+    symbol TEXT PRIMARY KEY,
+    first_date TEXT NOT NULL,
+    last_date TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+)
+"""
+
+
+# 겹치는 봉의 저장 종가와 새 종가의 허용 상대 오차 (초과하면 수정주가 기준 변경으로 판단)
+ADJUSTMENT_TOLERANCE = 1e-4
+
+
+def _start_key(start):
+    """시작 일시 → 포함되는 첫 날짜 문자열"""
+    return pd.Timestamp(start).tz_localize(None).strftime('%Y-%m-%d')
+
+
+def _end_key(end):
+    """종료 일시(미포함) → 포함되는 마지막 날짜 문자열"""
+    end = pd.Timestamp(end).tz_localize(None)
+    return (end - timedelta(microseconds=1)).strftime('%Y-%m-%d')
+
+
+class CachedPriceProvider(PriceDataProvider):
+    """원본 Provider 앞단의 증분 OHLCV 캐시"""
+
+    name = "cache"
+
+    def __init__(self, provider, db_path, refresh_seconds=900):
+        self.logger = LoggerUtil().get_logger()
+        self.provider = provider
+        self.name = f"cache+{provider.name}"
+        self.db_path = Path(db_path)
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(CREATE_PRICE_BARS_TABLE)
+            conn.execute(CREATE_PRICE_COVERAGE_TABLE)
+
+    @contextmanager
+    def _connect(self):
+        """커밋 후 닫히는 SQLite 연결"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _load_coverage(self, conn, symbols):
+        placeholders = ','.join('?' * len(symbols))
+        rows = conn.execute(
+            f"SELECT symbol, first_date, last_date, fetched_at FROM price_coverage WHERE symbol IN ({placeholders})",
+            symbols,
+        ).fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    def _load_anchors(self, conn, symbols):
+        """꼬리 조회 비교 기준 봉 → { symbol: (bar_date, close) }
+
+        마지막 캐시 봉은 장중 값일 수 있으므로 그 직전 봉(없으면 마지막 봉)을 사용합니다.
+        """
+        if not symbols:
+            return {}
+        placeholders = ','.join('?' * len(symbols))
+        rows = conn.execute(
+            f"""
+            SELECT c.symbol, b.bar_date, b.close
+            FROM price_coverage c
+            JOIN price_bars b ON b.symbol = c.symbol AND b.bar_date = COALESCE(
+                (SELECT MAX(p.bar_date) FROM price_bars p WHERE p.symbol = c.symbol AND p.bar_date < c.last_date),
+                c.last_date
+            )
+            WHERE c.symbol IN ({placeholders})
+            """,
+            symbols,
+        ).fetchall()
+        return {symbol: (bar_date, close) for symbol, bar_date, close in rows}
+
+    def _plan_fetches(self, symbols, coverage, anchors, start_key, end_key, end):
+        """심볼별로 원본에서 가져올 구간 계산 → { (fetch_start, fetch_end): [symbols] }"""
+        plans = {}
+        now = time.time()
+
+        for symbol in symbols:
+            ranges = []
+            if symbol not in coverage:
+                ranges.append((start_key, end))
+            else:
+                first_date, last_date, fetched_at = coverage[symbol]
+                if start_key < first_date:
+                    ranges.append((start_key, first_date))
+                if last_date <= end_key and now - fetched_at >= self.refresh_seconds:
+                    ranges.append((anchors.get(symbol, (last_date,))[0], end))
+
+            for fetch_range in ranges:
+                plans.setdefault(fetch_range, []).append(symbol)
+
+        return plans
+
+    def _store(self, conn, frames):
+        rows = []
+        for symbol, frame in frames.items():
+            frame = frame.reindex(columns=PRICE_COLUMNS)
+            for bar_date, values in zip(frame.index.strftime('%Y-%m-%d'), frame.itertuples(index=False, name=None)):
+                rows.append((symbol, bar_date, *values))
+
+        conn.executemany(
+            """
+            INSERT INTO price_bars (symbol, bar_date, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(symbol, bar_date) DO UPDATE SET
+                open = excluded.open,
+                high = excluded.high,
+                low = excluded.low,
+                close = excluded.close,
+                volume = excluded.volume
+            """,
+            rows,
+        )
+        return len(rows)
+
+    def _update_coverage(self, conn, symbols, coverage, start_key):
+        now = time.time()
+        placeholders = ','.join('?' * len(symbols))
+        last_dates = dict(conn.execute(
+            f"SELECT symbol, MAX(bar_date) FROM price_bars WHERE symbol IN ({placeholders}) GROUP BY symbol",
+            symbols,
+        ).fetchall())
+
+        rows = []
+        for symbol in symbols:
+            first_date = min(start_key, coverage[symbol][0]) if symbol in coverage else start_key
+            last_date = last_dates.get(symbol)
+            if last_date is None:
+                continue
+            rows.append((symbol, first_date, last_date, now))
+
+        conn.executemany(
+            """
+            INSERT INTO price_coverage (symbol, first_date, last_date, fetched_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(symbol) DO UPDATE SET
+                first_date = excluded.first_date,
+                last_date = excluded.last_date,
+                fetched_at = excluded.fetched_at
+            """,
+            rows,
+        )
+
+    def _read(self, conn, symbols, start_key, end_key):
+        placeholders = ','.join('?' * len(symbols))
+        frame = pd.read_sql_query(
+            f"""
+            SELECT symbol, bar_date, open, high, low, close, volume
+            FROM price_bars
+            WHERE symbol IN ({placeholders}) AND bar_date >= ? AND bar_date <= ?
+            ORDER BY symbol, bar_date
+            """,
+            conn,
+            params=[*symbols, start_key, end_key],
+        )
+
+        results = {}
+        if frame.empty:
+            return results
+
+        frame['bar_date'] = pd.to_datetime(frame['bar_date'])
+        frame.columns = ['symbol', 'Date'] + PRICE_COLUMNS
+        for symbol, group in frame.groupby('symbol', sort=False):
+            results[symbol] = group.drop(columns='symbol').set_index('Date')
+        return results
+
+    def get_histories(self, symbols, start, end, interval='1d'):
+        if interval != '1d':
+            return self.provider.get_histories(symbols, start, end, interval)
+
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+
+        start_key = _start_key(start)
+        end_key = _end_key(end)
+
+        with self._lock, self._connect() as conn:
+            coverage = self._load_coverage(conn, symbols)
+            anchors = self._load_anchors(conn, [symbol for symbol in symbols if symbol in coverage])
+        plans = self._plan_fetches(symbols, coverage, anchors, start_key, end_key, end)
+
+        # 원본 조회는 잠금 밖에서 수행
+        fetched = []
+        for (fetch_start, fetch_end), group in plans.items():
+            self.logger.info(f"캐시 미보유 구간 조회: {len(group)}개 심볼 ({fetch_start} ~ {_end_key(fetch_end)})")
+            fetched.append((group, self.provider.get_histories(group, fetch_start, fetch_end, interval)))
+
+        rebased = self._find_rebased(fetched, anchors)
+        refetched = {}
+        if rebased:
+            self.logger.warning(f"수정주가 기준 변경 감지 → 전체 구간 재조회: {', '.join(rebased)}")
+            refetch_groups = {}
+            for symbol in rebased:
+                refetch_groups.setdefault(min(start_key, coverage[symbol][0]), []).append(symbol)
+            for refetch_start, group in refetch_groups.items():
+                refetched.update(self.provider.get_histories(group, refetch_start, end, interval))
+
+        with self._lock, self._connect() as conn:
+            if rebased:
+                placeholders = ','.join('?' * len(rebased))
+                conn.execute(f"DELETE FROM price_bars WHERE symbol IN ({placeholders})", rebased)
+                # 재조회에 실패한 심볼은 보유 구간도 지워 다음 실행에서 처음부터 받도록 함
+                missing = [symbol for symbol in rebased if symbol not in refetched]
+                if missing:
+                    conn.execute(
+                        f"DELETE FROM price_coverage WHERE symbol IN ({','.join('?' * len(missing))})", missing,
+                    )
+
+            fetched_symbols = set()
+            for group, frames in fetched + [(rebased, refetched)]:
+                if frames is not refetched:
+                    # 재조회한 심볼은 기준이 다른 기존 조회 결과를 저장하지 않음
+                    frames = {symbol: frame for symbol, frame in frames.items() if symbol not in rebased}
+                stored = self._store(conn, frames)
+                fetched_symbols.update(group)
+                if stored:
+                    self.logger.info(f"캐시 갱신 완료: {stored}개 봉 저장")
+
+            if fetched_symbols:
+                self._update_coverage(conn, sorted(fetched_symbols), coverage, start_key)
+
+            return self._read(conn, symbols, start_key, end_key)
+
+    @staticmethod
+    def _find_rebased(fetched, anchors):
+        """꼬리 조회 결과의 기준 봉 종가가 저장 값과 다른 심볼 (분할/배당 수정)"""
+        rebased = []
+        for _, frames in fetched:
+            for symbol, frame in frames.items():
+                anchor = anchors.get(symbol)
+                if anchor is None or symbol in rebased:
+                    continue
+                bar_date, stored_close = anchor
+                matched = frame.loc[frame.index.strftime('%Y-%m-%d') == bar_date, 'Close']
+                if matched.empty or stored_close is None or pd.isna(matched.iloc[0]):
+                    continue
+                if abs(float(matched.iloc[0]) - stored_close) > ADJUSTMENT_TOLERANCE * abs(stored_close):
+                    rebased.append(symbol)
+        return rebased
+
+def create_price_cache(provider):
+    """환경변수 설정에 따라 Provider를 캐시로 감싸 반환
+
+    - PRICE_CACHE_ENABLED: 'true'(기본값) / 'false'
+    - PRICE_CACHE_PATH: SQLite 파일 경로 (기본값: cache/prices.sqlite3)
+    - PRICE_CACHE_REFRESH_SECONDS: 재조회 최소 간격(초, 기본값: 900)
+    """
+    if os.getenv('PRICE_CACHE_ENABLED', 'true').strip().lower() not in ('1', 'true', 'yes'):
+        return provider
+
+    default_path = Path(os.path.dirname(os.path.abspath(__file__))) / 'cache' / 'prices.sqlite3'
+    return CachedPriceProvider(
+        provider,
+        os.getenv('PRICE_CACHE_PATH', str(default_path)),
+        refresh_seconds=int(os.getenv('PRICE_CACHE_REFRESH_SECONDS', 900)),
+    )
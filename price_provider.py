@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""가격 데이터 제공자(Provider)
+
+RSI/VIX 계산기가 데이터 출처에 의존하지 않도록 공통 인터페이스를 제공합니다.
+
+- YFinanceProvider: 야후파이낸스 (여러 심볼을 한 번의 요청으로 일괄 조회)
+- CSVFileProvider: 로컬 CSV 파일 (네트워크 없이 대량 처리/테스트용)
+
+모든 Provider는 { 심볼: DataFrame(Open, High, Low, Close, Volume) } 형태로 반환하며,
+데이터가 없는 심볼은 결과에서 제외됩니다. 조회 실패 시에는 예외를 그대로 전달합니다.
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def normalize_price_frame(frame):
+    """Provider 간 동일한 형태가 되도록 가격 DataFrame 정규화
+
+    - 인덱스: 타임존 없는 DatetimeIndex (오름차순, 중복 제거)
+    - 컬럼: 값이 모두 비어 있는 행 제거
+    """
+    if frame is None or frame.empty:
+        return None
+
+    frame = frame.copy()
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame.index = index
+    frame.index.name = 'Date'
+
+    frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+    frame = frame.dropna(how='all')
+    return frame if not frame.empty else None
+
+
+class PriceDataProvider:
+    """가격 데이터 제공자 기본 인터페이스"""
+
+    name = "base"
+
+    def get_histories(self, symbols, start, end, interval='1d'):
+        """여러 심볼의 가격 이력 일괄 조회
+
+        Args:
+            symbols: 심볼 리스트
+            start: 시작 일시 (포함)
+            end: 종료 일시 (미포함)
+            interval: 봉 간격 (예: '1d', '1h')
+
+        Returns:
+            dict: { symbol: DataFrame }
+        """
+        raise NotImplementedError
+
+    def get_history(self, symbol, start, end, interval='1d'):
+        """단일 심볼 가격 이력 조회
+
+        Returns:
+            pandas.DataFrame | None
+        """
+        return self.get_histories([symbol], start, end, interval).get(symbol)
+
+
+class YFinanceProvider(PriceDataProvider):
+    """야후파이낸스 데이터 제공자"""
+
+    name = "yfinance"
+
+    def get_history(self, symbol, start, end, interval='1d'):
+        import yfinance as yf
+
+        data = yf.Ticker(symbol).history(start=start, end=end, interval=interval)
+        return normalize_price_frame(data)
+
+    def get_histories(self, symbols, start, end, interval='1d'):
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        if len(symbols) == 1:
+            data = self.get_history(symbols[0], start, end, interval)
+            return {symbols[0]: data} if data is not None else {}
+
+        import yfinance as yf
+
+        # Ticker.history와 동일하게 수정주가(auto_adjust) 기준으로 조회
+        data = yf.download(
+            symbols,
+            start=start,
+            end=end,
+            interval=interval,
+            group_by='ticker',
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+        )
+        if data is None or data.empty:
+            return {}
+
+        results = {}
+        for symbol in symbols:
+            frame = self._extract_symbol(data, symbol)
+            frame = normalize_price_frame(frame)
+            if frame is not None:
+                results[symbol] = frame
+        return results
+
+    @staticmethod
+    def _extract_symbol(data, symbol):
+        """yf.download 결과(MultiIndex 컬럼)에서 심볼별 DataFrame 추출"""
+        if not isinstance(data.columns, pd.MultiIndex):
+            return data
+        if symbol in data.columns.get_level_values(0):
+            return data[symbol]
+        if symbol in data.columns.get_level_values(1):
+            return data.xs(symbol, axis=1, level=1)
+        return None
+
+
+class CSVFileProvider(PriceDataProvider):
+    """로컬 CSV 파일 데이터 제공자
+
+    `<directory>/<SYMBOL>.csv` 파일(첫 컬럼 Date, 이후 OHLCV)을 읽습니다.
+    """
+
+    name = "csv"
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def _path(self, symbol):
+        return self.directory / f"{symbol}.csv"
+
+    def get_histories(self, symbols, start, end, interval='1d'):
+        start = pd.Timestamp(start).tz_localize(None) if start is not None else None
+        end = pd.Timestamp(end).tz_localize(None) if end is not None else None
+
+        results = {}
+        for symbol in dict.fromkeys(symbols):
+            path = self._path(symbol)
+            if not path.exists():
+                continue
+
+            frame = normalize_price_frame(pd.read_csv(path, index_col=0, parse_dates=True))
+            if frame is None:
+                continue
+            if start is not None:
+                frame = frame[frame.index >= start]
+            if end is not None:
+                frame = frame[frame.index < end]
+            if not frame.empty:
+                results[symbol] = frame
+        return results
+
+    def save_history(self, symbol, frame):
+        """가격 DataFrame을 CSV로 저장 (오프라인 데이터 준비용)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        frame = normalize_price_frame(frame)
+        if frame is not None:
+            frame.to_csv(self._path(symbol))
+
+
+def create_price_provider():
+    """환경변수 설정에 따른 Provider 생성
+
+    - PRICE_DATA_PROVIDER: 'yfinance'(기본값), 'csv' 또는 'memmap'
+    - PRICE_DATA_DIR: csv Provider의 데이터 디렉토리 (기본값: data/prices)
+    - PRICE_STORE_DIR: memmap Provider의 컬럼형 저장소 디렉토리 (기본값: cache/columnar)
+
+    yfinance Provider는 보호 계층(fetch_layer: 요청 병합/재시도/속도 제한)과
+    로컬 OHLCV 캐시(price_cache)로 감싸서 반환합니다.
+    """
+    provider_name = os.getenv('PRICE_DATA_PROVIDER', 'yfinance').strip().lower()
+
+    if provider_name == 'csv':
+        default_dir = Path(os.path.dirname(os.path.abspath(__file__))) / 'data' / 'prices'
+        return CSVFileProvider(os.getenv('PRICE_DATA_DIR', str(default_dir)))
+    if provider_name == 'memmap':
+        from price_store import MemmapPriceProvider, default_store_dir
+
+        return MemmapPriceProvider(default_store_dir())
+    if provider_name == 'yfinance':
+        from fetch_layer import create_fetch_layer
+        from price_cache import create_price_cache
+
+        return create_price_cache(create_fetch_layer(YFinanceProvider()))
+
+    raise ValueError(f"지원하지 않는 PRICE_DATA_PROVIDER 입니다: {provider_name}")
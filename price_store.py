@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""메모리 맵 기반 컬럼형 가격 저장소
+
+수년치 일봉을 필드(Open/High/Low/Close/Volume)별 `np.memmap` 파일 하나씩에 (심볼 × 날짜) 행렬로 저장합니다.
+심볼/날짜 색인은 `index.json`과 `dates.npy`에 둡니다.
+
+- 읽기는 페이지 캐시를 통한 지연 로딩이라 여러 워커 프로세스가 같은 파일을 열어도 메모리를 한 벌만 사용합니다.
+- `slice()`는 연속 구간이면 복사 없는 뷰를 반환하므로 RSI 엔진/백테스트에 그대로 넘길 수 있습니다.
+- 없는 값은 NaN (상장 전/휴장 등)
+
+디렉토리 구조:
+    <directory>/index.json   { symbols, fields, dtype, n_dates }
+    <directory>/dates.npy    datetime64[D] 날짜 배열 (오름차순)
+    <directory>/<field>.bin  float64 (심볼 수 × 날짜 수) 행렬
+
+사용법:
+    python price_store.py build --universe universe.txt --years 30 --dir cache/columnar
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from price_provider import PRICE_COLUMNS, PriceDataProvider
+
+STORE_DTYPE = np.float64
+
+
+class ColumnarPriceStore:
+    """읽기 전용 memmap 가격 저장소"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        index = json.loads((self.directory / 'index.json').read_text(encoding='utf-8'))
+
+        self.symbols = index['symbols']
+        self.fields = index['fields']
+        self._positions = {symbol: position for position, symbol in enumerate(self.symbols)}
+        self._dates = np.load(self.directory / 'dates.npy', mmap_mode='r')
+        self._arrays = {}
+
+    @property
+    def dates(self):
+        """전체 날짜 (DatetimeIndex)"""
+        return pd.DatetimeIndex(np.asarray(self._dates), name='Date')
+
+    @property
+    def shape(self):
+        return len(self.symbols), len(self._dates)
+
+    def field(self, name='Close'):
+        """필드 전체 (심볼 × 날짜) memmap 행렬 (최초 접근 시 열기)"""
+        array = self._arrays.get(name)
+        if array is None:
+            if name not in self.fields:
+                raise KeyError(f"저장소에 없는 필드입니다: {name}")
+            array = np.memmap(self.directory / f"{name}.bin", dtype=STORE_DTYPE, mode='r', shape=self.shape)
+            self._arrays[name] = array
+        return array
+
+    def date_range(self, start=None, end=None):
+        """[start, end) 날짜 구간의 열 범위 (slice)"""
+        dates = self._dates
+        first = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start).date(), 'D'), side='left'))
+        last = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end).date(), 'D'), side='left'))
+        return slice(first, last)
+
+    def symbol_rows(self, symbols=None):
+        """심볼 목록의 행 위치 (연속 구간이면 slice, 아니면 정수 배열)
+
+        저장소에 없는 심볼은 제외합니다.
+        """
+        if symbols is None:
+            return slice(0, len(self.symbols))
+        positions = [self._positions[symbol] for symbol in symbols if symbol in self._positions]
+        if positions and positions == list(range(positions[0], positions[0] + len(positions))):
+            return slice(positions[0], positions[0] + len(positions))
+        return np.asarray(positions, dtype=np.intp)
+
+    def slice(self, field='Close', symbols=None, start=None, end=None):
+        """(심볼 × 날짜) 행렬 구간 조회
+
+        symbols가 None이거나 저장 순서상 연속이면 복사 없는 memmap 뷰를,
+        흩어진 심볼 목록이면 해당 행만 모은 복사본을 반환합니다.
+
+        Returns:
+            numpy.ndarray: (len(symbols) × 날짜 수) 행렬
+        """
+        return self.field(field)[self.symbol_rows(symbols), self.date_range(start, end)]
+
+    def present_symbols(self, symbols=None):
+        """slice()의 행 순서와 같은 심볼 목록"""
+        if symbols is None:
+            return list(self.symbols)
+        return [symbol for symbol in symbols if symbol in self._positions]
+
+    def get_history(self, symbol, start=None, end=None):
+        """단일 심볼 OHLCV DataFrame (값이 없는 날짜 제외)"""
+        if symbol not in self._positions:
+            return None
+        row = self._positions[symbol]
+        columns = self.date_range(start, end)
+        frame = pd.DataFrame(
+            {name: self.field(name)[row, columns] for name in self.fields},
+            index=self.dates[columns],
+        )
+        frame = frame.dropna(how='all')
+        return frame if not frame.empty else None
+
+    @classmethod
+    def build(cls, directory, price_data, fields=PRICE_COLUMNS):
+        """{ symbol: DataFrame } 으로 저장소 생성 (기존 저장소는 원자적으로 교체)
+
+        Args:
+            directory: 저장 디렉토리
+            price_data: { symbol: OHLCV DataFrame } (인덱스는 날짜)
+            fields: 저장할 필드 목록
+
+        Returns:
+            ColumnarPriceStore: 새로 연 저장소
+        """
+        directory = Path(directory)
+        symbols = sorted(price_data)
+        dates = pd.DatetimeIndex(sorted(set().union(*(frame.index.normalize() for frame in price_data.values()))))
+        shape = (len(symbols), len(dates))
+
+        temp_dir = directory.with_name(directory.name + '.tmp')
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        temp_dir.mkdir(parents=True)
+
+        fields = [name for name in fields if any(name in frame.columns for frame in price_data.values())]
+        for name in fields:
+            array = np.memmap(temp_dir / f"{name}.bin", dtype=STORE_DTYPE, mode='w+', shape=shape)
+            array[:] = np.nan
+            for row, symbol in enumerate(symbols):
+                frame = price_data[symbol]
+                if name not in frame.columns:
+                    continue
+                series = frame[name].groupby(frame.index.normalize()).last()
+                array[row, dates.get_indexer(series.index)] = series.to_numpy(dtype=STORE_DTYPE)
+            array.flush()
+            del array
+
+        np.save(temp_dir / 'dates.npy', dates.to_numpy().astype('datetime64[D]'))
+        (temp_dir / 'index.json').write_text(json.dumps({
+            'symbols': symbols,
+            'fields': fields,
+            'dtype': np.dtype(STORE_DTYPE).name,
+            'n_dates': len(dates),
+        }, ensure_ascii=False), encoding='utf-8')
+
+        if directory.exists():
+            old_dir = directory.with_name(directory.name + '.old')
+            shutil.rmtree(old_dir, ignore_errors=True)
+            directory.rename(old_dir)
+            temp_dir.rename(directory)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        else:
+            temp_dir.rename(directory)
+        return cls(directory)
+
+
+class MemmapPriceProvider(PriceDataProvider):
+    """ColumnarPriceStore를 Provider 인터페이스로 노출 (일봉 전용)
+
+    저장소는 최초 조회 시 열고, 파일이 다시 생성되면(build) 다음 조회부터 새 저장소를 사용합니다.
+    """
+
+    name = "memmap"
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._store = None
+        self._stamp = None
+
+    @property
+    def store(self):
+        stamp = (self.directory / 'index.json').stat().st_mtime_ns
+        if self._store is None or stamp != self._stamp:
+            self._store = ColumnarPriceStore(self.directory)
+            self._stamp = stamp
+        return self._store
+
+    def get_histories(self, symbols, start, end, interval='1d'):
+        if interval != '1d':
+            raise ValueError(f"memmap Provider는 일봉('1d')만 지원합니다: {interval}")
+
+        store = self.store
+        results = {}
+        for symbol in dict.fromkeys(symbols):
+            frame = store.get_history(symbol, start, end)
+            if frame is not None:
+                results[symbol] = frame
+        return results
+
+
+def default_store_dir():
+    """PRICE_STORE_DIR 또는 cache/columnar"""
+    default_dir = Path(os.path.dirname(os.path.abspath(__file__))) / 'cache' / 'columnar'
+    return os.getenv('PRICE_STORE_DIR') or str(default_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="memmap 컬럼형 가격 저장소")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Provider(가격 캐시 포함)에서 저장소 생성")
+    group = build_parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--symbols', nargs='+', help="저장할 심볼")
+    group.add_argument('--universe', help="유니버스 파일 (한 줄에 심볼 하나)")
+    build_parser.add_argument('--years', type=float, default=30, help="저장 기간(년)")
+    build_parser.add_argument('--dir', default=None, help="저장 디렉토리 (기본값: PRICE_STORE_DIR 또는 cache/columnar)")
+
+    info_parser = subparsers.add_parser('info', help="저장소 요약 출력")
+    info_parser.add_argument('--dir', default=None, help="저장 디렉토리")
+    args = parser.parse_args(argv)
+
+    directory = args.dir or default_store_dir()
+    if args.command == 'info':
+        store = ColumnarPriceStore(directory)
+        dates = store.dates
+        print(f"{directory}: {len(store.symbols)}개 심볼 × {len(dates)}개 날짜 ({dates[0]:%Y-%m-%d} ~ {dates[-1]:%Y-%m-%d}), 필드: {store.fields}")
+        return 0
+
+    if args.universe:
+        from scanner import load_universe
+
+        symbols = load_universe(args.universe)
+    else:
+        symbols = [symbol.upper() for symbol in args.symbols]
+
+    from price_provider import create_price_provider
+
+    provider = create_price_provider()
+    if isinstance(provider, MemmapPriceProvider):
+        print("저장소 생성에는 원본 Provider가 필요합니다 (PRICE_DATA_PROVIDER=yfinance 또는 csv).", file=sys.stderr)
+        return 1
+    end = datetime.now()
+    price_data = provider.get_histories(symbols, end - timedelta(days=int(args.years * 365.25) + 1), end)
+    if not price_data:
+        print("가격 데이터를 가져올 수 없습니다.", file=sys.stderr)
+        return 1
+
+    store = ColumnarPriceStore.build(directory, price_data)
+    print(f"저장소 생성 완료: {directory} ({len(store.symbols)}개 심볼 × {len(store.dates)}개 날짜)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
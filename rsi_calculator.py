@@ -1,20 +1,40 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from dotenv import load_dotenv
 from utils.logger_util import LoggerUtil
-import ta
+from utils.metrics_util import MetricsUtil
+from utils.market_calendar import next_trading_day
+from rsi_engine import RSI_VARIANTS, wilder_rsi, gains_losses, wilder_averages, wilder_step, rsi_from_averages, rsi_variants
+from price_provider import create_price_provider
 
 load_dotenv()
 
+# 다중 시간 프레임: { 코드: (리샘플 규칙, 표시명, 봉 1개당 달력 일수) }
+TIMEFRAMES = {
+    '1h': ('h', '시간', 7 / 5 / 6.5),
+    '1d': ('D', '일', 7 / 5),
+    '1W': ('W-FRI', '주', 7),
+    '1M': ('MS', '월', 31),
+}
+INTRADAY_TIMEFRAMES = {'1h'}
+# 야후파이낸스 시간봉 조회 가능 기간(일)
+INTRADAY_MAX_DAYS = 729
+
 class RSICalculator:
-    def __init__(self):
+    def __init__(self, provider=None):
         self.logger = LoggerUtil().get_logger()
+        self.metrics = MetricsUtil()
+        self.provider = provider or create_price_provider()
         self.rsi_period = int(os.getenv('RSI_PERIOD', 14))
         self.oversold_threshold = float(os.getenv('RSI_OVERSOLD_THRESHOLD', 30))
         self.overbought_threshold = float(os.getenv('RSI_OVERBOUGHT_THRESHOLD', 70))
+        self.state_history_days = int(os.getenv('RSI_STATE_HISTORY_DAYS', 365))
+        # 보고서 RSI 조회 일수: 첫 평균(SMA) 시드의 영향이 사라지도록 기간보다 충분히 길게 조회
+        self.history_days = int(os.getenv('RSI_HISTORY_DAYS', 365))
+        self._state_store = None
+        self.timeframes = self.parse_timeframes(os.getenv('RSI_TIMEFRAMES', ''))
         
     def calculate_rsi(self, prices, period=None):
         """
@@ -35,43 +55,73 @@ class RSICalculator:
             return None
         
         try:
-            # 가격 변화량 계산
-            delta = prices.diff()[1:]  # 첫 번째 NaN 제거
-            
-            # 상승분과 하락분 분리
-            gain = pd.Series(index=delta.index, dtype=float)
-            loss = pd.Series(index=delta.index, dtype=float)
-            
-            gain = delta.where(delta > 0, 0.0)
-            loss = (-delta).where(delta < 0, 0.0)
-            
-            # 첫 번째 평균값 계산 (단순 평균)
-            avg_gain = gain.iloc[:period].mean()
-            avg_loss = loss.iloc[:period].mean()
-            
-            # Wilder's smoothing으로 나머지 값들 계산
-            gains = [avg_gain]
-            losses = [avg_loss]
-            
-            for i in range(period, len(gain)):
-                avg_gain = (avg_gain * (period - 1) + gain.iloc[i]) / period
-                avg_loss = (avg_loss * (period - 1) + loss.iloc[i]) / period
-                gains.append(avg_gain)
-                losses.append(avg_loss)
-            
-            # RSI 계산
-            if avg_loss == 0:
-                return 100.0
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            
+            rsi_series = wilder_rsi(prices.to_numpy(dtype=float), period)[0]
+            rsi = rsi_series[-1]
+
+            if np.isnan(rsi):
+                return None
+
             return float(rsi)
-            
+
         except Exception as e:
             self.logger.error(f"RSI 계산 중 오류: {str(e)}")
             return None
-    
+
+    def calculate_rsi_matrix(self, closes, period=None):
+        """
+        여러 심볼의 RSI 시계열 일괄 계산 (Wilder's Smoothing, NumPy 엔진)
+
+        Args:
+            closes: 종가 데이터
+                - pandas DataFrame: 행=날짜, 열=심볼
+                - numpy 2차원 배열: 행=심볼, 열=봉
+            period: RSI 계산 기간 (기본값: 환경변수에서 설정)
+
+        Returns:
+            입력과 같은 형태의 RSI (DataFrame 또는 ndarray), 계산 불가 구간은 NaN
+        """
+        if period is None:
+            period = self.rsi_period
+
+        if isinstance(closes, pd.DataFrame):
+            rsi = wilder_rsi(closes.to_numpy(dtype=float).T, period)
+            return pd.DataFrame(rsi.T, index=closes.index, columns=closes.columns)
+
+        return wilder_rsi(closes, period)
+
+    def calculate_rsi_variants(self, closes, period=None, variants=RSI_VARIANTS):
+        """
+        RSI 변형(Wilder, Cutler, EMA, Stochastic RSI, Connors RSI) 일괄 계산
+
+        변화량/상승분/하락분은 한 번만 계산하고 모든 변형이 공유합니다 (rsi_engine.rsi_variants).
+
+        Args:
+            closes: 종가 데이터
+                - pandas Series: 단일 심볼 → 변형별 최신 값 { 이름: float | None }
+                - pandas DataFrame: 행=날짜, 열=심볼 → { 이름: DataFrame }
+                - numpy 2차원 배열: 행=심볼, 열=봉 → { 이름: ndarray }
+            period: RSI 계산 기간 (기본값: 환경변수에서 설정)
+            variants: 계산할 변형 이름 (RSI_VARIANTS 중 일부)
+
+        Returns:
+            dict: 변형 이름별 결과, 계산 불가 구간은 NaN (Series 입력은 None)
+        """
+        if period is None:
+            period = self.rsi_period
+
+        if isinstance(closes, pd.Series):
+            results = rsi_variants(closes.to_numpy(dtype=float), period, variants=variants)
+            return {name: (None if np.isnan(values[0, -1]) else float(values[0, -1])) for name, values in results.items()}
+
+        if isinstance(closes, pd.DataFrame):
+            results = rsi_variants(closes.to_numpy(dtype=float).T, period, variants=variants)
+            return {
+                name: pd.DataFrame(values.T, index=closes.index, columns=closes.columns)
+                for name, values in results.items()
+            }
+
+        return rsi_variants(closes, period, variants=variants)
+
     def calculate_rsi_ta(self, prices, period=None):
         """
         ta 라이브러리를 사용한 RSI 계산 (검증용)
@@ -87,34 +137,40 @@ class RSICalculator:
             period = self.rsi_period
             
         try:
-            rsi = ta.momentum.RSIIndicator(close=prices, window=period)
-            rsi_value = rsi.rsi().iloc[-1]
+            # ta는 검증용으로만 쓰이므로 호출 시점에 import (시작 시간 단축)
+            import ta
+
+            with self.metrics.timer('calculate_rsi_ta'):
+                rsi = ta.momentum.RSIIndicator(close=prices, window=period)
+                rsi_value = rsi.rsi().iloc[-1]
             return float(rsi_value)
         except Exception as e:
             self.logger.error(f"ta 라이브러리 RSI 계산 중 오류: {str(e)}")
             return None
     
-    def get_stock_data(self, symbol, days=60):
+    def get_stock_data(self, symbol, days=None):
         """
         주식 데이터 가져오기
         
         Args:
             symbol: 주식 심볼 (예: 'SPY', 'QQQ', 'DIA')
-            days: 가져올 일수 (기본값: 60일)
+            days: 가져올 일수 (기본값: RSI_HISTORY_DAYS, 365일)
         
         Returns:
             pandas DataFrame: 주식 데이터
         """
+        days = days or self.history_days
         try:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
             self.logger.info(f"{symbol} 주식 데이터 수집 시작 ({start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')})")
             
-            stock = yf.Ticker(symbol)
-            data = stock.history(start=start_date, end=end_date)
+            with self.metrics.timer('get_stock_data', source=self.provider.name, symbol=symbol):
+                data = self.provider.get_history(symbol, start_date, end_date)
             
-            if data.empty:
+            if data is None or data.empty:
+                self.metrics.increment('missing_symbols_total', source=self.provider.name)
                 self.logger.error(f"{symbol} 데이터를 가져올 수 없습니다.")
                 return None
                 
@@ -124,74 +180,454 @@ class RSICalculator:
         except Exception as e:
             self.logger.error(f"{symbol} 데이터 수집 중 오류 발생: {str(e)}")
             return None
+
+    def get_stock_data_bulk(self, symbols, days=None, interval='1d'):
+        """
+        여러 심볼의 주식 데이터를 한 번의 요청으로 가져오기
+        
+        Args:
+            symbols: 주식 심볼 리스트
+            days: 가져올 일수 (기본값: RSI_HISTORY_DAYS, 365일)
+            interval: 봉 간격 (기본값: '1d')
+        
+        Returns:
+            dict: { symbol: pandas DataFrame } (수집 실패 심볼은 제외)
+        """
+        days = days or self.history_days
+        try:
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=days)
+            
+            self.logger.info(f"{len(symbols)}개 심볼 주식 데이터 일괄 수집 시작 ({start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}, {interval}, provider: {self.provider.name})")
+            
+            with self.metrics.timer('get_stock_data_bulk', source=self.provider.name, interval=interval):
+                datasets = self.provider.get_histories(symbols, start_date, end_date, interval)
+            
+            missing = [symbol for symbol in symbols if symbol not in datasets]
+            if missing:
+                self.metrics.increment('missing_symbols_total', len(missing), source=self.provider.name)
+                self.logger.error(f"데이터를 가져올 수 없는 심볼: {missing}")
+            
+            self.logger.info(f"주식 데이터 일괄 수집 완료: {len(datasets)}/{len(symbols)}개 심볼")
+            return datasets
+            
+        except Exception as e:
+            self.logger.error(f"주식 데이터 일괄 수집 중 오류 발생: {str(e)}")
+            return {}
     
-    def get_rsi_for_symbol(self, symbol):
+    def get_rsi_for_symbol(self, symbol, data=None):
         """
         특정 심볼의 RSI 계산
         
         Args:
             symbol: 주식 심볼
+            data: 미리 수집한 주식 데이터 (없으면 새로 수집)
         
         Returns:
-            dict: RSI 정보 (rsi_value, current_price, symbol, status)
+            dict: RSI 정보 (rsi_value, current_price, symbol, status, trade_date: 마지막 봉 날짜)
         """
         try:
             # 주식 데이터 가져오기
-            data = self.get_stock_data(symbol)
+            if data is None:
+                data = self.get_stock_data(symbol)
             
             if data is None or data.empty:
                 return None
                 
-            # RSI 계산 (ta 라이브러리 사용)
-            rsi_value = self.calculate_rsi_ta(data['Close'])
+            # RSI 계산 (NumPy 엔진)
+            rsi_value = self.calculate_rsi(data['Close'].dropna())
             
             if rsi_value is None:
                 return None
                 
-            # 현재 가격
-            current_price = data['Close'].iloc[-1]
-            
-            # RSI 상태 판단
-            status = "정상"
-            if rsi_value <= self.oversold_threshold:
-                status = "과매도"
-            elif rsi_value >= self.overbought_threshold:
-                status = "과매수"
-            
-            result = {
-                'symbol': symbol,
-                'rsi_value': round(rsi_value, 2),
-                'current_price': round(current_price, 2),
-                'status': status,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            
-            self.logger.info(f"{symbol} RSI 계산 완료: {rsi_value:.2f} ({status})")
-            return result
+            return self._rsi_result(symbol, rsi_value, data['Close'].iloc[-1], data.index[-1])
             
         except Exception as e:
             self.logger.error(f"{symbol} RSI 계산 중 오류 발생: {str(e)}")
             return None
+
+    def _rsi_result(self, symbol, rsi_value, current_price, trade_date):
+        """계산된 RSI로 결과 dict 생성 (가격/날짜는 마지막 봉 기준)"""
+        status = self.classify_rsi(rsi_value)
+        self.logger.info(f"{symbol} RSI 계산 완료: {rsi_value:.2f} ({status})")
+        return {
+            'symbol': symbol,
+            'rsi_value': round(rsi_value, 2),
+            'current_price': round(current_price, 2),
+            'status': status,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'trade_date': pd.Timestamp(trade_date).strftime('%Y-%m-%d'),
+        }
+
+    def latest_rsi_values(self, price_data, period=None):
+        """여러 심볼의 마지막 봉 RSI를 calculate_rsi_matrix 한 번으로 계산
+
+        심볼마다 거래일이 달라도 중간 NaN이 생기지 않도록 각 심볼의 종가를
+        마지막 봉 기준으로 오른쪽 정렬한 (심볼 × 봉) 행렬을 만듭니다.
+
+        Args:
+            price_data: { symbol: DataFrame(Close 포함) }
+            period: RSI 계산 기간 (기본값: 환경변수에서 설정)
+
+        Returns:
+            dict: { symbol: float } (데이터 부족 등 계산 불가 심볼은 제외)
+        """
+        closes = {
+            symbol: data['Close'].dropna().to_numpy(dtype=float)
+            for symbol, data in price_data.items()
+            if data is not None and 'Close' in data
+        }
+        closes = {symbol: values for symbol, values in closes.items() if len(values)}
+        if not closes:
+            return {}
+
+        width = max(len(values) for values in closes.values())
+        matrix = np.full((len(closes), width), np.nan)
+        for row, values in enumerate(closes.values()):
+            matrix[row, width - len(values):] = values
+
+        with self.metrics.timer('calculate_rsi_matrix'):
+            latest = self.calculate_rsi_matrix(matrix, period)[:, -1]
+        return {symbol: float(value) for symbol, value in zip(closes, latest) if not np.isnan(value)}
+
+    def latest_store_rsi(self, symbols=None, days=None, period=None):
+        """memmap 저장소의 종가 행렬로 마지막 날짜의 RSI 일괄 계산
+
+        심볼별 DataFrame을 만들지 않고 ColumnarPriceStore.slice()가 반환한 (심볼 × 날짜) 행렬
+        (저장 순서상 연속인 심볼이면 복사 없는 뷰)을 그대로 calculate_rsi_matrix에 넘깁니다.
+        마지막 날짜에 종가가 없는 심볼은 제외하고, 중간에 빈 날짜가 있는 행만 복사해 오른쪽 정렬합니다.
+
+        Args:
+            symbols: 심볼 리스트 (None이면 저장소 전체)
+            days: 저장소 마지막 날짜 기준 조회 기간(일, 기본값: RSI_HISTORY_DAYS)
+            period: RSI 계산 기간 (기본값: 환경변수에서 설정)
+
+        Returns:
+            tuple: (마지막 날짜 Timestamp | None, { symbol: (rsi, close) })
+        """
+        days = days or self.history_days
+        store = self.provider.store
+        dates = store.dates
+        if not len(dates):
+            return None, {}
+
+        start = dates[-1] - timedelta(days=days)
+        closes = store.slice('Close', symbols, start)
+        present = store.present_symbols(symbols)
+        if not closes.size:
+            return dates[-1], {}
+
+        valid = ~np.isnan(closes)
+        gaps = np.flatnonzero(valid[:, -1] & (valid.sum(axis=1) < closes.shape[1] - valid.argmax(axis=1)))
+
+        with self.metrics.timer('calculate_rsi_matrix', source='memmap'):
+            # 저장소 뷰 전체를 그대로 계산한 뒤, 빈 날짜가 있는 행만 작은 버퍼에 오른쪽 정렬해 다시 계산
+            latest = self.calculate_rsi_matrix(closes, period)[:, -1]
+            if len(gaps):
+                buffer = np.full((len(gaps), closes.shape[1]), np.nan)
+                for position, row in enumerate(gaps):
+                    values = closes[row][valid[row]]
+                    buffer[position, closes.shape[1] - len(values):] = values
+                latest[gaps] = self.calculate_rsi_matrix(buffer, period)[:, -1]
+        return dates[-1], {
+            symbol: (float(value), float(close))
+            for symbol, value, close in zip(present, latest, closes[:, -1])
+            if not (np.isnan(value) or np.isnan(close))
+        }
+
+    def classify_rsi(self, rsi_value):
+        """RSI 값에 따른 상태 판단 (과매도/정상/과매수)"""
+        if rsi_value <= self.oversold_threshold:
+            return "과매도"
+        if rsi_value >= self.overbought_threshold:
+            return "과매수"
+        return "정상"
     
-    def get_rsi_for_symbols(self, symbols=['SPY', 'QQQ', 'DIA']):
+    def get_rsi_for_symbols(self, symbols=['SPY', 'QQQ', 'DIA'], price_data=None):
         """
         여러 심볼의 RSI 계산
         
+        RSI_TIMEFRAMES가 설정되어 있으면 가장 세밀한 봉으로 한 번만 수집한 뒤
+        각 결과에 시간 프레임별 RSI(rsi_timeframes)를 함께 담습니다.
+        
         Args:
             symbols: 주식 심볼 리스트
+            price_data: 미리 수집한 { symbol: DataFrame } (없으면 일괄 수집)
         
         Returns:
             list: RSI 정보 리스트
         """
+        multi_rsi = {}
+        if self.timeframes:
+            if price_data is None:
+                price_data = self.get_stock_data_bulk(symbols, **self._multi_timeframe_fetch_args(self.timeframes))
+            multi_rsi = self.get_multi_timeframe_rsi(symbols, self.timeframes, price_data=price_data)
+            # 기본 RSI는 일봉 기준으로 계산
+            if price_data:
+                daily = self.resample_closes(price_data, '1d')
+                price_data = {symbol: daily[[symbol]].dropna().rename(columns={symbol: 'Close'}) for symbol in daily.columns}
+        elif price_data is None and self.provider.name == 'memmap':
+            return self._store_rsi_results(symbols)
+        elif price_data is None:
+            price_data = self.get_stock_data_bulk(symbols)
+
         results = []
+        price_data = {symbol: price_data[symbol] for symbol in symbols if price_data.get(symbol) is not None and not price_data[symbol].empty}
+        try:
+            rsi_values = self.latest_rsi_values(price_data)
+        except Exception as e:
+            self.logger.error(f"RSI 일괄 계산 중 오류 발생: {str(e)}")
+            return results
         
-        for symbol in symbols:
-            result = self.get_rsi_for_symbol(symbol)
-            if result:
-                results.append(result)
+        for symbol, data in price_data.items():
+            if symbol not in rsi_values:
+                self.logger.warning(f"{symbol} RSI를 계산할 수 없습니다 (데이터 {len(data)}개)")
+                continue
+            result = self._rsi_result(symbol, rsi_values[symbol], data['Close'].iloc[-1], data.index[-1])
+            if symbol in multi_rsi:
+                result['rsi_timeframes'] = multi_rsi[symbol]
+            results.append(result)
                 
         return results
+
+    def _store_rsi_results(self, symbols):
+        """memmap Provider: 저장소 행렬에서 바로 RSI 결과 생성"""
+        try:
+            trade_date, latest = self.latest_store_rsi(symbols)
+        except Exception as e:
+            self.logger.error(f"저장소 RSI 일괄 계산 중 오류 발생: {str(e)}")
+            return []
+
+        missing = [symbol for symbol in symbols if symbol not in latest]
+        if missing:
+            self.metrics.increment('missing_symbols_total', len(missing), source=self.provider.name)
+            self.logger.error(f"저장소에서 RSI를 계산할 수 없는 심볼: {missing}")
+        return [self._rsi_result(symbol, *latest[symbol], trade_date) for symbol in symbols if symbol in latest]
+
+    @staticmethod
+    def parse_timeframes(spec):
+        """'1d,1W,1M' 형태의 설정을 시간 프레임 리스트로 변환 (알 수 없는 값은 오류)"""
+        timeframes = [item.strip() for item in spec.split(',') if item.strip()]
+        unknown = [item for item in timeframes if item not in TIMEFRAMES]
+        if unknown:
+            raise ValueError(f"지원하지 않는 RSI 시간 프레임입니다: {unknown} (지원: {list(TIMEFRAMES)})")
+        return timeframes
+
+    def _multi_timeframe_fetch_args(self, timeframes, period=None):
+        """가장 세밀한 봉 간격과 모든 시간 프레임에 충분한 조회 일수 계산"""
+        if period is None:
+            period = self.rsi_period
+
+        # Wilder 평활이 수렴하도록 기간의 3배 봉 확보
+        bars = period * 3
+        days = int(max(bars * TIMEFRAMES[tf][2] for tf in timeframes)) + 10
+        if INTRADAY_TIMEFRAMES.intersection(timeframes):
+            return {'days': min(days, INTRADAY_MAX_DAYS), 'interval': '1h'}
+        return {'days': max(days, self.history_days), 'interval': '1d'}
+
+    @staticmethod
+    def resample_closes(price_data, timeframe):
+        """
+        심볼별 가격 데이터를 시간 프레임 종가 행렬로 리샘플링
+        
+        Args:
+            price_data: { symbol: DataFrame(Close 포함) }
+            timeframe: TIMEFRAMES 키 (예: '1W')
+        
+        Returns:
+            pandas DataFrame: 행=봉 시각, 열=심볼
+        """
+        closes = pd.concat({symbol: frame['Close'] for symbol, frame in price_data.items()}, axis=1)
+        return closes.resample(TIMEFRAMES[timeframe][0]).last().dropna(how='all')
+
+    def get_multi_timeframe_rsi(self, symbols, timeframes=None, price_data=None, period=None):
+        """
+        여러 시간 프레임의 RSI를 한 번의 수집과 한 번의 벡터 연산으로 계산
+        
+        가장 세밀한 봉(시간봉 요청 시 1h, 아니면 1d)만 수집한 뒤 메모리에서 리샘플링하고,
+        모든 (심볼, 시간 프레임) 시계열을 오른쪽 정렬한 하나의 행렬로 묶어 RSI 엔진에 한 번에 전달합니다.
+        
+        Args:
+            symbols: 주식 심볼 리스트
+            timeframes: 시간 프레임 리스트 (기본값: RSI_TIMEFRAMES 또는 ['1d', '1W', '1M'])
+            price_data: 미리 수집한 { symbol: DataFrame } (없으면 일괄 수집)
+            period: RSI 계산 기간 (기본값: 환경변수에서 설정)
+        
+        Returns:
+            dict: { symbol: { timeframe: rsi_value } }
+        """
+        if period is None:
+            period = self.rsi_period
+        timeframes = timeframes or self.timeframes or ['1d', '1W', '1M']
+
+        try:
+            if price_data is None:
+                price_data = self.get_stock_data_bulk(symbols, **self._multi_timeframe_fetch_args(timeframes, period))
+            price_data = {symbol: price_data[symbol] for symbol in symbols if symbol in price_data}
+            if not price_data:
+                return {}
+
+            if INTRADAY_TIMEFRAMES.intersection(timeframes):
+                intraday = any(len(frame.index.normalize().unique()) < len(frame) for frame in price_data.values())
+                if not intraday:
+                    self.logger.warning("시간봉 데이터가 없어 시간 프레임 RSI 중 시간봉은 제외합니다.")
+                    timeframes = [tf for tf in timeframes if tf not in INTRADAY_TIMEFRAMES]
+
+            keys = []
+            rows = []
+            for timeframe in timeframes:
+                closes = self.resample_closes(price_data, timeframe)
+                for symbol in closes.columns:
+                    values = closes[symbol].dropna().to_numpy(dtype=float)
+                    keys.append((symbol, timeframe))
+                    rows.append(values)
+
+            width = max(len(values) for values in rows)
+            matrix = np.full((len(rows), width), np.nan)
+            for index, values in enumerate(rows):
+                if len(values):
+                    matrix[index, width - len(values):] = values
+
+            last_rsi = wilder_rsi(matrix, period)[:, -1]
+
+            results = {}
+            for (symbol, timeframe), value in zip(keys, last_rsi):
+                results.setdefault(symbol, {})[timeframe] = None if np.isnan(value) else round(float(value), 2)
+
+            self.logger.info(f"다중 시간 프레임 RSI 계산 완료: {len(results)}개 심볼 × {timeframes}")
+            return results
+
+        except Exception as e:
+            self.logger.error(f"다중 시간 프레임 RSI 계산 중 오류 발생: {str(e)}")
+            return {}
     
+    @property
+    def state_store(self):
+        """스트리밍 RSI 상태 저장소 (최초 사용 시 생성)"""
+        if self._state_store is None:
+            from rsi_state import RSIStateStore
+
+            default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'rsi_state.sqlite3')
+            self._state_store = RSIStateStore(os.getenv('RSI_STATE_PATH', default_path))
+        return self._state_store
+
+    def update(self, symbol, close, timestamp=None, period=None):
+        """
+        새 종가 1개로 RSI 갱신 (저장된 Wilder 상태 기반 O(1) 계산)
+        
+        - 다음 봉: 저장된 상태에서 한 단계 평활
+        - 같은 봉 정정(장중 → 확정 등): 직전 봉 상태에서 다시 한 단계 평활
+        - 상태 없음/누락 봉(NYSE 거래일 공백)/과거 봉 정정: 전체 재계산으로 상태 재구성
+        
+        Args:
+            symbol: 주식 심볼
+            close: 새 종가
+            timestamp: 봉 시각 (기본값: 현재 시각, 일 단위로 처리)
+            period: RSI 계산 기간 (기본값: 환경변수에서 설정)
+        
+        Returns:
+            RSI 값 (float), 계산 불가 시 None
+        """
+        if period is None:
+            period = self.rsi_period
+
+        try:
+            bar_date = pd.Timestamp(timestamp or datetime.now()).strftime('%Y-%m-%d')
+            close = float(close)
+            state = self.state_store.get(symbol, period)
+
+            if state is None:
+                self.logger.info(f"{symbol} RSI 상태 없음 → 전체 재계산")
+                return self.rebuild_rsi_state(symbol, close, bar_date, period)
+
+            if bar_date > state['bar_date']:
+                # 주말/NYSE 휴장일은 누락 봉이 아님 (상태 봉 다음 거래일보다 뒤일 때만 재계산)
+                if bar_date > next_trading_day(date.fromisoformat(state['bar_date'])).isoformat():
+                    self.logger.info(f"{symbol} 누락 봉 감지 ({state['bar_date']} → {bar_date}) → 전체 재계산")
+                    return self.rebuild_rsi_state(symbol, close, bar_date, period)
+
+                avg_gain, avg_loss, rsi = wilder_step(state['avg_gain'], state['avg_loss'], state['close'], close, period)
+                new_state = {
+                    'symbol': symbol,
+                    'period': period,
+                    'bar_date': bar_date,
+                    'close': close,
+                    'avg_gain': avg_gain,
+                    'avg_loss': avg_loss,
+                    'prev_bar_date': state['bar_date'],
+                    'prev_close': state['close'],
+                    'prev_avg_gain': state['avg_gain'],
+                    'prev_avg_loss': state['avg_loss'],
+                }
+            elif bar_date == state['bar_date'] and state['prev_bar_date'] is not None:
+                avg_gain, avg_loss, rsi = wilder_step(state['prev_avg_gain'], state['prev_avg_loss'], state['prev_close'], close, period)
+                new_state = dict(state, close=close, avg_gain=avg_gain, avg_loss=avg_loss)
+            else:
+                self.logger.info(f"{symbol} 과거 봉 정정 ({bar_date} ≤ {state['bar_date']}) → 전체 재계산")
+                return self.rebuild_rsi_state(symbol, close, bar_date, period)
+
+            self.state_store.save(new_state)
+            self.logger.info(f"{symbol} RSI 갱신 ({bar_date}): {rsi:.2f}")
+            return rsi
+
+        except Exception as e:
+            self.logger.error(f"{symbol} RSI 갱신 중 오류 발생: {str(e)}")
+            return None
+
+    def rebuild_rsi_state(self, symbol, close=None, timestamp=None, period=None, prices=None):
+        """
+        전체 이력으로 Wilder 상태를 다시 계산해 저장
+        
+        Args:
+            symbol: 주식 심볼
+            close: 반영할 최신(또는 정정) 종가 (선택)
+            timestamp: close의 봉 시각 (선택)
+            period: RSI 계산 기간 (기본값: 환경변수에서 설정)
+            prices: 종가 이력 (pandas Series, 없으면 Provider에서 수집)
+        
+        Returns:
+            마지막 봉의 RSI 값 (float), 계산 불가 시 None
+        """
+        if period is None:
+            period = self.rsi_period
+
+        if prices is None:
+            data = self.get_stock_data(symbol, days=self.state_history_days)
+            if data is None or data.empty:
+                return None
+            prices = data['Close']
+
+        prices = prices.dropna().copy()
+        prices.index = pd.DatetimeIndex(prices.index).normalize()
+        if close is not None:
+            prices.loc[pd.Timestamp(timestamp or datetime.now()).normalize()] = float(close)
+            prices = prices[~prices.index.duplicated(keep='last')].sort_index()
+
+        if len(prices) < period + 2:
+            self.logger.warning(f"{symbol} RSI 상태 재구성을 위한 데이터가 부족합니다. 필요: {period + 2}, 현재: {len(prices)}")
+            return None
+
+        gain, loss = gains_losses(prices.to_numpy(dtype=float))
+        avg_gain, avg_loss = wilder_averages(gain, loss, period)
+        rsi = float(rsi_from_averages(avg_gain[:, -1:], avg_loss[:, -1:])[0, 0])
+
+        dates = prices.index.strftime('%Y-%m-%d')
+        self.state_store.save({
+            'symbol': symbol,
+            'period': period,
+            'bar_date': dates[-1],
+            'close': float(prices.iloc[-1]),
+            'avg_gain': float(avg_gain[0, -1]),
+            'avg_loss': float(avg_loss[0, -1]),
+            'prev_bar_date': dates[-2],
+            'prev_close': float(prices.iloc[-2]),
+            'prev_avg_gain': float(avg_gain[0, -2]),
+            'prev_avg_loss': float(avg_loss[0, -2]),
+        })
+
+        self.logger.info(f"{symbol} RSI 상태 재구성 완료 ({dates[-1]}): {rsi:.2f}")
+        return rsi
+
     # 메시지 포맷팅은 main.py로 이동
 
 # 테스트용 메인 함수
@@ -214,8 +650,8 @@ if __name__ == "__main__":
             print(f"  Current Price: ${data['Close'].iloc[-1]:.2f}")
             print()
     
-    # 여러 심볼 테스트 (ta 라이브러리 사용)
-    print("=== 여러 심볼 RSI 테스트 (TA Library) ===")
+    # 여러 심볼 테스트 (보고서와 같은 NumPy 엔진 일괄 계산)
+    print("=== 여러 심볼 RSI 테스트 (calculate_rsi_matrix) ===")
     results = calculator.get_rsi_for_symbols(symbols)
     
     for result in results:
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""다중 심볼 RSI 계산 엔진 (NumPy)
+
+종가 행렬(심볼 × 봉)을 한 번에 받아 모든 심볼의 RSI 시계열을 계산합니다.
+Wilder's Smoothing 정의는 `RSICalculator.calculate_rsi`와 동일합니다.
+
+- 첫 평균: 최초 `period`개 상승분/하락분의 단순 평균
+- 이후: avg = (avg * (period - 1) + 현재값) / period
+
+`rsi_variants`는 변화량/상승분/하락분을 한 번만 계산해 Wilder, Cutler(SMA), EMA,
+Stochastic RSI, Connors RSI를 함께 만듭니다.
+"""
+import numpy as np
+import pandas as pd
+
+
+def as_price_matrix(closes):
+    """종가 입력을 2차원 float 행렬(심볼 × 봉)로 변환
+
+    Args:
+        closes: 1차원(단일 심볼) 또는 2차원(심볼 × 봉) 배열
+
+    Returns:
+        numpy.ndarray: (심볼 수, 봉 수) 형태의 float64 행렬
+    """
+    matrix = np.asarray(closes, dtype=np.float64)
+    if matrix.ndim == 1:
+        matrix = matrix[np.newaxis, :]
+    if matrix.ndim != 2:
+        raise ValueError(f"종가 행렬은 1차원 또는 2차원이어야 합니다. 현재: {matrix.ndim}차원")
+    return matrix
+
+
+def _leading_nan_counts(matrix):
+    """행별 선행 NaN 개수 (상장일이 다른 심볼 정렬용)"""
+    valid = ~np.isnan(matrix)
+    counts = valid.argmax(axis=1)
+    counts[~valid.any(axis=1)] = matrix.shape[1]
+    return counts
+
+
+def _shift_rows(matrix, offsets):
+    """행별로 offsets만큼 왼쪽(양수)으로 이동, 빈 칸은 NaN"""
+    n_rows, n_cols = matrix.shape
+    cols = np.arange(n_cols)[np.newaxis, :] + offsets[:, np.newaxis]
+    inside = (cols >= 0) & (cols < n_cols)
+    shifted = np.take_along_axis(matrix, np.clip(cols, 0, n_cols - 1), axis=1)
+    shifted[~inside] = np.nan
+    return shifted
+
+
+def gains_losses(closes):
+    """가격 변화량을 상승분/하락분으로 분리
+
+    Args:
+        closes: (심볼 × 봉) 종가 행렬
+
+    Returns:
+        tuple: (gain, loss) 각각 (심볼 × 봉-1) 행렬
+    """
+    return split_delta(np.diff(as_price_matrix(closes), axis=1))
+
+
+def split_delta(delta):
+    """변화량 행렬을 (상승분, 하락분)으로 분리 (NaN은 그대로 전파)"""
+    # np.maximum은 NaN을 그대로 전파
+    gain = np.maximum(delta, 0.0)
+    loss = np.maximum(-delta, 0.0)
+    return gain, loss
+
+
+# 심볼 수가 이 값 이상이면 봉 방향 NumPy 루프, 미만이면 pandas ewm으로 평활
+VECTOR_LOOP_MIN_ROWS = 16
+
+
+def _smooth(seeded, period):
+    """시드가 첫 열에 들어 있는 행렬에 alpha=1/period 지수 평활 적용
+
+    - 심볼이 많을 때: 봉 단위로 모든 심볼을 한 번에 갱신 (연속 메모리의 행 연산)
+    - 심볼이 적고 봉이 길 때: pandas ewm(C 구현)으로 열 단위 처리
+    두 방식 모두 NaN 봉은 건너뛰고 직전 평균을 유지합니다.
+    """
+    n_rows, n_cols = seeded.shape
+    if n_rows < VECTOR_LOOP_MIN_ROWS:
+        return (
+            pd.DataFrame(seeded.T)
+            .ewm(alpha=1.0 / period, adjust=False, ignore_na=True)
+            .mean()
+            .to_numpy()
+            .T
+        )
+
+    decay = (period - 1) / period
+    columns = np.ascontiguousarray(seeded.T)
+    scaled = columns / period
+    has_nan = np.isnan(columns).any(axis=1)
+
+    smoothed = np.empty_like(columns)
+    smoothed[0] = columns[0]
+    for t in range(1, n_cols):
+        prev = smoothed[t - 1]
+        current = prev * decay + scaled[t]
+        if has_nan[t] or has_nan[t - 1]:
+            # NaN 봉은 건너뛰고 직전 평균 유지, 평균이 없으면 첫 유효값부터 시작 (ewm ignore_na와 동일)
+            current = np.where(np.isnan(columns[t]), prev, np.where(np.isnan(prev), columns[t], current))
+        smoothed[t] = current
+    return smoothed.T
+
+
+def wilder_averages(gain, loss, period):
+    """Wilder's Smoothing 평균 상승분/하락분 계산
+
+    최초 `period`개는 단순 평균으로 시드를 만들고, 이후 재귀식
+    avg_t = avg_{t-1} + (x_t - avg_{t-1}) / period 는 alpha=1/period인
+    지수 평활과 같으므로 모든 심볼을 한 번에 처리합니다.
+
+    Args:
+        gain: (심볼 × 변화량) 상승분 행렬
+        loss: (심볼 × 변화량) 하락분 행렬
+        period: 평활 기간
+
+    Returns:
+        tuple: (avg_gain, avg_loss) 입력과 같은 형태, 시드 이전 구간은 NaN
+    """
+    return _seeded_averages(gain, loss, period, period)
+
+
+def ema_averages(gain, loss, period):
+    """EMA(alpha=2/(period+1)) 평균 상승분/하락분 (시드는 Wilder와 같이 최초 period개 단순 평균)"""
+    return _seeded_averages(gain, loss, period, (period + 1) / 2)
+
+
+def _seeded_averages(gain, loss, period, smoothing):
+    """최초 period개 단순 평균을 시드로 alpha=1/smoothing 지수 평활"""
+    n_rows, n_cols = gain.shape
+    avg_gain = np.full((n_rows, n_cols), np.nan)
+    avg_loss = np.full((n_rows, n_cols), np.nan)
+    if n_cols < period:
+        return avg_gain, avg_loss
+
+    for source, target in ((gain, avg_gain), (loss, avg_loss)):
+        seeded = source[:, period - 1:].copy()
+        seeded[:, 0] = source[:, :period].mean(axis=1)
+        target[:, period - 1:] = _smooth(seeded, smoothing)
+
+    return avg_gain, avg_loss
+
+
+def _rolling(matrix, window, method):
+    """행 방향(봉) 이동 구간 통계 ('mean', 'min', 'max'), 구간이 차지 않거나 NaN이 있으면 NaN"""
+    rolled = pd.DataFrame(matrix.T).rolling(window, min_periods=window)
+    return getattr(rolled, method)().to_numpy().T
+
+
+def sma_averages(gain, loss, period):
+    """Cutler RSI용 단순 이동 평균 상승분/하락분"""
+    return _rolling(gain, period, 'mean'), _rolling(loss, period, 'mean')
+
+
+def rsi_from_averages(avg_gain, avg_loss):
+    """평균 상승분/하락분으로 RSI 계산 (avg_loss == 0 이면 100)"""
+    # 100 - 100 / (1 + RS) 와 같은 식, 나눗셈 1회로 계산
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 * avg_gain / (avg_gain + avg_loss)
+    rsi[avg_loss == 0] = 100.0
+    rsi[np.isnan(avg_gain) | np.isnan(avg_loss)] = np.nan
+    return rsi
+
+
+def aligned_gains_losses(closes):
+    """선행 NaN을 정렬한 상승분/하락분 계산 (여러 기간의 RSI가 공유하는 중간값)
+
+    Args:
+        closes: 1차원(단일 심볼) 또는 2차원(심볼 × 봉) 종가 배열
+
+    Returns:
+        tuple: (gain, loss, lead) - gain/loss는 (심볼 × 봉-1), lead는 행별 선행 NaN 개수
+    """
+    aligned, lead = _aligned_matrix(closes)
+    gain, loss = gains_losses(aligned)
+    return gain, loss, lead
+
+
+def _aligned_matrix(closes):
+    """행별 선행 NaN을 제거해 왼쪽으로 정렬한 종가 행렬과 선행 NaN 개수"""
+    matrix = as_price_matrix(closes)
+    lead = _leading_nan_counts(matrix)
+    return (_shift_rows(matrix, lead) if lead.any() else matrix), lead
+
+
+def _restore_bars(values, lead):
+    """변화량 기준(봉-1) 행렬을 원래 종가 위치(봉)로 되돌림"""
+    bars = np.full((values.shape[0], values.shape[1] + 1), np.nan)
+    bars[:, 1:] = values
+    return _shift_rows(bars, -lead) if lead.any() else bars
+
+
+def wilder_rsi_from_deltas(gain, loss, lead, period=14):
+    """aligned_gains_losses 결과로 Wilder RSI 계산 (기간만 바꿔 반복 계산할 때 사용)
+
+    Returns:
+        numpy.ndarray: (심볼 × 봉) RSI 행렬, 원래 종가와 같은 위치에 정렬
+    """
+    return _restore_bars(rsi_from_averages(*wilder_averages(gain, loss, period)), lead)
+
+
+def wilder_rsi(closes, period=14):
+    """여러 심볼의 Wilder RSI 시계열을 한 번에 계산
+
+    심볼마다 상장일이 달라 앞쪽이 NaN인 행은 유효 구간을 기준으로 계산합니다.
+
+    Args:
+        closes: 1차원(단일 심볼) 또는 2차원(심볼 × 봉) 종가 배열
+        period: RSI 계산 기간
+
+    Returns:
+        numpy.ndarray: (심볼 × 봉) RSI 행렬, 계산 불가 구간은 NaN
+    """
+    gain, loss, lead = aligned_gains_losses(closes)
+    return wilder_rsi_from_deltas(gain, loss, lead, period)
+
+
+RSI_VARIANTS = ('wilder', 'cutler', 'ema', 'stoch_rsi', 'stoch_rsi_k', 'stoch_rsi_d', 'connors')
+
+
+def stochastic_oscillator(values, period):
+    """이동 구간 최저/최고 대비 위치 (0~100, 구간 내 변동이 없으면 NaN)"""
+    low = _rolling(values, period, 'min')
+    high = _rolling(values, period, 'max')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch = 100.0 * (values - low) / (high - low)
+    stoch[high == low] = np.nan
+    return stoch
+
+
+def streaks(delta):
+    """연속 상승/하락 봉 수 (상승 +n, 하락 -n, 보합 0, NaN은 NaN)"""
+    direction = np.sign(delta)
+    n_rows, n_cols = direction.shape
+    positions = np.broadcast_to(np.arange(n_cols), (n_rows, n_cols))
+    starts = np.ones((n_rows, n_cols), dtype=bool)
+    starts[:, 1:] = direction[:, 1:] != direction[:, :-1]
+    run_start = np.maximum.accumulate(np.where(starts, positions, 0), axis=1)
+    return direction * (positions - run_start + 1)
+
+
+def percent_rank(values, lookback):
+    """직전 lookback개 값 중 현재 값보다 작은 값의 비율 (0~100)
+
+    lookback번의 행렬 비교로 계산하므로 메모리는 입력 크기만큼만 사용합니다.
+    """
+    n_cols = values.shape[1]
+    rank = np.full(values.shape, np.nan)
+    if n_cols <= lookback:
+        return rank
+
+    current = values[:, lookback:]
+    below = np.zeros(current.shape, dtype=np.int32)
+    less = np.empty(current.shape, dtype=bool)
+    for lag in range(1, lookback + 1):
+        np.less(values[:, lookback - lag:n_cols - lag], current, out=less)
+        below += less
+
+    # 현재 값 또는 직전 lookback개 중 NaN이 있으면 NaN (누적 NaN 개수의 차이로 판정)
+    nan_count = np.zeros((values.shape[0], n_cols + 1), dtype=np.int32)
+    np.cumsum(np.isnan(values), axis=1, out=nan_count[:, 1:])
+    valid = nan_count[:, lookback + 1:] == nan_count[:, :n_cols - lookback]
+    rank[:, lookback:] = np.where(valid, below * (100.0 / lookback), np.nan)
+    return rank
+
+
+def rsi_variants(closes, period=14, stoch_period=None, smooth_k=3, smooth_d=3,
+                 connors_periods=(3, 2, 100), variants=RSI_VARIANTS):
+    """RSI 변형들을 공유 중간값(변화량/상승분/하락분)으로 한 번에 계산
+
+    - wilder: Wilder's Smoothing RSI (wilder_rsi와 동일)
+    - cutler: 상승분/하락분의 단순 이동 평균(SMA) RSI
+    - ema: 상승분/하락분의 EMA(alpha=2/(period+1)) RSI
+    - stoch_rsi: Wilder RSI의 stoch_period 구간 스토캐스틱 (0~100), stoch_rsi_k/d는 각각 smooth_k, smooth_d 이동 평균
+    - connors: (RSI(종가, 3) + RSI(연속 상승/하락 봉 수, 2) + 1봉 수익률의 100봉 백분위) / 3
+
+    Args:
+        closes: 1차원(단일 심볼) 또는 2차원(심볼 × 봉) 종가 배열
+        period: RSI 계산 기간
+        stoch_period: Stochastic RSI 구간 (기본값: period)
+        smooth_k: Stochastic RSI %K 평활 구간
+        smooth_d: Stochastic RSI %D 평활 구간
+        connors_periods: Connors RSI (종가 RSI 기간, 연속 봉 RSI 기간, 백분위 구간)
+        variants: 계산할 변형 이름 (RSI_VARIANTS 중 일부)
+
+    Returns:
+        dict: { 변형 이름: (심볼 × 봉) 행렬 }, 계산 불가 구간은 NaN
+    """
+    unknown = set(variants) - set(RSI_VARIANTS)
+    if unknown:
+        raise ValueError(f"지원하지 않는 RSI 변형입니다: {sorted(unknown)}")
+
+    aligned, lead = _aligned_matrix(closes)
+    delta = np.diff(aligned, axis=1)
+    gain, loss = split_delta(delta)
+
+    # 변화량 기준(봉-1) 결과, 마지막에 원래 위치로 되돌림
+    computed = {}
+    wilder = {}
+
+    def wilder_for(length):
+        if length not in wilder:
+            wilder[length] = rsi_from_averages(*wilder_averages(gain, loss, length))
+        return wilder[length]
+
+    stoch_names = {'stoch_rsi', 'stoch_rsi_k', 'stoch_rsi_d'}
+    if 'wilder' in variants:
+        computed['wilder'] = wilder_for(period)
+    if 'cutler' in variants:
+        computed['cutler'] = rsi_from_averages(*sma_averages(gain, loss, period))
+    if 'ema' in variants:
+        computed['ema'] = rsi_from_averages(*ema_averages(gain, loss, period))
+    if stoch_names & set(variants):
+        stoch = stochastic_oscillator(wilder_for(period), stoch_period or period)
+        stoch_k = _rolling(stoch, smooth_k, 'mean')
+        computed.update({
+            'stoch_rsi': stoch,
+            'stoch_rsi_k': stoch_k,
+            'stoch_rsi_d': _rolling(stoch_k, smooth_d, 'mean'),
+        })
+    if 'connors' in variants:
+        price_period, streak_period, rank_lookback = connors_periods
+        streak = streaks(delta)
+        streak_rsi = np.full(delta.shape, np.nan)
+        streak_rsi[:, 1:] = rsi_from_averages(*wilder_averages(*gains_losses(streak), streak_period))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = delta / aligned[:, :-1]
+        computed['connors'] = (wilder_for(price_period) + streak_rsi + percent_rank(returns, rank_lookback)) / 3.0
+
+    return {name: _restore_bars(computed[name], lead) for name in variants}
+
+
+def wilder_step(avg_gain, avg_loss, prev_close, close, period=14):
+    """직전 Wilder 상태에서 새 종가 1개를 반영 (O(1), 스칼라/배열 모두 지원)
+
+    Args:
+        avg_gain: 직전 평균 상승분
+        avg_loss: 직전 평균 하락분
+        prev_close: 직전 종가
+        close: 새 종가
+        period: RSI 계산 기간
+
+    Returns:
+        tuple: (avg_gain, avg_loss, rsi)
+    """
+    delta = np.asarray(close, dtype=np.float64) - prev_close
+    gain = np.maximum(delta, 0.0)
+    loss = np.maximum(-delta, 0.0)
+
+    avg_gain = (avg_gain * (period - 1) + gain) / period
+    avg_loss = (avg_loss * (period - 1) + loss) / period
+    rsi = rsi_from_averages(np.atleast_1d(avg_gain), np.atleast_1d(avg_loss))
+
+    if np.ndim(delta) == 0:
+        return float(avg_gain), float(avg_loss), float(rsi[0])
+    return avg_gain, avg_loss, rsi
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""심볼별 Wilder RSI 평활 상태 저장소 (SQLite)
+
+스트리밍 RSI 갱신(`RSICalculator.update`)이 실행 간에 이어지도록
+마지막 봉과 그 직전 봉의 avg_gain/avg_loss/종가를 보관합니다.
+직전 봉 상태를 함께 두는 이유는 같은 날짜의 종가 정정(장중 → 확정)도
+전체 재계산 없이 O(1)로 다시 반영하기 위해서입니다.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+CREATE_RSI_STATE_TABLE = """
+CREATE TABLE IF NOT EXISTS rsi_state (
+    symbol TEXT NOT NULL,
+    period INTEGER NOT NULL,
+    bar_date TEXT NOT NULL,
+    close REAL NOT NULL,
+    avg_gain REAL NOT NULL,
+    avg_loss REAL NOT NULL,
+    prev_bar_date TEXT,
+    prev_close REAL,
+    prev_avg_gain REAL,
+    prev_avg_loss REAL,
+    PRIMARY KEY (symbol, period)
+)
+"""
+
+STATE_FIELDS = (
+    'symbol', 'period', 'bar_date', 'close', 'avg_gain', 'avg_loss',
+    'prev_bar_date', 'prev_close', 'prev_avg_gain', 'prev_avg_loss',
+)
+
+
+class RSIStateStore:
+    """심볼별 Wilder 평활 상태 저장소"""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(CREATE_RSI_STATE_TABLE)
+
+    @contextmanager
+    def _connect(self):
+        """커밋 후 닫히는 SQLite 연결"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, symbol, period):
+        """저장된 상태 조회
+
+        Returns:
+            dict | None: STATE_FIELDS 키를 가진 상태
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(STATE_FIELDS)} FROM rsi_state WHERE symbol = ? AND period = ?",
+                (symbol, period),
+            ).fetchone()
+        return dict(zip(STATE_FIELDS, row)) if row else None
+
+    def save(self, state):
+        """상태 저장 (symbol, period 기준 덮어쓰기)"""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"""
+                INSERT OR REPLACE INTO rsi_state ({', '.join(STATE_FIELDS)})
+                VALUES ({', '.join('?' * len(STATE_FIELDS))})
+                """,
+                tuple(state.get(field) for field in STATE_FIELDS),
+            )
+
+    def delete(self, symbol, period=None):
+        """상태 삭제 (period 미지정 시 해당 심볼 전체)"""
+        with self._lock, self._connect() as conn:
+            if period is None:
+                conn.execute("DELETE FROM rsi_state WHERE symbol = ?", (symbol,))
+            else:
+                conn.execute("DELETE FROM rsi_state WHERE symbol = ? AND period = ?", (symbol, period))
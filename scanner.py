@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""유니버스 스캔 (수천 개 심볼 과매도/과매수 탐색)
+
+심볼을 묶음(chunk) 단위로 나눠 프로세스 풀에 분배하고,
+각 워커가 묶음을 한 번에 수집한 뒤 RSI 엔진으로 일괄 계산합니다.
+결과는 묶음이 끝나는 대로 콜백으로 전달(스트리밍)되고, 마지막에 순위를 매깁니다.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from utils.logger_util import LoggerUtil
+from utils.metrics_util import MetricsUtil
+
+load_dotenv()
+
+# 워커 프로세스별로 한 번만 생성해 재사용
+_worker_calculator = None
+
+
+def load_universe(path):
+    """유니버스 파일에서 심볼 목록 읽기
+
+    한 줄에 심볼 하나(또는 CSV의 첫 컬럼), '#'으로 시작하는 줄과 'symbol' 헤더는 무시합니다.
+    """
+    symbols = []
+    for line in Path(path).read_text(encoding='utf-8').splitlines():
+        symbol = line.split('#', 1)[0].split(',', 1)[0].strip().upper()
+        if symbol and symbol not in ('SYMBOL', 'TICKER'):
+            symbols.append(symbol)
+    return list(dict.fromkeys(symbols))
+
+
+def _init_worker():
+    global _worker_calculator
+    from rsi_calculator import RSICalculator
+
+    _worker_calculator = RSICalculator()
+    # fork로 물려받은 부모 프로세스의 수집값은 부모에 이미 있으므로 비우고 시작
+    MetricsUtil().reset()
+
+
+def _scan_chunk(symbols, days):
+    """워커: 심볼 묶음을 처리하고 (결과, 워커 실행 지표) 반환
+
+    워커 프로세스의 MetricsUtil은 부모와 별개이므로 묶음마다 수집값을 drain()해 결과와 함께 돌려주고,
+    부모가 merge()로 합산합니다 (실패한 묶음의 수집값은 같은 워커의 다음 묶음과 함께 전달).
+    """
+    metrics = MetricsUtil()
+    with metrics.timer('scan_chunk'):
+        results = _scan_symbols(symbols, days)
+    return results, metrics.drain()
+
+
+def _scan_symbols(symbols, days):
+    """심볼 묶음을 한 번에 수집하고 RSI 엔진으로 일괄 계산
+
+    묶음의 마지막 날짜까지 종가가 없는 심볼(거래 정지/상장 폐지 등)은 과거 RSI를 현재 값처럼
+    보고하지 않도록 제외합니다.
+    """
+    calculator = _worker_calculator
+    if calculator.provider.name == 'memmap':
+        # 저장소 행렬 구간을 그대로 계산 (마지막 날짜에 종가가 없는 심볼은 latest_store_rsi에서 제외)
+        trade_date, latest = calculator.latest_store_rsi(symbols, days=days)
+        return [_scan_result(calculator, symbol, rsi_value, close, trade_date) for symbol, (rsi_value, close) in latest.items()]
+
+    price_data = calculator.get_stock_data_bulk(symbols, days=days)
+    closes = {symbol: frame['Close'].dropna() for symbol, frame in price_data.items()}
+    closes = {symbol: series for symbol, series in closes.items() if not series.empty}
+    if not closes:
+        return []
+
+    last_date = max(series.index[-1] for series in closes.values())
+    stale = [symbol for symbol, series in closes.items() if series.index[-1] < last_date]
+    if stale:
+        calculator.logger.warning(f"{last_date:%Y-%m-%d} 종가가 없어 제외한 심볼 {len(stale)}개: {stale[:10]}")
+        closes = {symbol: series for symbol, series in closes.items() if symbol not in stale}
+
+    rsi_values = calculator.latest_rsi_values({symbol: series.to_frame('Close') for symbol, series in closes.items()})
+
+    return [
+        _scan_result(calculator, symbol, rsi_values[symbol], series.iloc[-1], last_date)
+        for symbol, series in closes.items()
+        if symbol in rsi_values
+    ]
+
+
+def _scan_result(calculator, symbol, rsi_value, close, trade_date):
+    return {
+        'symbol': symbol,
+        'rsi_value': round(rsi_value, 2),
+        'current_price': round(float(close), 2),
+        'status': calculator.classify_rsi(rsi_value),
+        'trade_date': trade_date.strftime('%Y-%m-%d'),
+    }
+
+
+class UniverseScanner:
+    """프로세스 풀 기반 유니버스 RSI 스캐너"""
+
+    def __init__(self, max_workers=None, chunk_size=None, days=None):
+        self.logger = LoggerUtil().get_logger()
+        self.max_workers = max_workers or int(os.getenv('SCAN_MAX_WORKERS') or os.cpu_count() or 1)
+        self.chunk_size = chunk_size or int(os.getenv('SCAN_CHUNK_SIZE', 50))
+        self.days = days or int(os.getenv('SCAN_HISTORY_DAYS', 90))
+
+    def scan(self, symbols, on_result=None):
+        """
+        유니버스 스캔 실행
+
+        Args:
+            symbols: 심볼 리스트
+            on_result: 결과 1건마다 호출되는 콜백 (묶음이 끝나는 즉시 호출)
+                지금까지 받은 가장 최신 날짜보다 오래된 결과는 전달하지 않지만, 이후 묶음에서 더 최신 날짜가
+                나오면 앞서 전달한 결과도 최종 반환값에서는 제외될 수 있음 (스트리밍 결과는 잠정값)
+
+        Returns:
+            list: 전체 RSI 결과 (symbol, rsi_value, current_price, status, trade_date)
+        """
+        chunks = [symbols[i:i + self.chunk_size] for i in range(0, len(symbols), self.chunk_size)]
+        started_at = time.monotonic()
+        results = []
+        failed_chunks = 0
+        last_date = None
+
+        self.logger.info(f"유니버스 스캔 시작: {len(symbols)}개 심볼, {len(chunks)}개 묶음, 워커 {self.max_workers}개")
+
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker) as executor:
+            futures = {executor.submit(_scan_chunk, chunk, self.days): chunk for chunk in chunks}
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                chunk = futures[future]
+                try:
+                    chunk_results, chunk_metrics = future.result()
+                except Exception as e:
+                    failed_chunks += 1
+                    self.logger.error(f"스캔 묶음 처리 실패 ({chunk[0]} 외 {len(chunk) - 1}개): {str(e)}")
+                    continue
+
+                MetricsUtil().merge(chunk_metrics)
+                results.extend(chunk_results)
+                if chunk_results:
+                    last_date = max(last_date or '', *(result['trade_date'] for result in chunk_results))
+                if on_result:
+                    # 지금까지의 최신 날짜보다 오래된 결과는 스트리밍하지 않음
+                    for result in chunk_results:
+                        if result['trade_date'] == last_date:
+                            on_result(result)
+
+                self.logger.info(f"스캔 진행: {done}/{len(chunks)} 묶음, 누적 {len(results)}개 심볼 ({time.monotonic() - started_at:.1f}초)")
+
+        # 묶음 전체가 오래된 심볼로만 이뤄진 경우까지 전체 최신 날짜 기준으로 한 번 더 제외
+        if results:
+            stale = [result['symbol'] for result in results if result['trade_date'] < last_date]
+            if stale:
+                self.logger.warning(f"{last_date} 종가가 없어 제외한 심볼 {len(stale)}개: {stale[:10]}")
+                results = [result for result in results if result['trade_date'] == last_date]
+
+        self.logger.info(f"유니버스 스캔 완료: {len(results)}/{len(symbols)}개 심볼, 실패 묶음 {failed_chunks}개, {time.monotonic() - started_at:.1f}초")
+        return results
+
+    @staticmethod
+    def rank(results, top_n=20):
+        """
+        과매도(RSI 오름차순)/과매수(RSI 내림차순) 순위
+
+        Returns:
+            dict: { oversold: [...], overbought: [...], oversold_count, overbought_count }
+        """
+        oversold = sorted((r for r in results if r['status'] == "과매도"), key=lambda r: r['rsi_value'])
+        overbought = sorted((r for r in results if r['status'] == "과매수"), key=lambda r: r['rsi_value'], reverse=True)
+        return {
+            'oversold': oversold[:top_n],
+            'overbought': overbought[:top_n],
+            'oversold_count': len(oversold),
+            'overbought_count': len(overbought),
+        }
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""RSI 기간/임계값 파라미터 스윕 (병렬)
+
+기간 × (과매도, 과매수) 임계값 격자를 유니버스 전체에 백테스트하고 순위표를 만듭니다.
+
+중간값 재사용:
+- 상승분/하락분(aligned_gains_losses)과 봉별 수익률은 워커마다 한 번만 계산
+- RSI 행렬은 기간마다 한 번 계산하고 해당 기간의 모든 임계값 조합에 재사용
+
+사용법:
+    python sweep.py --universe universe.txt --years 20 --periods 7-28 --oversold 20:40:5 --overbought 60:80:5
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from backtest import bar_returns, history_start, load_closes, simulate
+from rsi_engine import aligned_gains_losses, as_price_matrix, wilder_rsi_from_deltas
+
+load_dotenv()
+
+RANK_COLUMNS = ['mean_cagr', 'median_cagr', 'mean_total_return', 'mean_max_drawdown', 'hit_rate', 'trades', 'exposure']
+
+# 워커 프로세스별 공유 중간값
+_worker_state = {}
+
+
+def parse_range(text, cast=float):
+    """'20:40:5'(시작:끝:간격, 끝 포함), '7-28'(정수 구간), '10,14,21'(목록) 형식 파싱"""
+    if ',' in text:
+        return [cast(value) for value in text.split(',') if value.strip()]
+    if ':' in text:
+        start, stop, step = (float(value) for value in text.split(':'))
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        return [cast(round(start + step * i, 6)) for i in range(count)]
+    if '-' in text.strip('-'):
+        start, stop = (int(value) for value in text.split('-'))
+        return [cast(value) for value in range(start, stop + 1)]
+    return [cast(text)]
+
+
+def build_grid(periods, oversold_values, overbought_values):
+    """{ 기간: [(과매도, 과매수), ...] } 격자 (과매도 < 과매수 조합만)"""
+    pairs = [(low, high) for low in oversold_values for high in overbought_values if low < high]
+    return {period: pairs for period in periods}
+
+
+def _init_worker(closes, cost_bps, store_args=None):
+    """워커 초기화: 종가 행렬로 상승분/하락분, 수익률을 한 번만 계산
+
+    store_args(저장소 디렉토리, 심볼, 시작일)가 있으면 종가를 전달받지 않고 memmap 저장소를 직접 열어
+    모든 워커가 같은 페이지 캐시를 공유합니다.
+    """
+    if store_args is not None:
+        from price_store import ColumnarPriceStore
+
+        directory, symbols, start = store_args
+        closes = ColumnarPriceStore(directory).slice('Close', symbols, start)
+    gain, loss, lead = aligned_gains_losses(closes)
+    _worker_state.update({
+        'closes': closes,
+        'gain': gain,
+        'loss': loss,
+        'lead': lead,
+        'returns': bar_returns(closes),
+        'cost_bps': cost_bps,
+        'period': None,
+        'rsi': None,
+    })
+
+
+def _summarize(metrics):
+    """심볼별 지표를 격자점 1개의 요약 행으로 집계"""
+    closed = metrics['closed_trades']
+    wins = np.nansum(metrics['hit_rate'] * closed)
+    return {
+        'mean_cagr': float(np.nanmean(metrics['cagr'])),
+        'median_cagr': float(np.nanmedian(metrics['cagr'])),
+        'mean_total_return': float(np.nanmean(metrics['total_return'])),
+        'mean_max_drawdown': float(np.nanmean(metrics['max_drawdown'])),
+        'hit_rate': float(wins / closed.sum()) if closed.sum() else float('nan'),
+        'trades': int(metrics['trades'].sum()),
+        'exposure': float(np.nanmean(metrics['exposure'])),
+    }
+
+
+def _evaluate(period, pairs):
+    """워커: 기간 1개의 RSI를 (캐시에서) 가져와 임계값 조합들을 평가"""
+    state = _worker_state
+    if state['period'] != period:
+        state['rsi'] = wilder_rsi_from_deltas(state['gain'], state['loss'], state['lead'], period)
+        state['period'] = period
+
+    rows = []
+    for oversold, overbought in pairs:
+        metrics = simulate(
+            state['closes'], state['rsi'], oversold, overbought,
+            cost_bps=state['cost_bps'], returns=state['returns'],
+        )
+        rows.append({'period': period, 'oversold': oversold, 'overbought': overbought, **_summarize(metrics)})
+    return rows
+
+
+def run_sweep(closes, grid, max_workers=None, cost_bps=0.0, rank_by='mean_cagr', store_args=None):
+    """파라미터 스윕 실행
+
+    기간별 임계값 조합을 묶음으로 나눠 프로세스 풀에 분배합니다.
+    같은 기간의 묶음은 연속으로 제출하므로 워커의 RSI 캐시가 대부분 재사용됩니다.
+
+    Args:
+        closes: DataFrame(날짜 × 심볼) 또는 (심볼 × 봉) 종가 배열
+        grid: build_grid 결과
+        max_workers: 워커 수 (기본값: SWEEP_MAX_WORKERS 또는 CPU 코어 수)
+        cost_bps: 매수/매도 1회당 거래 비용 (bp)
+        rank_by: 정렬 기준 컬럼 (RANK_COLUMNS, mean_max_drawdown은 낙폭이 작은 순)
+        store_args: (저장소 디렉토리, 심볼, 시작일) - 지정하면 워커가 memmap 저장소에서 종가를 직접 읽음 (closes 무시)
+
+    Returns:
+        pandas.DataFrame: 격자점별 요약 지표 (rank_by 기준 내림차순, rank 컬럼 포함)
+    """
+    if store_args is not None:
+        closes = None
+    else:
+        if isinstance(closes, pd.DataFrame):
+            closes = closes.to_numpy(dtype=np.float64).T
+        closes = np.ascontiguousarray(as_price_matrix(closes))
+    max_workers = max_workers or int(os.getenv('SWEEP_MAX_WORKERS') or os.cpu_count() or 1)
+
+    n_periods = max(len(grid), 1)
+    chunks_per_period = max(1, math.ceil(max_workers / n_periods))
+    tasks = []
+    for period, pairs in grid.items():
+        size = max(1, math.ceil(len(pairs) / chunks_per_period))
+        tasks += [(period, pairs[i:i + size]) for i in range(0, len(pairs), size)]
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(closes, cost_bps, store_args)) as executor:
+        futures = [executor.submit(_evaluate, period, pairs) for period, pairs in tasks]
+        for future in as_completed(futures):
+            rows.extend(future.result())
+
+    table = pd.DataFrame(rows, columns=['period', 'oversold', 'overbought', *RANK_COLUMNS])
+    table = table.sort_values(rank_by, ascending=False, na_position='last').reset_index(drop=True)
+    table.index = pd.RangeIndex(1, len(table) + 1, name='rank')
+    return table
+
+
+def format_sweep_report(table, top_n, rank_by, elapsed, n_symbols, n_bars):
+    """상위 top_n 격자점 표"""
+    shown = table.head(top_n).copy()
+    for column in ('mean_cagr', 'median_cagr', 'mean_total_return', 'mean_max_drawdown', 'hit_rate', 'exposure'):
+        shown[column] = (shown[column] * 100).round(2)
+    return "\n".join([
+        f"RSI 파라미터 스윕: {len(table)}개 조합 × {n_symbols}개 심볼 × {n_bars}개 봉 ({elapsed:.1f}초, 정렬: {rank_by})",
+        "",
+        shown.to_string(),
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSI 기간/임계값 파라미터 스윕")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--symbols', nargs='+', default=['SPY', 'QQQ', 'DIA'], help="대상 심볼")
+    group.add_argument('--universe', help="유니버스 파일 (한 줄에 심볼 하나)")
+    parser.add_argument('--years', type=float, default=20, help="백테스트 기간(년)")
+    parser.add_argument('--periods', default='7-28', help="RSI 기간 (예: 7-28, 9,14,21)")
+    parser.add_argument('--oversold', default='20:40:5', help="과매도 임계값 (예: 20:40:5)")
+    parser.add_argument('--overbought', default='60:80:5', help="과매수 임계값 (예: 60:80:5)")
+    parser.add_argument('--cost-bps', type=float, default=0.0, help="매수/매도 1회당 거래 비용 (bp)")
+    parser.add_argument('--rank-by', default='mean_cagr', choices=RANK_COLUMNS, help="정렬 기준")
+    parser.add_argument('--top', type=int, default=20, help="출력할 상위 조합 수")
+    parser.add_argument('--workers', type=int, default=None, help="워커 수 (기본값: SWEEP_MAX_WORKERS 또는 CPU 코어 수)")
+    parser.add_argument('--store', help="memmap 컬럼형 저장소 디렉토리 (price_store.py build로 생성)")
+    parser.add_argument('--output', help="전체 순위표 저장 경로 (.csv)")
+    args = parser.parse_args(argv)
+
+    if args.universe:
+        from scanner import load_universe
+
+        symbols = load_universe(args.universe)
+    else:
+        symbols = [symbol.upper() for symbol in args.symbols]
+
+    closes = load_closes(symbols, args.years, store_dir=args.store)
+    if closes.empty:
+        print("가격 데이터를 가져올 수 없습니다.", file=sys.stderr)
+        return 1
+
+    grid = build_grid(parse_range(args.periods, int), parse_range(args.oversold), parse_range(args.overbought))
+    started_at = time.perf_counter()
+    store_args = (args.store, list(closes.columns), history_start(args.years)) if args.store else None
+    table = run_sweep(
+        closes, grid, max_workers=args.workers, cost_bps=args.cost_bps, rank_by=args.rank_by, store_args=store_args,
+    )
+    elapsed = time.perf_counter() - started_at
+
+    print(format_sweep_report(table, args.top, args.rank_by, elapsed, closes.shape[1], closes.shape[0]))
+    if args.output:
+        table.to_csv(args.output)
+        print(f"결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""utils.db_manager 일괄 업데이트/연결 풀 테스트 (SQLite 메모리 DB 사용)"""
+import sqlite3
+
+import pytest
+
+from utils.db_manager import DBConnectionPool, bulk_update_portfolio_details, create_tables_if_not_exists
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    create_tables_if_not_exists(conn)
+    conn.execute(
+        "INSERT INTO investor_portfolio (idx, investor_code, investor_name, portfolio_date) VALUES (1, 'AKO', 'AKO Capital', '2025-03-31')"
+    )
+    conn.executemany(
+        "INSERT INTO investor_portfolio_detail (p_idx, ticker, stk_name, current_price) VALUES (?, ?, ?, ?)",
+        [(1, 'AAPL', 'Apple Inc.', 100.0), (1, 'MSFT', 'Microsoft Corp.', 200.0)],
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _detail(conn, ticker):
+    return conn.execute(
+        "SELECT current_price, reported_price_rate, low_52_week, high_52_week FROM investor_portfolio_detail WHERE ticker = ?",
+        (ticker,),
+    ).fetchone()
+
+
+def test_bulk_update_sets_each_row_from_case_expression(conn):
+    updated = bulk_update_portfolio_details(conn, [
+        {'p_idx': 1, 'ticker': 'AAPL', 'current_price': 110.0, 'reported_price_rate': 10.0, 'low_52_week': 90.0, 'high_52_week': 120.0},
+        {'p_idx': 1, 'ticker': 'MSFT', 'current_price': 190.0, 'reported_price_rate': -5.0, 'low_52_week': 150.0, 'high_52_week': float('nan')},
+    ], batch_size=1)
+
+    assert updated == 2
+    assert _detail(conn, 'AAPL') == (110.0, 10.0, 90.0, 120.0)
+    assert _detail(conn, 'MSFT') == (190.0, -5.0, 150.0, None)
+
+
+def test_bulk_update_skips_invalid_rows(conn):
+    updated = bulk_update_portfolio_details(conn, [
+        {'p_idx': 1, 'ticker': 'AAPL', 'current_price': 'N/A'},
+        {'p_idx': 'x', 'ticker': 'MSFT', 'current_price': 1.0},
+        {'p_idx': 1, 'ticker': ' ', 'current_price': 1.0},
+        {'ticker': 'MSFT', 'current_price': 1.0},
+        {'p_idx': 1, 'ticker': 'MSFT', 'current_price': 210.0},
+    ])
+
+    assert updated == 1
+    assert _detail(conn, 'AAPL')[0] == 100.0
+    assert _detail(conn, 'MSFT')[0] == 210.0
+
+
+class _BrokenConnection:
+    def __init__(self):
+        self.closed = False
+
+    def rollback(self):
+        raise sqlite3.OperationalError("connection lost")
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_rolls_back_and_reuses_connection_on_error():
+    pool = DBConnectionPool(factory=lambda: sqlite3.connect(":memory:"), max_size=1)
+
+    with pytest.raises(ValueError):
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (v INTEGER)")
+            raise ValueError("boom")
+
+    with pool.connection() as reused:
+        assert reused is conn
+    pool.close_all()
+
+
+def test_pool_discards_connection_when_rollback_fails():
+    broken = _BrokenConnection()
+    pool = DBConnectionPool(factory=lambda: broken, max_size=1)
+
+    with pytest.raises(ValueError, match="boom"):
+        with pool.connection():
+            raise ValueError("boom")
+
+    assert broken.closed
+    assert pool._created == 0
+    assert pool._idle.empty()
@@ -1,5 +1,10 @@
 import pymysql
 import os
+import queue
+import re
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
 from dotenv import load_dotenv
 from utils.logger_util import LoggerUtil
 
@@ -14,6 +19,8 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 DB_PORT = int(os.getenv("DB_PORT", 3306))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_BULK_BATCH_SIZE = int(os.getenv("DB_BULK_BATCH_SIZE", 500))
 
 def get_db_connection():
     """DB 연결을 생성하고 반환합니다."""
@@ -33,6 +40,144 @@ def get_db_connection():
         logger.error(f"DB 연결 오류: {e}")
         return None
 
+class DBConnectionPool:
+    """DB 연결 풀
+
+    사용이 끝난 연결을 닫지 않고 보관했다가 다음 요청에 재사용합니다.
+    최대 `max_size`개까지 연결을 만들고, 모두 사용 중이면 `timeout`초 동안 반환을 기다립니다.
+    """
+
+    def __init__(self, factory=None, max_size=DB_POOL_SIZE, timeout=30):
+        self.factory = factory or get_db_connection
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """풀에서 연결을 꺼내거나 새로 생성"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._created < self.max_size:
+                    self._created += 1
+                    create = True
+                else:
+                    create = False
+            if create:
+                conn = self.factory()
+                if conn is None:
+                    with self._lock:
+                        self._created -= 1
+                    raise pymysql.MySQLError("DB 연결을 생성할 수 없습니다.")
+                return conn
+            try:
+                conn = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise pymysql.MySQLError(f"DB 연결 풀 대기 시간({self.timeout}초) 초과")
+
+        # 유휴 중 끊긴 MySQL 연결은 재연결
+        if hasattr(conn, 'ping'):
+            conn.ping(reconnect=True)
+        return conn
+
+    def release(self, conn):
+        """연결을 풀에 반환"""
+        self._idle.put(conn)
+
+    def discard(self, conn):
+        """손상된 연결을 닫고 풀에서 제외"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    @contextmanager
+    def connection(self):
+        """with 블록 동안 연결을 빌려 쓰고 반환 (예외 시 롤백, 커밋은 호출자가 관리)"""
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception as rollback_error:
+                # 롤백 실패는 기록만 하고 원래 예외를 전달
+                logger.error(f"DB 롤백 실패 → 연결 폐기: {rollback_error}")
+                self.discard(conn)
+            else:
+                self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def close_all(self):
+        """보관 중인 유휴 연결을 모두 닫기"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(conn)
+
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+def get_db_pool():
+    """프로세스 공용 DB 연결 풀 반환 (최초 호출 시 생성)"""
+    global _db_pool
+    with _db_pool_lock:
+        if _db_pool is None:
+            _db_pool = DBConnectionPool()
+        return _db_pool
+
+def pooled_connection():
+    """공용 풀에서 연결을 빌리는 컨텍스트 매니저
+
+    사용 예:
+        with pooled_connection() as conn:
+            update_portfolio_details(conn, p_idx, details)
+            conn.commit()
+    """
+    return get_db_pool().connection()
+
+def _placeholder(conn):
+    """DB 드라이버별 파라미터 표기 (pymysql: %s, sqlite3: ?)"""
+    return '?' if isinstance(conn, sqlite3.Connection) else '%s'
+
+def _cursor(conn):
+    """드라이버에 관계없이 with 블록 종료 시 닫히는 커서"""
+    return closing(conn.cursor())
+
+_SECONDARY_KEY = re.compile(r"^\s*KEY (\w+) \(([^)]*)\),?\s*$", re.MULTILINE)
+
+def _ddl_statements(conn, ddl):
+    """테이블 DDL을 DB 드라이버에 맞는 문장 목록으로 변환
+
+    MySQL은 그대로 사용하고, SQLite(테스트/로컬 실행)에서는 COMMENT/ON UPDATE CURRENT_TIMESTAMP 절을 빼고
+    AUTO_INCREMENT PK는 INTEGER PRIMARY KEY AUTOINCREMENT, UNIQUE KEY는 UNIQUE 제약,
+    보조 KEY는 별도 CREATE INDEX 문으로 바꿉니다 (record_updated_at은 SQL에서 직접 갱신).
+    """
+    if not isinstance(conn, sqlite3.Connection):
+        return [ddl]
+
+    table = re.search(r"CREATE TABLE IF NOT EXISTS (\w+)", ddl).group(1)
+    indexes = [
+        f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+        for name, columns in _SECONDARY_KEY.findall(ddl)
+    ]
+    ddl = _SECONDARY_KEY.sub("", ddl)
+    ddl = re.sub(r"\s*COMMENT\s*=?\s*'[^']*'", "", ddl)
+    ddl = ddl.replace(" ON UPDATE CURRENT_TIMESTAMP", "")
+    ddl = ddl.replace("INT AUTO_INCREMENT PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT")
+    ddl = re.sub(r"UNIQUE KEY \w+ \(", "UNIQUE (", ddl)
+    ddl = re.sub(r",\s*\n\)", "\n)", ddl)
+    return [ddl] + indexes
+
 CREATE_INVESTOR_PORTFOLIO_TABLE = """
 CREATE TABLE IF NOT EXISTS investor_portfolio (
     idx INT AUTO_INCREMENT PRIMARY KEY COMMENT '포트폴리오 메타 고유 ID (PK)',
@@ -73,8 +218,61 @@ CREATE TABLE IF NOT EXISTS investor_portfolio_detail (
 ) COMMENT = '포트폴리오 상세 종목 정보 테이블';
 """
 
+CREATE_MARKET_RSI_HISTORY_TABLE = """
+CREATE TABLE IF NOT EXISTS market_rsi_history (
+    symbol VARCHAR(20) NOT NULL COMMENT '종목 심볼 (예: SPY)',
+    trade_date DATE NOT NULL COMMENT '기준 날짜',
+    rsi_value DECIMAL(6,2) COMMENT 'RSI 값',
+    close_price DECIMAL(16,4) COMMENT '종가',
+    status VARCHAR(20) COMMENT 'RSI 상태 (과매도/정상/과매수)',
+    record_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '레코드 생성 시각',
+    record_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '레코드 최종 수정 시각',
+    PRIMARY KEY (symbol, trade_date),
+    KEY idx_rsi_trade_date (trade_date)
+) COMMENT = '심볼별 일간 RSI 이력 테이블';
+"""
+
+CREATE_MARKET_VIX_HISTORY_TABLE = """
+CREATE TABLE IF NOT EXISTS market_vix_history (
+    symbol VARCHAR(20) NOT NULL COMMENT '지수 심볼 (예: ^VIX)',
+    trade_date DATE NOT NULL COMMENT '기준 날짜',
+    close_value DECIMAL(10,2) COMMENT 'VIX 종가',
+    status VARCHAR(20) COMMENT 'VIX 상태 (매우 안정/안정/경계/불안/위기)',
+    record_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '레코드 생성 시각',
+    record_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '레코드 최종 수정 시각',
+    PRIMARY KEY (symbol, trade_date),
+    KEY idx_vix_trade_date (trade_date)
+) COMMENT = 'VIX 일간 이력 테이블';
+"""
+
+CREATE_MARKET_FGI_HISTORY_TABLE = """
+CREATE TABLE IF NOT EXISTS market_fgi_history (
+    symbol VARCHAR(20) NOT NULL COMMENT '지수 코드 (예: CNN_FGI)',
+    trade_date DATE NOT NULL COMMENT '기준 날짜',
+    fgi_value INT COMMENT 'Fear & Greed Index 값 (0~100)',
+    status_kr VARCHAR(20) COMMENT '상태 (한글)',
+    status_en VARCHAR(20) COMMENT '상태 (영문)',
+    record_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '레코드 생성 시각',
+    record_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '레코드 최종 수정 시각',
+    PRIMARY KEY (symbol, trade_date),
+    KEY idx_fgi_trade_date (trade_date)
+) COMMENT = 'Fear & Greed Index 일간 이력 테이블';
+"""
+
+FGI_SYMBOL = "CNN_FGI"
+
 def create_tables_if_not_exists(conn):
     """필요한 테이블이 없으면 생성합니다."""
+    if isinstance(conn, sqlite3.Connection):
+        # SQLite는 새로 만든 테이블에 record_updated_at이 이미 있으므로 컬럼 추가 단계 생략
+        with _cursor(conn) as cursor:
+            for ddl in (CREATE_INVESTOR_PORTFOLIO_TABLE, CREATE_INVESTOR_PORTFOLIO_DETAIL_TABLE):
+                for statement in _ddl_statements(conn, ddl):
+                    cursor.execute(statement)
+        conn.commit()
+        logger.info("'investor_portfolio', 'investor_portfolio_detail' 테이블이 준비되었습니다.")
+        return
+
     with conn.cursor() as cursor:
         try:
             cursor.execute(CREATE_INVESTOR_PORTFOLIO_TABLE)
@@ -149,92 +347,154 @@ def update_portfolio_details(conn, p_idx, details):
         logger.info(f"No details to update for p_idx: {p_idx}")
         return
 
-    with conn.cursor() as cursor:
-        updated_count = 0
-        
-        for detail in details:
-            try:
-                ticker = detail.get('ticker')
-                if not ticker:
-                    continue
-                    
-                # 해당 ticker의 현재 가격 정보 업데이트
-                update_sql = """
-                UPDATE investor_portfolio_detail 
-                SET current_price = %s, 
-                    reported_price_rate = %s, 
-                    low_52_week = %s, 
-                    high_52_week = %s,
-                    record_updated_at = CURRENT_TIMESTAMP
-                WHERE p_idx = %s AND ticker = %s
-                """
-                
-                cursor.execute(update_sql, (
-                    detail.get('current_price'),
-                    detail.get('reported_price_rate'),
-                    detail.get('low_52_week'),
-                    detail.get('high_52_week'),
-                    p_idx,
-                    ticker
-                ))
-                
-                if cursor.rowcount > 0:
-                    updated_count += 1
-                    
-            except Exception as e:
-                logger.error(f"포트폴리오 상세 정보 업데이트 오류 (p_idx: {p_idx}, ticker: {ticker}): {e}")
-                continue
-        
-        logger.info(f"{updated_count}개의 포트폴리오 상세 정보가 업데이트되었습니다 (p_idx: {p_idx}).")
+    updated_count = bulk_update_portfolio_details(conn, [dict(detail, p_idx=p_idx) for detail in details])
+    logger.info(f"{updated_count}개의 포트폴리오 상세 정보가 업데이트되었습니다 (p_idx: {p_idx}).")
 
-def calculate_and_update_portfolio_avg_return(conn, p_idx):
-    """포트폴리오의 평균 수익률을 재계산하고 업데이트합니다."""
-    with conn.cursor() as cursor:
+def _optional_float(value):
+    """숫자 컬럼 값 변환 (None/NaN은 NULL, 숫자로 바꿀 수 없으면 ValueError/TypeError)"""
+    if value is None:
+        return None
+    value = float(value)
+    return None if value != value else value
+
+def bulk_update_portfolio_details(conn, details, batch_size=DB_BULK_BATCH_SIZE):
+    """여러 포트폴리오의 상세 가격 정보를 일괄 업데이트합니다.
+
+    (p_idx, ticker)마다 UPDATE를 실행하는 대신, batch_size개씩 CASE 식을 사용한
+    UPDATE 한 번으로 처리하므로 수천 건도 몇 번의 왕복으로 끝납니다.
+    상세 테이블에는 (p_idx, ticker) 유니크 키가 없어 ON DUPLICATE KEY UPDATE 대신 이 방식을 사용합니다.
+
+    Args:
+        conn: DB 연결 (pymysql 또는 sqlite3)
+        details: p_idx, ticker, current_price, reported_price_rate, low_52_week, high_52_week 키를 가진 dict 리스트
+        batch_size: UPDATE 1회당 행 수
+
+    Returns:
+        int: 업데이트된 행 수
+    """
+    columns = ('current_price', 'reported_price_rate', 'low_52_week', 'high_52_week')
+
+    # 잘못된 행 하나가 배치 전체를 실패시키지 않도록 UPDATE 구성 전에 검증해 건너뜀
+    # 같은 (p_idx, ticker)가 여러 번 있으면 마지막 값 사용
+    rows = {}
+    skipped = 0
+    for detail in details:
         try:
-            # 해당 포트폴리오의 모든 상세 정보 조회
-            select_sql = """
-            SELECT portfolio_rate, reported_price_rate 
-            FROM investor_portfolio_detail 
-            WHERE p_idx = %s AND portfolio_rate > 0
-            """
-            cursor.execute(select_sql, (p_idx,))
-            details = cursor.fetchall()
-            
-            if not details:
-                logger.warning(f"포트폴리오 상세 정보가 없습니다 (p_idx: {p_idx})")
-                return
-            
-            # 가중 평균 수익률 계산
-            total_weighted_return = 0
-            total_weight = 0
-            
-            for detail in details:
-                portfolio_rate = float(detail['portfolio_rate'])
-                reported_price_rate = float(detail['reported_price_rate'])
-                
-                total_weighted_return += portfolio_rate * reported_price_rate
-                total_weight += portfolio_rate
-            
-            avg_return = 0
-            if total_weight > 0:
-                avg_return = total_weighted_return / total_weight
-                logger.info(f"가중 평균 수익률 재계산: 총 가중 수익률({total_weighted_return:.4f}) ÷ 총 비중({total_weight:.2f}) = {avg_return:.4f}%")
-            
-            # 포트폴리오 메타 테이블 업데이트
-            update_sql = """
-            UPDATE investor_portfolio 
-            SET portfolio_avg_return = %s,
+            ticker = str(detail['ticker']).strip()
+            if not ticker:
+                raise ValueError("빈 ticker")
+            p_idx = int(detail['p_idx'])
+            values = {column: _optional_float(detail.get(column)) for column in columns}
+        except (KeyError, TypeError, ValueError) as e:
+            skipped += 1
+            logger.warning(f"포트폴리오 상세 정보 업데이트 제외 ({e}): {detail}")
+            continue
+        rows[(p_idx, ticker)] = values
+    rows = list(rows.items())
+    if skipped:
+        logger.warning(f"포트폴리오 상세 정보 일괄 업데이트: 잘못된 {skipped}건 제외, {len(rows)}건 처리")
+
+    p = _placeholder(conn)
+    updated_count = 0
+
+    with _cursor(conn) as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            when_clause = " ".join([f"WHEN p_idx = {p} AND ticker = {p} THEN {p}"] * len(batch))
+            set_clause = ",\n                ".join(f"{column} = CASE {when_clause} ELSE {column} END" for column in columns)
+            keys_clause = ", ".join([f"({p}, {p})"] * len(batch))
+
+            params = []
+            for column in columns:
+                for (p_idx, ticker), values in batch:
+                    params.extend((p_idx, ticker, values[column]))
+            for (p_idx, ticker), _ in batch:
+                params.extend((p_idx, ticker))
+
+            update_sql = f"""
+            UPDATE investor_portfolio_detail
+            SET {set_clause},
                 record_updated_at = CURRENT_TIMESTAMP
-            WHERE idx = %s
+            WHERE (p_idx, ticker) IN ({keys_clause})
             """
-            cursor.execute(update_sql, (avg_return, p_idx))
-            
-            logger.info(f"포트폴리오 평균 수익률이 {avg_return:.4f}%로 업데이트되었습니다 (p_idx: {p_idx}, 종목 수: {len(details)}).")
-            
+            try:
+                cursor.execute(update_sql, params)
+                updated_count += max(cursor.rowcount, 0)
+            except Exception as e:
+                logger.error(f"포트폴리오 상세 정보 일괄 업데이트 오류 ({len(batch)}건): {e}")
+                raise
+
+    return updated_count
+
+def recalculate_portfolio_avg_returns(conn, p_idxs=None):
+    """포트폴리오 평균 수익률을 SQL 집계 한 번으로 일괄 재계산합니다.
+
+    가중 평균 수익률 = SUM(비중 × 수익률) ÷ SUM(비중) (비중 > 0 인 종목만, 실수 나눗셈)
+    비중이 있는 종목이 하나도 없는 포트폴리오는 갱신하지 않고 경고만 남깁니다.
+
+    Args:
+        conn: DB 연결 (pymysql 또는 sqlite3)
+        p_idxs: 재계산할 포트폴리오 ID 리스트 (None이면 전체)
+
+    Returns:
+        int: 갱신된 포트폴리오 수
+    """
+    if p_idxs is not None:
+        p_idxs = list(dict.fromkeys(p_idxs))
+        if not p_idxs:
+            return 0
+
+    p = _placeholder(conn)
+    update_sql = """
+    UPDATE investor_portfolio
+    SET portfolio_avg_return = (
+            -- 정수 비중/수익률에서도 소수점이 버려지지 않도록 1.0을 곱해 실수 나눗셈
+            SELECT SUM(d.portfolio_rate * COALESCE(d.reported_price_rate, 0)) * 1.0 / NULLIF(SUM(d.portfolio_rate), 0)
+            FROM investor_portfolio_detail d
+            WHERE d.p_idx = investor_portfolio.idx AND d.portfolio_rate > 0
+        ),
+        record_updated_at = CURRENT_TIMESTAMP
+    WHERE EXISTS (
+        SELECT 1 FROM investor_portfolio_detail d WHERE d.p_idx = investor_portfolio.idx AND d.portfolio_rate > 0
+    )
+    """
+    skipped_sql = """
+    SELECT idx FROM investor_portfolio
+    WHERE NOT EXISTS (
+        SELECT 1 FROM investor_portfolio_detail d WHERE d.p_idx = investor_portfolio.idx AND d.portfolio_rate > 0
+    )
+    """
+    params = []
+    if p_idxs is not None:
+        update_sql += f"    AND idx IN ({', '.join([p] * len(p_idxs))})\n"
+        skipped_sql += f"    AND idx IN ({', '.join([p] * len(p_idxs))})\n"
+        params = p_idxs
+
+    with _cursor(conn) as cursor:
+        try:
+            cursor.execute(update_sql, params)
+            updated_count = max(cursor.rowcount, 0)
+            cursor.execute(skipped_sql, params)
+            skipped = [row['idx'] if isinstance(row, dict) else row[0] for row in cursor.fetchall()]
         except Exception as e:
-            logger.error(f"포트폴리오 평균 수익률 계산 오류 (p_idx: {p_idx}): {e}")
+            logger.error(f"포트폴리오 평균 수익률 일괄 재계산 오류 (대상: {'전체' if p_idxs is None else len(p_idxs)}): {e}")
             raise
 
+    if skipped:
+        logger.warning(f"비중이 있는 상세 정보가 없어 평균 수익률을 갱신하지 않은 포트폴리오 {len(skipped)}개 (p_idx: {skipped[:20]})")
+
+    logger.info(f"포트폴리오 평균 수익률 일괄 재계산 완료: {updated_count}개 포트폴리오 (대상: {'전체' if p_idxs is None else len(p_idxs)})")
+    return updated_count
+
+def calculate_and_update_portfolio_avg_return(conn, p_idx):
+    """포트폴리오의 평균 수익률을 재계산하고 업데이트합니다."""
+    try:
+        # 비중이 있는 상세 정보가 없으면 recalculate_portfolio_avg_returns가 경고 후 건너뜀
+        recalculate_portfolio_avg_returns(conn, [p_idx])
+    except Exception as e:
+        logger.error(f"포트폴리오 평균 수익률 계산 오류 (p_idx: {p_idx}): {e}")
+        raise
+
 def insert_portfolio_details(conn, p_idx, details):
     """investor_portfolio_detail 테이블에 여러 상세 데이터를 삽입합니다."""
     if not details: # 상세 정보가 없으면 아무것도 안함
@@ -250,23 +510,12 @@ def insert_portfolio_details(conn, p_idx, details):
         """
         values_to_insert = []
         
-        # 포트폴리오 평균 수익률 계산을 위한 변수
-        total_weighted_return = 0
-        total_weight = 0
-        valid_items_count = 0
-        
         for detail in details:
             try:
                 # 종목 비중과 수익률 추출
                 portfolio_rate = float(detail.get('portfolio_rate', 0))
                 reported_price_rate = float(detail.get('reported_price_rate', 0))
                 
-                # 가중 수익률 계산 (비중 * 수익률)
-                if portfolio_rate > 0:
-                    total_weighted_return += portfolio_rate * reported_price_rate
-                    total_weight += portfolio_rate
-                    valid_items_count += 1
-                
                 values_to_insert.append((
                     p_idx,
                     detail.get('ticker'),
@@ -294,28 +543,125 @@ def insert_portfolio_details(conn, p_idx, details):
         try:
             cursor.executemany(sql, values_to_insert)
             
-            # 포트폴리오 평균 수익률 계산 및 업데이트
-            avg_return = 0
-            if total_weight > 0:
-                # 가중 평균 수익률 계산: (비중1 × 수익률1 + 비중2 × 수익률2 + ...) ÷ 총 비중
-                avg_return = total_weighted_return / total_weight
-                logger.info(f"가중 평균 수익률 계산: 총 가중 수익률({total_weighted_return:.4f}) ÷ 총 비중({total_weight:.2f}) = {avg_return:.4f}%")
-            
-            # 포트폴리오 메타 테이블 업데이트
-            update_sql = """
-            UPDATE investor_portfolio 
-            SET portfolio_avg_return = %s,
-                record_updated_at = CURRENT_TIMESTAMP
-            WHERE idx = %s
-            """
-            cursor.execute(update_sql, (avg_return, p_idx))
+            # 포트폴리오 평균 수익률은 삽입된 상세 정보로 SQL에서 집계
+            recalculate_portfolio_avg_returns(conn, [p_idx])
             
             logger.info(f"{len(values_to_insert)}개의 포트폴리오 상세 정보가 성공적으로 준비되었습니다 (p_idx: {p_idx}).")
-            logger.info(f"포트폴리오 평균 수익률 {avg_return:.4f}%로 업데이트 되었습니다 (p_idx: {p_idx}, 유효 종목 수: {valid_items_count}).")
         except pymysql.MySQLError as e:
             logger.error(f"portfolio_details 삽입 오류 (p_idx: {p_idx}): {e}")
             raise
 
+def create_market_history_tables(conn):
+    """RSI/VIX/FGI 이력 테이블이 없으면 생성합니다."""
+    with _cursor(conn) as cursor:
+        try:
+            for table, ddl in (
+                ('market_rsi_history', CREATE_MARKET_RSI_HISTORY_TABLE),
+                ('market_vix_history', CREATE_MARKET_VIX_HISTORY_TABLE),
+                ('market_fgi_history', CREATE_MARKET_FGI_HISTORY_TABLE),
+            ):
+                for statement in _ddl_statements(conn, ddl):
+                    cursor.execute(statement)
+                logger.info(f"'{table}' 테이블이 준비되었습니다.")
+            conn.commit()
+        except (pymysql.MySQLError, sqlite3.Error) as e:
+            logger.error(f"이력 테이블 생성 오류: {e}")
+            conn.rollback()
+            raise
+
+def _upsert_many(conn, table, key_columns, columns, rows, batch_size=DB_BULK_BATCH_SIZE):
+    """여러 행을 일괄 upsert (MySQL: ON DUPLICATE KEY UPDATE, SQLite: ON CONFLICT)
+
+    pymysql의 executemany는 INSERT ... VALUES 문을 여러 행 INSERT 한 번으로 묶어 전송합니다.
+    """
+    if not rows:
+        return 0
+
+    p = _placeholder(conn)
+    all_columns = list(key_columns) + list(columns)
+    insert_sql = f"INSERT INTO {table} ({', '.join(all_columns)}) VALUES ({', '.join([p] * len(all_columns))})"
+    if isinstance(conn, sqlite3.Connection):
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns)
+        insert_sql += f" ON CONFLICT({', '.join(key_columns)}) DO UPDATE SET {updates}, record_updated_at = CURRENT_TIMESTAMP"
+    else:
+        updates = ", ".join(f"{column} = VALUES({column})" for column in columns)
+        insert_sql += f" ON DUPLICATE KEY UPDATE {updates}"
+
+    with _cursor(conn) as cursor:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(insert_sql, rows[start:start + batch_size])
+    return len(rows)
+
+def _trade_date(data):
+    """결과의 거래일 (마지막 봉 날짜, 없으면 timestamp의 날짜)"""
+    return data.get('trade_date') or data['timestamp'][:10]
+
+def save_market_snapshot(conn, rsi_results, vix_info=None, fgi_info=None):
+    """한 번의 실행 결과(RSI/VIX/FGI)를 이력 테이블에 일괄 저장합니다.
+
+    같은 (symbol, trade_date)가 이미 있으면 최신 값으로 덮어씁니다. 커밋은 호출자가 관리합니다.
+    trade_date는 실행 시각이 아닌 마지막 봉 날짜(trade_date)를 사용하므로 주말/휴장일 재실행이나
+    시간대가 다른 실행도 같은 거래일 행을 갱신합니다. (FGI는 CNN 업데이트 시각 기준)
+
+    Returns:
+        dict: 테이블별 저장 행 수
+    """
+    rsi_rows = [
+        (data['symbol'], _trade_date(data), data['rsi_value'], data.get('current_price'), data.get('status'))
+        for data in (rsi_results or [])
+    ]
+    saved = {
+        'market_rsi_history': _upsert_many(
+            conn, 'market_rsi_history', ('symbol', 'trade_date'), ('rsi_value', 'close_price', 'status'), rsi_rows
+        ),
+        'market_vix_history': 0,
+        'market_fgi_history': 0,
+    }
+
+    if vix_info:
+        saved['market_vix_history'] = _upsert_many(
+            conn, 'market_vix_history', ('symbol', 'trade_date'), ('close_value', 'status'),
+            [(vix_info['symbol'], _trade_date(vix_info), vix_info.get('close'), vix_info.get('status'))],
+        )
+    if fgi_info and fgi_info.get('value') is not None:
+        saved['market_fgi_history'] = _upsert_many(
+            conn, 'market_fgi_history', ('symbol', 'trade_date'), ('fgi_value', 'status_kr', 'status_en'),
+            [(FGI_SYMBOL, fgi_info['timestamp'][:10], fgi_info['value'], fgi_info.get('status_kr'), fgi_info.get('status_en'))],
+        )
+
+    logger.info(f"시장 지표 이력 저장 완료: {saved}")
+    return saved
+
+def _query_history(conn, table, symbol, start_date, end_date=None):
+    """(symbol, trade_date) 인덱스를 사용하는 기간 조회"""
+    p = _placeholder(conn)
+    sql = f"SELECT * FROM {table} WHERE symbol = {p} AND trade_date >= {p}"
+    params = [symbol, str(start_date)]
+    if end_date is not None:
+        sql += f" AND trade_date <= {p}"
+        params.append(str(end_date))
+    sql += " ORDER BY trade_date"
+
+    with _cursor(conn) as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        if rows and not isinstance(rows[0], dict):
+            names = [column[0] for column in cursor.description]
+            rows = [dict(zip(names, row)) for row in rows]
+    return list(rows)
+
+def get_rsi_history(conn, symbol, start_date, end_date=None):
+    """심볼의 RSI 이력 조회 (trade_date 오름차순)"""
+    return _query_history(conn, 'market_rsi_history', symbol, start_date, end_date)
+
+def get_vix_history(conn, start_date, end_date=None, symbol="^VIX"):
+    """VIX 이력 조회 (trade_date 오름차순)"""
+    return _query_history(conn, 'market_vix_history', symbol, start_date, end_date)
+
+def get_fgi_history(conn, start_date, end_date=None):
+    """Fear & Greed Index 이력 조회 (trade_date 오름차순)"""
+    return _query_history(conn, 'market_fgi_history', FGI_SYMBOL, start_date, end_date)
+
 # 이 파일이 직접 실행될 때 테이블 생성 로직을 실행 (테스트용)
 if __name__ == '__main__':
     db_conn = get_db_connection()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""모듈 import 시간 측정 (콜드 스타트 분석)
+
+`python -X importtime` 출력을 별도 프로세스에서 수집해 모듈별 import 시간을 집계합니다.
+이미 import된 모듈의 영향을 받지 않도록 항상 새 인터프리터에서 측정합니다.
+"""
+import os
+import re
+import subprocess
+import sys
+
+# import time:       self [us] |  cumulative | imported package
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr_text):
+    """-X importtime 출력 파싱
+
+    Returns:
+        list: [{ module, self_ms, cumulative_ms, depth }] (import 완료 순서)
+    """
+    entries = []
+    for line in stderr_text.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entries.append({
+            'module': module,
+            'self_ms': int(self_us) / 1000.0,
+            'cumulative_ms': int(cumulative_us) / 1000.0,
+            # 출력은 중첩 단계마다 공백 2칸씩 들여쓰기 (최상위는 1칸)
+            'depth': max(0, (len(indent) - 1) // 2),
+        })
+    return entries
+
+
+def profile_imports(modules, cwd=None):
+    """새 인터프리터에서 modules를 순서대로 import하며 시간 측정
+
+    Args:
+        modules: import할 모듈 이름 리스트 (예: ['main', 'rsi_calculator'])
+        cwd: 실행 디렉토리 (기본값: 프로젝트 루트)
+
+    Returns:
+        list: parse_importtime 결과
+    """
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    statement = "; ".join(f"import {module}" for module in modules)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import 시간 측정 실패: {completed.stderr.strip().splitlines()[-1:]}")
+    return parse_importtime(completed.stderr)
+
+
+def summarize_imports(entries, top_n=20):
+    """최상위 import 단위 합계와 누적 시간 상위 모듈 요약
+
+    Returns:
+        dict: { total_ms, top_level: [...], slowest: [...] }
+    """
+    top_level = [entry for entry in entries if entry['depth'] == 0]
+    return {
+        'total_ms': sum(entry['cumulative_ms'] for entry in top_level),
+        'top_level': sorted(top_level, key=lambda e: e['cumulative_ms'], reverse=True)[:top_n],
+        'slowest': sorted(entries, key=lambda e: e['self_ms'], reverse=True)[:top_n],
+    }
+
+
+def format_import_report(title, summary):
+    """요약 결과를 표 형태의 문자열로 변환"""
+    lines = [f"[{title}] 전체 import 시간: {summary['total_ms']:.1f} ms", "", "  누적(ms)   자체(ms)  모듈 (최상위)"]
+    for entry in summary['top_level']:
+        lines.append(f"  {entry['cumulative_ms']:8.1f}  {entry['self_ms']:8.1f}  {entry['module']}")
+    lines += ["", "  자체(ms)   누적(ms)  모듈 (자체 시간 상위)"]
+    for entry in summary['slowest']:
+        lines.append(f"  {entry['self_ms']:8.1f}  {entry['cumulative_ms']:8.1f}  {entry['module']}")
+    return "\n".join(lines)
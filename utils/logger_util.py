@@ -1,9 +1,100 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 
+class DailyFileHandler(logging.FileHandler):
+    """날짜별 로그 파일 핸들러 (logs/YYYY-MM-DD_log.log)
+
+    기록 시점의 날짜가 바뀌면 새 날짜 파일로 전환하므로 상주 프로세스도 날짜별로 파일이 나뉩니다.
+    retention_days가 0보다 크면 생성 시(1회 실행) 및 전환 시 보관 기간이 지난 로그 파일을 삭제합니다.
+    """
+    def __init__(self, log_dir, retention_days=0, encoding='utf-8'):
+        self.log_dir = Path(log_dir)
+        self.retention_days = retention_days
+        self._current_date = datetime.now().date()
+        super().__init__(self._path_for(self._current_date), encoding=encoding, delay=True)
+        # cron 1회 실행은 날짜 전환이 없으므로 시작 시에도 정리
+        self._prune(self._current_date)
+
+    def _path_for(self, day):
+        return self.log_dir / f"{day.strftime('%Y-%m-%d')}_log.log"
+
+    def emit(self, record):
+        day = datetime.fromtimestamp(record.created).date()
+        if day != self._current_date:
+            self._rollover(day)
+        super().emit(record)
+
+    def _rollover(self, day):
+        self.acquire()
+        try:
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self._current_date = day
+            self.baseFilename = os.path.abspath(self._path_for(day))
+        finally:
+            self.release()
+        self._prune(day)
+
+    def _prune(self, day):
+        """day 기준 보관 기간(retention_days)이 지난 로그 파일 삭제"""
+        if self.retention_days <= 0:
+            return
+        cutoff = (day - timedelta(days=self.retention_days)).strftime('%Y-%m-%d')
+        for path in self.log_dir.glob('*_log.log'):
+            if path.name[:10] < cutoff:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나씩 기록하는 포맷터 (LOG_FORMAT=json)"""
+    def format(self, record):
+        entry = {
+            'timestamp': self.formatTime(record),
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'logger': record.name,
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class _QueueHandler(QueueHandler):
+    """메시지 인자만 미리 합치고 예외 정보는 exc_text로 분리해 큐에 전달
+
+    기본 QueueHandler는 예외 traceback을 메시지 본문에 합치므로 JSON 포맷에서 구분할 수 없습니다.
+    """
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
 class LoggerUtil:
+    """로거 싱글톤
+
+    로그 호출 스레드는 큐에 넣기만 하고, 파일/콘솔 기록은 QueueListener 스레드가 처리합니다.
+
+    - LOG_LEVEL: 로그 레벨 (기본값: INFO)
+    - LOG_FORMAT: 'text'(기본값) 또는 'json' (파일 로그를 JSON Lines로 기록)
+    - LOG_RETENTION_DAYS: 로그 파일 보관 일수 (기본값: 0, 삭제 안 함)
+    """
     _instance = None
     _initialized = False
 
@@ -17,47 +108,85 @@ class LoggerUtil:
             # 루트 디렉토리 경로 찾기 (상위 디렉토리)
             current_dir = Path(os.path.dirname(os.path.abspath(__file__)))
             root_dir = current_dir.parent
-            
+
             # 로그 디렉토리를 루트 경로의 logs 폴더로 설정
             log_dir = root_dir / 'logs'
 
             # 디렉토리가 없으면 생성
             log_dir.mkdir(parents=True, exist_ok=True)
 
-            # 로그 파일 설정
-            log_file = log_dir / f"{datetime.now().strftime('%Y-%m-%d')}_log.log"
+            level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').strip().upper())
+            if not isinstance(level, int):
+                level = logging.INFO
 
             # 로거 생성
             self.logger = logging.getLogger('MQLogger')
-            self.logger.setLevel(logging.INFO)
+            self.logger.setLevel(level)
+            self.logger.propagate = False
 
             # 이미 핸들러가 있다면 제거
             if self.logger.handlers:
                 self.logger.handlers.clear()
 
-            # 파일 핸들러
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(logging.INFO)
+            # 파일 핸들러 (날짜가 바뀌면 새 파일로 전환)
+            file_handler = DailyFileHandler(log_dir, retention_days=int(os.getenv('LOG_RETENTION_DAYS', 0)))
+            file_handler.setLevel(level)
 
             # 콘솔 핸들러
             console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.INFO)
+            console_handler.setLevel(level)
 
             # 포맷터 설정
             formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
-            file_handler.setFormatter(formatter)
+            if os.getenv('LOG_FORMAT', 'text').strip().lower() == 'json':
+                file_handler.setFormatter(JsonFormatter())
+            else:
+                file_handler.setFormatter(formatter)
             console_handler.setFormatter(formatter)
 
-            # 핸들러 추가
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
-            
+            # 큐 핸들러만 로거에 추가하고, 실제 기록은 리스너 스레드에서 처리
+            self._handlers = (file_handler, console_handler)
+            self._queue_handler = _QueueHandler(queue.Queue(-1))
+            self.logger.addHandler(self._queue_handler)
+            self._start_listener()
+            atexit.register(self.shutdown)
+
             LoggerUtil._initialized = True
 
+    def _start_listener(self):
+        log_queue = queue.Queue(-1)
+        self._queue_handler.queue = log_queue
+        self._listener = QueueListener(log_queue, *self._handlers, respect_handler_level=True)
+        self._listener.start()
+
+    @classmethod
+    def _after_fork_in_child(cls):
+        # fork된 자식 프로세스(유니버스 스캔 워커 등)에는 리스너 스레드가 없으므로 새로 시작
+        if cls._initialized:
+            cls._instance._start_listener()
+            # multiprocessing 자식은 atexit를 실행하지 않으므로 종료 시 남은 로그 기록을 따로 등록
+            from multiprocessing import util
+            util.Finalize(cls._instance, cls._instance.shutdown, exitpriority=0)
+
+    def shutdown(self):
+        """큐에 남은 로그를 모두 기록하고 리스너 종료"""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in self._handlers:
+                try:
+                    handler.flush()
+                except (OSError, ValueError):
+                    # 인터프리터 종료 중 이미 닫힌 스트림(테스트 러너의 stderr 등)은 무시
+                    pass
+
     def get_logger(self):
-        return self.logger 
+        return self.logger
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=LoggerUtil._after_fork_in_child)
 
 # 모듈 테스트용
 if __name__ == "__main__":
     logger = LoggerUtil().get_logger()
-    logger.info("로거 테스트 메시지") 
\ No newline at end of file
+    logger.info("로거 테스트 메시지")
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""NYSE 거래일 달력
+
+휴장일과 조기 폐장일을 연도별 규칙으로 계산합니다 (외부 달력 데이터 불필요).
+
+- 휴장일: 신정, 마틴 루터 킹 데이, 대통령의 날, 성금요일, 메모리얼 데이,
+  준틴스(2022년~), 독립기념일, 노동절, 추수감사절, 크리스마스
+- 토요일 휴일은 금요일, 일요일 휴일은 월요일에 대체 휴장
+  (단, 신정이 토요일이면 전년도 12/31은 정상 개장)
+- 조기 폐장(13:00): 독립기념일 전날, 추수감사절 다음 날, 크리스마스 이브
+"""
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+NYSE_TZ = ZoneInfo("America/New_York")
+REGULAR_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+
+
+def _easter(year):
+    """그레고리력 부활절 날짜 (Anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year, month, weekday, n):
+    """해당 월의 n번째 요일 (weekday: 월=0)"""
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year, month, weekday):
+    """해당 월의 마지막 요일"""
+    last = (date(year, month + 1, 1) if month < 12 else date(year + 1, 1, 1)) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day):
+    """주말 휴일의 대체 휴장일"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=None)
+def nyse_holidays(year):
+    """해당 연도의 NYSE 휴장일 집합"""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),          # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),          # Washington's Birthday
+        _easter(year) - timedelta(days=2),    # Good Friday
+        _last_weekday(year, 5, 0),            # Memorial Day
+        _observed(date(year, 7, 4)),          # Independence Day
+        _nth_weekday(year, 9, 0, 1),          # Labor Day
+        _nth_weekday(year, 11, 3, 4),         # Thanksgiving
+        _observed(date(year, 12, 25)),        # Christmas
+    }
+
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.add(_observed(new_year))
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    return frozenset(holidays)
+
+
+@lru_cache(maxsize=None)
+def nyse_early_closes(year):
+    """해당 연도의 NYSE 조기 폐장일 집합 (휴장일 제외)"""
+    candidates = {
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),
+        date(year, 12, 24),
+    }
+    return frozenset(day for day in candidates if is_trading_day(day))
+
+
+def is_trading_day(day):
+    """정규 거래일 여부 (주말/휴장일 제외)"""
+    return day.weekday() < 5 and day not in nyse_holidays(day.year)
+
+
+def session_close(day):
+    """해당 거래일의 장 마감 시각 (뉴욕 시간, 거래일이 아니면 None)"""
+    if not is_trading_day(day):
+        return None
+    close = EARLY_CLOSE if day in nyse_early_closes(day.year) else REGULAR_CLOSE
+    return datetime.combine(day, close, tzinfo=NYSE_TZ)
+
+
+def next_trading_day(day):
+    """day 이후(미포함) 첫 거래일"""
+    day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return day
+
+
+def next_report_time(now=None, delay_minutes=15):
+    """다음 보고 시각: now 이후 첫 장 마감 + delay_minutes (뉴욕 시간)
+
+    Args:
+        now: 기준 시각 (tz-aware, 기본값: 현재 시각)
+        delay_minutes: 장 마감 후 대기 시간 (종가 확정 대기)
+
+    Returns:
+        datetime: 뉴욕 시간 기준 다음 실행 시각
+    """
+    now = (now or datetime.now(NYSE_TZ)).astimezone(NYSE_TZ)
+    delay = timedelta(minutes=delay_minutes)
+
+    day = now.date()
+    if not is_trading_day(day):
+        day = next_trading_day(day)
+    while True:
+        run_at = session_close(day) + delay
+        if run_at > now:
+            return run_at
+        day = next_trading_day(day)
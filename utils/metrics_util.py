@@ -0,0 +1,246 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# 지연 시간 히스토그램 구간(초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = "rsi_tracker"
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+
+def _escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in pairs) + "}"
+
+
+class _Histogram:
+    __slots__ = ('bucket_counts', 'count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def observe(self, value):
+        index = bisect_left(LATENCY_BUCKETS, value)
+        if index < len(self.bucket_counts):
+            self.bucket_counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+
+class MetricsUtil:
+    """실행 단계별 타이머/카운터/지연 시간 히스토그램 수집기 (싱글톤)
+
+    - timer(): 단계 소요 시간 측정 (성공/실패 건수 포함)
+    - increment(): 카운터 증가
+    - observe(): 히스토그램 관측값 추가
+    - drain()/merge(): 워커 프로세스에서 수집한 값을 부모 프로세스로 옮겨 합산
+    - export(): Prometheus textfile collector 형식(.prom)과 실행 요약 JSON 저장
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MetricsUtil, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not MetricsUtil._initialized:
+            self._lock = threading.Lock()
+            self.reset()
+            MetricsUtil._initialized = True
+
+    def reset(self):
+        """수집값 초기화 (실행 단위 시작 시 호출)"""
+        with self._lock:
+            self.started_at = time.time()
+            self._counters = {}
+            self._histograms = {}
+
+    def increment(self, name, value=1, **labels):
+        """카운터 증가 (예: increment('telegram_retries_total', method='sendMessage'))"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """히스토그램에 관측값(초) 추가"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.observe(value)
+
+    def drain(self):
+        """지금까지 수집한 카운터/히스토그램을 꺼내고 비움 (프로세스 간 전달용, pickle 가능)
+
+        Returns:
+            dict: { counters: { (name, labels): value }, histograms: { (name, labels): (버킷별 건수, 건수, 합계, 최소, 최대) } }
+        """
+        with self._lock:
+            counters, histograms = self._counters, self._histograms
+            self._counters, self._histograms = {}, {}
+        return {
+            'counters': counters,
+            'histograms': {
+                key: (histogram.bucket_counts, histogram.count, histogram.total, histogram.minimum, histogram.maximum)
+                for key, histogram in histograms.items()
+            },
+        }
+
+    def merge(self, snapshot):
+        """drain() 결과를 현재 수집값에 합산"""
+        with self._lock:
+            for key, value in snapshot['counters'].items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, (bucket_counts, count, total, minimum, maximum) in snapshot['histograms'].items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = _Histogram()
+                histogram.bucket_counts = [a + b for a, b in zip(histogram.bucket_counts, bucket_counts)]
+                histogram.count += count
+                histogram.total += total
+                histogram.minimum = minimum if histogram.minimum is None else min(histogram.minimum, minimum)
+                histogram.maximum = maximum if histogram.maximum is None else max(histogram.maximum, maximum)
+
+    @contextmanager
+    def timer(self, stage, **labels):
+        """단계 소요 시간 측정
+
+        stage_seconds 히스토그램과 stage_total{status="ok"|"error"} 카운터를 기록하며,
+        예외는 실패로 집계한 뒤 그대로 다시 발생시킵니다.
+        """
+        started_at = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - started_at, stage=stage, **labels)
+            self.increment("stage_total", stage=stage, status=status, **labels)
+
+    def to_prometheus(self):
+        """Prometheus text exposition 형식 문자열"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+            started_at = self.started_at
+
+        lines = [
+            f"# HELP {METRIC_PREFIX}_run_started_timestamp_seconds 실행 시작 시각",
+            f"# TYPE {METRIC_PREFIX}_run_started_timestamp_seconds gauge",
+            f"{METRIC_PREFIX}_run_started_timestamp_seconds {started_at:.3f}",
+            f"# TYPE {METRIC_PREFIX}_run_duration_seconds gauge",
+            f"{METRIC_PREFIX}_run_duration_seconds {time.time() - started_at:.6f}",
+        ]
+
+        declared = set()
+        for (name, label_key), value in counters:
+            metric = f"{METRIC_PREFIX}_{name}"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            lines.append(f"{metric}{_format_labels(label_key)} {value}")
+
+        for (name, label_key), histogram in histograms:
+            metric = f"{METRIC_PREFIX}_{name}"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} histogram")
+                declared.add(metric)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, histogram.bucket_counts):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_format_labels(label_key, [('le', bound)])} {cumulative}")
+            lines.append(f"{metric}_bucket{_format_labels(label_key, [('le', '+Inf')])} {histogram.count}")
+            lines.append(f"{metric}_sum{_format_labels(label_key)} {histogram.total:.6f}")
+            lines.append(f"{metric}_count{_format_labels(label_key)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """실행 요약 (단계별 건수/실패/합계/최소/평균/최대 시간, 카운터)"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+            started_at = self.started_at
+
+        errors = {}
+        for (name, label_key), value in counters.items():
+            if name == "stage_total" and ("status", "error") in label_key:
+                errors[tuple(pair for pair in label_key if pair[0] != "status")] = value
+
+        stages = []
+        for (name, label_key), histogram in histograms.items():
+            if name != "stage_seconds":
+                continue
+            stages.append({
+                **dict(label_key),
+                'count': histogram.count,
+                'errors': errors.get(label_key, 0),
+                'total_seconds': round(histogram.total, 6),
+                'min_seconds': round(histogram.minimum, 6),
+                'avg_seconds': round(histogram.total / histogram.count, 6),
+                'max_seconds': round(histogram.maximum, 6),
+            })
+        stages.sort(key=lambda stage: stage['total_seconds'], reverse=True)
+
+        return {
+            'started_at': datetime.fromtimestamp(started_at).strftime('%Y-%m-%d %H:%M:%S'),
+            'duration_seconds': round(time.time() - started_at, 6),
+            'stages': stages,
+            'counters': [
+                {'name': name, **dict(label_key), 'value': value}
+                for (name, label_key), value in sorted(counters.items())
+                if name != "stage_total"
+            ],
+        }
+
+    def export(self, directory=None):
+        """Prometheus 텍스트 파일과 JSON 요약을 directory에 저장 (원자적 교체)
+
+        - METRICS_DIR: 저장 디렉토리 (기본값: 프로젝트 루트의 metrics/)
+
+        Returns:
+            tuple: (prometheus 파일 경로, JSON 요약 파일 경로)
+        """
+        if directory is None:
+            default_dir = Path(os.path.dirname(os.path.abspath(__file__))).parent / 'metrics'
+            directory = os.getenv('METRICS_DIR') or str(default_dir)
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        prom_path = directory / f"{METRIC_PREFIX}.prom"
+        summary_path = directory / f"{METRIC_PREFIX}_summary.json"
+        self._write_atomic(prom_path, self.to_prometheus())
+        self._write_atomic(summary_path, json.dumps(self.summary(), ensure_ascii=False, indent=2))
+        return prom_path, summary_path
+
+    @staticmethod
+    def _write_atomic(path, content):
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        temp_path.write_text(content, encoding='utf-8')
+        os.replace(temp_path, path)
@@ -1,27 +1,302 @@
 import os
-from urllib.request import urlopen
-import urllib.parse
+import json
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-import json
+from utils.logger_util import LoggerUtil
+from utils.metrics_util import MetricsUtil
 
 load_dotenv()
 
+class TelegramError(Exception):
+    """텔레그램 API 호출 관련 커스텀 예외"""
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        self.message = message
+        super().__init__(f"Telegram Error (Status: {status_code}): {message}")
+
+# sendMessage 본문 최대 길이 (UTF-16 코드 단위 기준)
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+_HTML_TAG = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9-]*)[^>]*>")
+_HTML_TOKEN = re.compile(r"<[^>]*>|&#?\w+;|.", re.DOTALL)
+
+def _text_length(text):
+    """텔레그램 기준 길이 (이모지 등은 UTF-16 코드 단위 2개로 계산)"""
+    return len(text.encode('utf-16-le')) // 2
+
+def _track_tags(stack, fragment):
+    """fragment의 여는/닫는 태그를 반영해 열린 태그 스택 갱신"""
+    for match in _HTML_TAG.finditer(fragment):
+        name = match.group(2).lower()
+        if not match.group(1):
+            stack.append((name, match.group(0)))
+            continue
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index][0] == name:
+                del stack[index:]
+                break
+
+def _closing_tags(stack):
+    return "".join(f"</{name}>" for name, _ in reversed(stack))
+
+def _split_long_line(line, max_length):
+    """한 줄이 max_length를 넘으면 태그/엔티티를 자르지 않는 위치에서 분할"""
+    pieces, current, current_length = [], [], 0
+    for token in _HTML_TOKEN.findall(line):
+        token_length = _text_length(token)
+        if current and current_length + token_length > max_length:
+            pieces.append("".join(current))
+            current, current_length = [], 0
+        current.append(token)
+        current_length += token_length
+    if current:
+        pieces.append("".join(current))
+    return pieces
+
+def split_html_message(text, limit=TELEGRAM_MESSAGE_LIMIT):
+    """HTML 메시지를 limit 이하 조각으로 분할
+
+    줄 단위로 나누되, 조각 끝에서 열려 있는 태그는 닫고 다음 조각 시작에서 다시 엽니다.
+    한 줄이 너무 길면 태그/엔티티 경계에서 자릅니다.
+
+    Returns:
+        list: 전송할 메시지 조각 리스트 (빈 조각 제외)
+    """
+    if _text_length(text) <= limit:
+        return [text]
+
+    pieces = []
+    for line in text.splitlines(keepends=True):
+        pieces += _split_long_line(line, limit // 2) if _text_length(line) > limit // 2 else [line]
+
+    chunks, stack = [], []
+    current, current_length = [], 0
+    for piece in pieces:
+        next_stack = list(stack)
+        _track_tags(next_stack, piece)
+        piece_length = _text_length(piece)
+
+        if current and current_length + piece_length + _text_length(_closing_tags(next_stack)) > limit:
+            chunks.append("".join(current) + _closing_tags(stack))
+            reopen = "".join(tag for _, tag in stack)
+            current, current_length = [reopen], _text_length(reopen)
+
+        current.append(piece)
+        current_length += piece_length
+        stack = next_stack
+
+    chunks.append("".join(current) + _closing_tags(stack))
+    chunks = [chunk.strip("\n") for chunk in chunks]
+    return [chunk for chunk in chunks if _HTML_TAG.sub("", chunk).strip()]
+
+class RateLimiter:
+    """전체/채팅방별 전송 간격 제한
+
+    텔레그램 권장 한도(전체 초당 30건, 채팅방별 초당 1건)를 기본값으로 사용합니다.
+    호출 시점마다 다음 전송 슬롯을 예약하므로 여러 스레드가 동시에 호출해도 한도를 넘지 않습니다.
+    """
+    def __init__(self, global_per_second=30.0, chat_per_second=1.0):
+        self.global_interval = 1.0 / global_per_second
+        self.chat_interval = 1.0 / chat_per_second
+        self._lock = threading.Lock()
+        self._global_next = 0.0
+        self._chat_next = {}
+
+    def acquire(self, chat_id):
+        """전송 슬롯을 예약하고 해당 시각까지 대기"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._global_next, self._chat_next.get(chat_id, 0.0))
+            self._global_next = slot + self.global_interval
+            self._chat_next[chat_id] = slot + self.chat_interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def defer(self, chat_id, seconds):
+        """429 응답의 retry_after 동안 해당 채팅방 전송 보류"""
+        with self._lock:
+            self._chat_next[chat_id] = max(self._chat_next.get(chat_id, 0.0), time.monotonic() + seconds)
+
 class TelegramUtil:
+    # 프로세스 내 모든 인스턴스가 keep-alive 세션과 전송 한도를 공유
+    _session = None
+    _rate_limiter = None
+    _shared_lock = threading.Lock()
+
     def __init__(self):
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
         self.chat_test_id = os.getenv('TELEGRAM_CHAT_TEST_ID')
+        self.timeout = float(os.getenv('TELEGRAM_TIMEOUT', 10))
+        self.max_retries = int(os.getenv('TELEGRAM_MAX_RETRIES', 3))
+        self.max_workers = int(os.getenv('TELEGRAM_MAX_WORKERS', 8))
+        self.logger = LoggerUtil().get_logger()
+        self._queue = []
+
+        with TelegramUtil._shared_lock:
+            if TelegramUtil._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+                session.mount("https://", adapter)
+                TelegramUtil._session = session
+            if TelegramUtil._rate_limiter is None:
+                TelegramUtil._rate_limiter = RateLimiter(
+                    float(os.getenv('TELEGRAM_GLOBAL_RATE', 30)),
+                    float(os.getenv('TELEGRAM_CHAT_RATE', 1)),
+                )
+
+    def _request(self, method, chat_id, payload, files=None, raise_on_error=True):
+        """텔레그램 API POST 호출 (전송 한도 대기, 429/5xx/네트워크 오류 재시도)
 
-    def send_message(self, message):
-        """일반 메시지 전송"""
-        message = urllib.parse.quote_plus(message)
-        urlopen(f"https://api.telegram.org/bot{self.bot_token}/sendMessage?chat_id={self.chat_id}&parse_mode=html&text={message}")
+        raise_on_error가 False면 재시도 후에도 200이 아닌 응답은 예외 대신 응답 JSON({ ok: false, ... })을 반환합니다.
+        """
+        with MetricsUtil().timer('telegram', method=method):
+            return self._request_with_retries(method, chat_id, payload, files, raise_on_error)
+
+    def _request_with_retries(self, method, chat_id, payload, files=None, raise_on_error=True):
+        url = f"https://api.telegram.org/bot{self.bot_token}/{method}"
+        metrics = MetricsUtil()
+
+        for attempt in range(self.max_retries + 1):
+            TelegramUtil._rate_limiter.acquire(chat_id)
+            for file in (files or {}).values():
+                file.seek(0)
+
+            try:
+                if files:
+                    response = TelegramUtil._session.post(url, data=payload, files=files, timeout=self.timeout)
+                else:
+                    response = TelegramUtil._session.post(url, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise TelegramError(0, f"{method} 요청 실패: {str(e)}")
+                metrics.increment('telegram_retries_total', method=method, reason='network')
+                self._backoff(attempt, f"{method} 네트워크 오류: {str(e)}")
+                continue
+
+            if response.status_code == 429:
+                try:
+                    retry_after = float(response.json().get('parameters', {}).get('retry_after', 1))
+                except ValueError:
+                    retry_after = 1.0
+                if attempt >= self.max_retries:
+                    if not raise_on_error:
+                        return self._error_response(method, response)
+                    raise TelegramError(429, f"{method} 전송 한도 초과 (retry_after: {retry_after}초)")
+                metrics.increment('telegram_retries_total', method=method, reason='rate_limit')
+                self.logger.warning(f"텔레그램 전송 한도 초과 (chat_id: {chat_id}) → {retry_after}초 후 재시도")
+                TelegramUtil._rate_limiter.defer(chat_id, retry_after)
+                continue
+
+            if response.status_code >= 500 and attempt < self.max_retries:
+                metrics.increment('telegram_retries_total', method=method, reason='server_error')
+                self._backoff(attempt, f"{method} 서버 오류 (Status: {response.status_code})")
+                continue
+
+            if response.status_code != 200:
+                if not raise_on_error:
+                    return self._error_response(method, response)
+                raise TelegramError(response.status_code, f"{method} 실패: {response.text}")
+
+            return response.json()
+
+    def _error_response(self, method, response):
+        """실패 응답을 로그로 남기고 응답 JSON 반환 (프록시 HTML 등 JSON이 아니면 같은 형태로 구성)"""
+        self.logger.error(f"텔레그램 {method} 실패 (Status: {response.status_code}): {response.text}")
+        try:
+            return response.json()
+        except ValueError:
+            return {'ok': False, 'error_code': response.status_code, 'description': response.text}
+
+    def _backoff(self, attempt, reason):
+        """지수 백오프 + 지터 대기"""
+        delay = min(30.0, 0.5 * (2 ** attempt)) * random.uniform(0.5, 1.5)
+        self.logger.warning(f"{reason} → {delay:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+        time.sleep(delay)
+
+    def send_message(self, message, chat_id=None):
+        """일반 메시지 전송
+
+        4096자를 넘으면 HTML 태그가 깨지지 않도록 나눠 순서대로 전송하고 마지막 응답을 반환합니다.
+        """
+        chat_id = chat_id or self.chat_id
+        response = None
+        for chunk in split_html_message(message):
+            response = self._request("sendMessage", chat_id, {
+                "chat_id": chat_id,
+                "text": chunk,
+                "parse_mode": "html"
+            })
+        return response
+
+    def _send_sequence(self, chat_id, messages):
+        """한 채팅방에 메시지를 순서대로 전송하고 실패 건수 반환"""
+        failed = 0
+        for message in messages:
+            try:
+                self.send_message(message, chat_id=chat_id)
+            except Exception as e:
+                self.logger.error(f"텔레그램 메시지 전송 실패 (chat_id: {chat_id}): {str(e)}")
+                failed += 1
+        return failed
+
+    def _dispatch(self, per_chat):
+        """{ chat_id: [messages] }를 채팅방끼리 병렬로 전송하고 실패 건수 반환"""
+        if not per_chat:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(per_chat))) as executor:
+            futures = [executor.submit(self._send_sequence, chat_id, messages) for chat_id, messages in per_chat.items()]
+            return sum(future.result() for future in futures)
+
+    def send_messages(self, messages, chat_ids=None):
+        """여러 메시지를 여러 채팅방에 동시 전송
+
+        채팅방별 전송 순서는 유지하고, 채팅방끼리는 병렬로 전송합니다.
+
+        Args:
+            messages: 메시지 리스트
+            chat_ids: 채팅방 ID 리스트 (기본값: TELEGRAM_CHAT_ID)
+
+        Returns:
+            int: 전송 실패 건수
+        """
+        chat_ids = chat_ids or [self.chat_id]
+        return self._dispatch({chat_id: list(messages) for chat_id in chat_ids})
+
+    def enqueue(self, message, chat_id=None):
+        """전송 대기열에 메시지 추가 (flush 시 일괄 전송)"""
+        self._queue.append((chat_id or self.chat_id, message))
+
+    def flush(self):
+        """전송 대기열의 메시지를 채팅방별로 병렬 전송
+
+        Returns:
+            int: 전송 실패 건수
+        """
+        queue, self._queue = self._queue, []
+        if not queue:
+            return 0
+
+        per_chat = {}
+        for chat_id, message in queue:
+            per_chat.setdefault(chat_id, []).append(message)
+
+        failed = self._dispatch(per_chat)
+        self.logger.info(f"텔레그램 대기열 전송 완료: {len(queue) - failed}/{len(queue)}건 성공")
+        return failed
 
     def send_photo(self, photo_path, caption=""):
-        """이미지 전송"""
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendPhoto"
-        
+        """이미지 전송
+
+        실패 응답도 예외 없이 응답 JSON을 그대로 반환합니다 (호출자가 'ok' 값 확인, 네트워크 오류는 TelegramError).
+        """
         with open(photo_path, 'rb') as photo:
             payload = {
                 "chat_id": self.chat_id,
@@ -31,50 +306,43 @@ class TelegramUtil:
             files = {
                 "photo": photo
             }
-            response = requests.post(url, data=payload, files=files)
-        
-        return response.json()
+            return self._request("sendPhoto", self.chat_id, payload, files=files, raise_on_error=False)
 
     def send_test_message(self, message):
         """테스트용 채팅방으로 메시지 전송"""
-        message = urllib.parse.quote_plus(message)
-        urlopen(f"https://api.telegram.org/bot{self.bot_token}/sendMessage?chat_id={self.chat_test_id}&parse_mode=html&text={message}") 
-    
+        return self.send_message(message, chat_id=self.chat_test_id)
+
     def send_multiple_photo(self, photo_paths, caption=""):
-        """여러 장의 이미지 한 번에 전송"""
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendMediaGroup"
-        
+        """여러 장의 이미지 한 번에 전송
+
+        send_photo와 마찬가지로 실패 응답도 응답 JSON을 그대로 반환합니다.
+        """
         media = []
         files = {}
-        
+
         # 각 이미지에 대한 미디어 객체 생성
         for index, photo_path in enumerate(photo_paths):
             # 첫 번째 이미지에만 캡션 추가
             media_caption = caption if index == 0 else ""
-            
+
             media.append({
                 'type': 'photo',
                 'media': f'attach://photo{index}',
                 'caption': media_caption,
                 'parse_mode': 'html'
             })
-            
+
             files[f'photo{index}'] = open(photo_path, 'rb')
-        
+
         try:
             payload = {
                 'chat_id': self.chat_id,
                 'media': json.dumps(media)
             }
-            
-            response = requests.post(url, data=payload, files=files)
-            for file in files.values():
-                file.close()
-            
-            return response.json()
-            
-        except Exception as e:
+
+            return self._request("sendMediaGroup", self.chat_id, payload, files=files, raise_on_error=False)
+
+        finally:
             # 에러 발생시에도 파일들을 확실히 닫아줌
             for file in files.values():
                 file.close()
-            raise e 
\ No newline at end of file
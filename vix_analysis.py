@@ -1,6 +1,90 @@
-import yfinance as yf
+import math
+import os
 from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
 from utils.logger_util import LoggerUtil
+from utils.metrics_util import MetricsUtil
+from price_provider import create_price_provider
+
+# 상태 구간 경계 (하한 포함, 상한 미포함)와 구간별 상태
+VIX_BINS = (15, 20, 30, 40)
+VIX_STATUSES = ("매우 안정", "안정", "경계", "불안", "위기")
+
+# 연간 거래일 수 (백분위 기본 구간)
+TRADING_DAYS_PER_YEAR = 252
+
+
+def classify_vix_series(values):
+    """VIX 종가 배열을 상태 코드(VIX_STATUSES 위치) 배열로 일괄 분류 (NaN은 -1)"""
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.digitize(values, VIX_BINS)
+    codes[np.isnan(values)] = -1
+    return codes
+
+
+def rolling_percentile_rank(values, window=TRADING_DAYS_PER_YEAR):
+    """최근 window개 종가 중 현재 값 이하인 비율(%) (구간이 모자란 앞부분과 NaN은 NaN)"""
+    values = np.asarray(values, dtype=np.float64)
+    ranks = np.full(len(values), np.nan)
+    if len(values) < window:
+        return ranks
+
+    windows = sliding_window_view(values, window)
+    current = windows[:, -1:]
+    valid = (~np.isnan(windows)).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ranks[window - 1:] = np.where(
+            np.isnan(current[:, 0]), np.nan, (windows <= current).sum(axis=1) / valid * 100,
+        )
+    return ranks
+
+
+def regime_runs(codes):
+    """상태 코드 배열의 구간 정보
+
+    Returns:
+        tuple: (regime_id, regime_days, changed)
+            - regime_id: 같은 상태가 이어지는 구간 번호
+            - regime_days: 현재 구간에서 몇 번째 봉인지 (1부터)
+            - changed: 직전 봉과 상태가 달라진 봉 (첫 봉은 False)
+    """
+    codes = np.asarray(codes)
+    changed = np.zeros(len(codes), dtype=bool)
+    changed[1:] = codes[1:] != codes[:-1]
+    regime_id = np.cumsum(changed)
+    starts = np.flatnonzero(np.concatenate(([True], changed[1:])))
+    regime_days = np.arange(len(codes)) - starts[regime_id] + 1
+    return regime_id, regime_days, changed
+
+
+def analyze_vix_history(closes, window=TRADING_DAYS_PER_YEAR):
+    """VIX 종가 이력 전체를 한 번에 분석
+
+    Args:
+        closes: 날짜 인덱스를 가진 종가 Series (또는 배열)
+        window: 백분위 계산 구간(봉)
+
+    Returns:
+        pandas.DataFrame: close, status, percentile, regime_id, regime_days, regime_change 컬럼
+    """
+    index = closes.index if isinstance(closes, pd.Series) else None
+    values = np.asarray(closes, dtype=np.float64)
+    codes = classify_vix_series(values)
+    regime_id, regime_days, changed = regime_runs(codes)
+
+    statuses = np.array(VIX_STATUSES + (None,), dtype=object)
+    return pd.DataFrame({
+        'close': values,
+        'status': statuses[codes],
+        'percentile': rolling_percentile_rank(values, window),
+        'regime_id': regime_id,
+        'regime_days': regime_days,
+        'regime_change': changed,
+    }, index=index)
 
 
 class VIXAnalyzer:
@@ -8,11 +92,13 @@ class VIXAnalyzer:
 
     - 야후파이낸스 `^VIX` 종가를 조회
     - 종가에 따른 상태 분류 반환
+    - 이력 전체의 상태/백분위/상태 구간을 배열 연산으로 분석 (get_vix_history)
     """
 
-    def __init__(self):
+    def __init__(self, provider=None):
         self.logger = LoggerUtil().get_logger()
         self.symbol = "^VIX"
+        self.provider = provider or create_price_provider()
 
     def get_vix_data(self, days: int = 60):
         """VIX 데이터 조회
@@ -31,8 +117,8 @@ class VIXAnalyzer:
                 f"{self.symbol} 데이터 수집 시작 ({start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')})"
             )
 
-            ticker = yf.Ticker(self.symbol)
-            data = ticker.history(start=start_date, end=end_date)
+            with MetricsUtil().timer('get_vix_data', source=self.provider.name, symbol=self.symbol):
+                data = self.provider.get_history(self.symbol, start_date, end_date)
 
             if data is None or data.empty:
                 self.logger.error("VIX 데이터를 가져올 수 없습니다.")
@@ -55,40 +141,62 @@ class VIXAnalyzer:
         - 30 ~ 40 : 불안
         - 40 이상 : 위기
         """
-        # 하한 포함, 상한 미포함 구간 처리 (마지막 구간은 상한 없음)
-        if close_value < 15:
-            return "매우 안정"
-        if close_value < 20:
-            return "안정"
-        if close_value < 30:
-            return "경계"
-        if close_value < 40:
-            return "불안"
-        return "위기"
-
-    def get_latest_vix(self):
+        return VIX_STATUSES[int(classify_vix_series([close_value])[0])]
+
+    def get_vix_history(self, years: float = 10, window: int = TRADING_DAYS_PER_YEAR):
+        """VIX 이력 분석 (상태/백분위/구간 지속 기간)
+
+        Args:
+            years: 조회 기간(년)
+            window: 백분위 계산 구간(봉)
+
+        Returns:
+            pandas.DataFrame | None: analyze_vix_history 결과
+        """
+        data = self.get_vix_data(days=int(years * 365.25) + 1)
+        if data is None or data.empty:
+            return None
+        return analyze_vix_history(data["Close"], window)
+
+    def get_latest_vix(self, data=None):
         """최신 VIX 정보 반환
 
+        VIX_PERCENTILE_WINDOW(기본값: 252거래일) 구간의 백분위와 현재 상태 지속 거래일 수(조회 구간 내 기준)를 함께 계산합니다.
+        이력이 백분위 구간보다 짧으면 percentile은 None입니다.
+
+        Args:
+            data: 미리 수집한 VIX 데이터 (없으면 새로 수집)
+
         Returns:
-            dict | None: { symbol, close, status, timestamp }
+            dict | None: { symbol, close, status, timestamp, trade_date, percentile, percentile_window, regime_days }
+                         (trade_date는 마지막 봉 날짜)
         """
         try:
-            data = self.get_vix_data(days=60)
+            window = int(os.getenv('VIX_PERCENTILE_WINDOW') or TRADING_DAYS_PER_YEAR)
+            if data is None:
+                # 거래일 window개를 확보할 수 있도록 달력 기준 여유를 두고 조회
+                data = self.get_vix_data(days=max(60, math.ceil(window * 365 / TRADING_DAYS_PER_YEAR) + 14))
             if data is None or data.empty:
                 return None
 
             close_value = float(round(data["Close"].iloc[-1], 2))
             status = self.classify_vix(close_value)
+            latest = analyze_vix_history(data["Close"].dropna(), window).iloc[-1]
+            percentile = None if pd.isna(latest['percentile']) else float(round(latest['percentile'], 1))
 
             result = {
                 "symbol": self.symbol,
                 "close": close_value,
                 "status": status,
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "trade_date": data.index[-1].strftime("%Y-%m-%d"),
+                "percentile": percentile,
+                "percentile_window": window,
+                "regime_days": int(latest['regime_days']),
             }
 
             self.logger.info(
-                f"VIX 최신 종가: {close_value} (상태: {status})"
+                f"VIX 최신 종가: {close_value} (상태: {status}, 백분위: {percentile}, 상태 지속: {result['regime_days']}거래일)"
             )
             return result
 
@@ -111,7 +219,25 @@ class VIXAnalyzer:
 
         section = "🌪 <b>VIX 변동성 지표</b>\n"
         section += f"   VIX 종가: {vix_info['close']}\n"
-        section += f"   상태: {status_emoji} {vix_info['status']}\n\n"
-        return section
-
-
+        section += f"   상태: {status_emoji} {vix_info['status']}\n"
+        for line in vix_detail_lines(vix_info):
+            section += f"{line}\n"
+        return section + "\n"
+
+
+def percentile_window_label(window):
+    """백분위 구간 표시 (252거래일 단위는 '1년', 그 외는 'N거래일')"""
+    if window % TRADING_DAYS_PER_YEAR == 0:
+        return f"{window // TRADING_DAYS_PER_YEAR}년"
+    return f"{window}거래일"
+
+
+def vix_detail_lines(vix_info):
+    """VIX 백분위/상태 지속 기간 표시 줄 (값이 있을 때만)"""
+    lines = []
+    if vix_info.get('percentile') is not None:
+        label = percentile_window_label(vix_info.get('percentile_window', TRADING_DAYS_PER_YEAR))
+        lines.append(f"   최근 {label} 백분위: {vix_info['percentile']:.0f}%")
+    if vix_info.get('regime_days'):
+        lines.append(f"   상태 지속: {vix_info['regime_days']}거래일")
+    return lines